@@ -0,0 +1 @@
+"""Performance benchmarks for the Cash 4 tracker."""
@@ -0,0 +1,51 @@
+"""
+Benchmark Combo evaluation against a naive permutation-expansion reference.
+
+Usage: python -m benchmarks.bench_combo [--tickets N]
+"""
+import argparse
+import random
+import time
+from itertools import permutations
+from typing import List, Tuple
+
+from src.play_types import Combo, STRAIGHT_PRIZE
+
+def naive_combo_prize(ticket: List[str], winning: List[str]) -> Tuple[bool, float]:
+    """Reference implementation: expand every permutation on each check."""
+    if tuple(winning) in set(permutations(ticket)):
+        return True, STRAIGHT_PRIZE
+    return False, 0.0
+
+def run(ticket_count: int, seed: int = 0):
+    rng = random.Random(seed)
+    tickets = [[str(rng.randrange(10)) for _ in range(4)] for _ in range(ticket_count)]
+    draws = [f"{n:04d}" for n in range(0, 10000, 37)]
+
+    start = time.perf_counter()
+    expected = [naive_combo_prize(t, list(d)) for t in tickets for d in draws]
+    naive_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    plays = [Combo(''.join(t)) for t in tickets]
+    actual = [p.calculate_prize(t, list(d)) for p, t in zip(plays, tickets) for d in draws]
+    class_time = time.perf_counter() - start
+
+    if actual != expected:
+        raise SystemExit("Combo results differ from the naive reference")
+
+    checks = len(expected)
+    print(f"checks:          {checks}")
+    print(f"naive expansion: {naive_time:.3f}s ({checks / naive_time:,.0f} checks/s)")
+    print(f"sorted class:    {class_time:.3f}s ({checks / class_time:,.0f} checks/s)")
+    print(f"speedup:         {naive_time / class_time:.1f}x")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tickets', type=int, default=500, help='Number of random combo tickets')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    run(args.tickets, args.seed)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,153 @@
+"""
+Microbenchmarks for the ticket checking, storage and message rendering hot paths.
+
+Results are printed (or written with --output) as JSON so runs on different
+commits can be compared.
+
+Usage: python -m benchmarks.bench_hotpaths [--sizes 10000,100000] [--output results.json]
+                                           [--compare previous.json]
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List
+
+from benchmarks.synthetic import generate_tickets
+from src import codec
+from src.email_notifier import EmailNotifier
+from src.play_types import PlayType
+from src.ticket_manager import TicketManager
+
+WINNING_NUMBERS = '1234'
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return 'unknown'
+
+def _time(func: Callable[[], Any], repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def bench_size(size: int, repeat: int, workdir: str) -> List[Dict[str, Any]]:
+    tickets = generate_tickets(size, seed=size)
+    data_file = os.path.join(workdir, f'tickets_{size}.json')
+    manager = TicketManager(data_file)
+    manager.tickets = tickets
+
+    notifier = EmailNotifier(os.path.join(workdir, 'missing_config.json'))
+    sample = tickets[:min(size, 10000)]
+    winning = list(WINNING_NUMBERS)
+
+    def create_and_calculate():
+        for t in tickets:
+            PlayType.create(t['play_type'], ''.join(t['numbers'])).calculate_prize(t['numbers'], winning)
+
+    def render_messages():
+        for t in sample:
+            notifier.format_winning_message(t, winning, 5000.0)
+            notifier.format_losing_message(t, winning)
+
+    # The indented stdlib JSON that ticket files used to be written as, and the current encodings
+    encoded = {
+        'legacy_json': json.dumps(manager.tickets, indent=2).encode('utf-8'),
+        'codec': codec.dumps(manager.tickets),
+        'codec_gzip': codec.compress(codec.dumps(manager.tickets), 'gzip'),
+    }
+    if codec.loads(encoded['legacy_json']) != codec.loads(encoded['codec_gzip']):
+        raise RuntimeError("Codec round trip does not match the legacy JSON")
+
+    cases = [
+        ('codec.legacy_json_dumps', size, lambda: json.dumps(manager.tickets, indent=2)),
+        ('codec.legacy_json_loads', size, lambda: json.loads(encoded['legacy_json'])),
+        (f'codec.{codec.backend()}_dumps', size, lambda: codec.dumps(manager.tickets)),
+        (f'codec.{codec.backend()}_loads', size, lambda: codec.loads(encoded['codec'])),
+        (f'codec.{codec.backend()}_gzip_dumps', size, lambda: codec.compress(codec.dumps(manager.tickets), 'gzip')),
+        (f'codec.{codec.backend()}_gzip_loads', size, lambda: codec.loads(encoded['codec_gzip'])),
+        ('ticket_manager.save', size, lambda: manager._save_tickets()),
+        ('ticket_manager.load', size, lambda: manager._load_tickets()),
+        ('ticket_manager.get_active_tickets', size, manager.get_active_tickets),
+        ('ticket_manager.check_winning_numbers', size,
+         lambda: [manager.check_winning_numbers(WINNING_NUMBERS, d) for d in ('MIDDAY', 'EVENING', 'NIGHT')]),
+        ('play_type.create_calculate_prize', size, create_and_calculate),
+        ('email_notifier.format_messages', 2 * len(sample), render_messages),
+    ]
+
+    results = []
+    for name, items, func in cases:
+        seconds = _time(func, repeat)
+        results.append({
+            'name': name,
+            'tickets': size,
+            'items': items,
+            'seconds': seconds,
+            'ns_per_item': seconds / items * 1e9 if items else None,
+        })
+        print(f"{name:40} {size:>9,} tickets  {seconds:9.4f}s", file=sys.stderr)
+    for encoding, data in encoded.items():
+        results.append({'name': f'size.{encoding}', 'tickets': size, 'bytes': len(data)})
+        print(f"{'size.' + encoding:40} {size:>9,} tickets  {len(data):>12,} bytes", file=sys.stderr)
+    return results
+
+def compare(results: List[Dict[str, Any]], baseline_file: str):
+    """Print how each case changed relative to a previous run's JSON report."""
+    with open(baseline_file, 'r') as f:
+        baseline = json.load(f)
+    previous = {(r['name'], r['tickets']): r['seconds'] for r in baseline['results'] if 'seconds' in r}
+    print(f"\nCompared with {baseline.get('commit', baseline_file)}:", file=sys.stderr)
+    for result in results:
+        before = previous.get((result['name'], result['tickets']))
+        if before:
+            print(f"{result['name']:40} {result['tickets']:>9,} tickets  {result['seconds'] / before:6.2f}x",
+                  file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000,100000',
+                        help='Comma-separated ticket book sizes (e.g. 10000,100000,1000000,5000000)')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per case; the best is reported')
+    parser.add_argument('--output', help='Write JSON results to this file instead of stdout')
+    parser.add_argument('--compare', help='Previous JSON results to compare against')
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    with tempfile.TemporaryDirectory() as workdir:
+        results = []
+        for size in sizes:
+            results.extend(bench_size(size, args.repeat, workdir))
+
+    report = {
+        'benchmark': 'hotpaths',
+        'commit': _git_commit(),
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    if args.compare:
+        compare(results, args.compare)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Cold-start comparison of the JSON ticket file and the binary snapshot.
+
+For each book size a synthetic tickets.json and its snapshot are written to a
+scratch directory. Then a fresh interpreter answers "how many tickets are
+active today in the MIDDAY drawing", once by loading the JSON through
+TicketManager and once by mapping the snapshot. Reports wall-clock time and
+peak RSS of each as JSON.
+
+Usage: python -m benchmarks.bench_snapshot [--sizes 100000,1000000] [--output results.json]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from typing import Any, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Run in a fresh interpreter: prints {"count", "seconds", "peak_rss_mb"}
+PROBES = {
+    'json': """
+from src.ticket_manager import TicketManager
+count, _ = TicketManager(DATA_FILE).query_tickets(draw_time='MIDDAY', active_on=date.today(), limit=0)
+""",
+    'snapshot': """
+from src.snapshot import open_snapshot
+with open_snapshot(DATA_FILE) as snapshot:
+    count = snapshot.count_matching(draw_time='MIDDAY', active_on=date.today())
+""",
+}
+PROBE_TEMPLATE = """
+import json, resource, sys, time
+from datetime import date
+DATA_FILE = sys.argv[1]
+start = time.perf_counter()
+{body}
+elapsed = time.perf_counter() - start
+# ru_maxrss carries over the parent's peak through fork+exec on Linux; VmHWM doesn't
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+try:
+    with open('/proc/self/status') as f:
+        peak_kb = next(int(line.split()[1]) for line in f if line.startswith('VmHWM:'))
+except (OSError, StopIteration):
+    pass
+print(json.dumps({{'count': count, 'seconds': elapsed, 'peak_rss_mb': peak_kb / 1024}}))
+"""
+
+def seed(workdir: str, size: int) -> str:
+    from benchmarks.synthetic import generate_tickets
+    from src.ticket_manager import TicketManager
+
+    data_file = os.path.join(workdir, f'tickets-{size}.json')
+    ticket_manager = TicketManager(data_file)
+    ticket_manager.tickets = generate_tickets(size)
+    ticket_manager._save_tickets()
+    ticket_manager.write_snapshot()
+    return data_file
+
+def probe(kind: str, data_file: str) -> Dict[str, Any]:
+    proc = subprocess.run(
+        [sys.executable, '-c', PROBE_TEMPLATE.format(body=PROBES[kind]), data_file],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(proc.stdout)
+
+def run(sizes: List[int]) -> List[Dict[str, Any]]:
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in sizes:
+            data_file = seed(workdir, size)
+            row = {
+                'tickets': size,
+                'json_bytes': os.path.getsize(data_file),
+                'snapshot_bytes': os.path.getsize(os.path.splitext(data_file)[0] + '.snapshot'),
+            }
+            for kind in PROBES:
+                row[kind] = probe(kind, data_file)
+            if row['json']['count'] != row['snapshot']['count']:
+                raise RuntimeError(f"Counts differ for {size} tickets: {row['json']} vs {row['snapshot']}")
+            results.append(row)
+            print(f"{size:>9,} tickets  json {row['json']['seconds']:6.2f}s {row['json']['peak_rss_mb']:7.1f} MB  "
+                  f"snapshot {row['snapshot']['seconds']:6.2f}s {row['snapshot']['peak_rss_mb']:7.1f} MB",
+                  file=sys.stderr)
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='100000,1000000', help='Comma-separated ticket book sizes')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    report = json.dumps({'benchmark': 'snapshot', 'results': run([int(s) for s in args.sizes.split(',') if s])},
+                        indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
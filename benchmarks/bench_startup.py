@@ -0,0 +1,86 @@
+"""
+Measure import time of each entry point with `python -X importtime`.
+
+Each entry point is imported in a fresh interpreter several times and the
+fastest cumulative import time is compared against its budget. src is
+byte-compiled first, so the timings are of importing the modules as they
+run when deployed, not of compiling them (which PYTHONDONTWRITEBYTECODE
+would otherwise repeat in every interpreter). Entry points
+must also not load modules they shouldn't need (e.g. the CLI must not load
+selenium). Exits with status 1 if any budget is exceeded.
+
+Usage: python -m benchmarks.bench_startup [--repeat N] [--scale X] [--json]
+"""
+import argparse
+import compileall
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time budgets in milliseconds, and modules each entry point must not import
+BUDGETS = {
+    'src.cli': {'budget_ms': 60, 'forbidden': ['selenium', 'bs4', 'requests', 'smtplib', 'dotenv']},
+    'src.main': {'budget_ms': 40, 'forbidden': ['selenium', 'bs4', 'requests', 'smtplib', 'dotenv']},
+    'src.scraper': {'budget_ms': 30, 'forbidden': ['selenium', 'bs4', 'requests']},
+    'src.daemon': {'budget_ms': 80, 'forbidden': ['selenium', 'bs4', 'requests', 'smtplib']},
+}
+
+def import_profile(module: str) -> Tuple[float, List[str]]:
+    """Import a module in a fresh interpreter; return its cumulative import time (ms) and all modules loaded."""
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    cumulative = None
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, us_cumulative, name = [part.strip() for part in line[len('import time:'):].split('|')]
+        modules.append(name)
+        if name == module:
+            cumulative = int(us_cumulative) / 1000
+    return cumulative, modules
+
+def run(repeat: int, scale: float) -> Dict[str, Dict]:
+    compileall.compile_dir(os.path.join(ROOT, 'src'), quiet=1)
+    results = {}
+    for module, limits in BUDGETS.items():
+        timings = []
+        modules = []
+        for _ in range(repeat):
+            elapsed, modules = import_profile(module)
+            timings.append(elapsed)
+        loaded = sorted({m.split('.')[0] for m in modules} & set(limits['forbidden']))
+        budget = limits['budget_ms'] * scale
+        results[module] = {
+            'import_ms': min(timings),
+            'budget_ms': budget,
+            'forbidden_loaded': loaded,
+            'ok': min(timings) <= budget and not loaded,
+        }
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per entry point (best is kept)')
+    parser.add_argument('--scale', type=float, default=1.0, help='Multiply every budget, e.g. for slow CI machines')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.scale)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for module, result in results.items():
+            status = 'ok' if result['ok'] else 'OVER BUDGET'
+            extra = f" loads {', '.join(result['forbidden_loaded'])}" if result['forbidden_loaded'] else ''
+            print(f"{module:16} {result['import_ms']:7.1f} ms / {result['budget_ms']:.0f} ms  {status}{extra}")
+    sys.exit(0 if all(r['ok'] for r in results.values()) else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+"""
+End-to-end load harness for the nightly run.
+
+Runs the full `src.main` pipeline offline: a local HTTP server serves a
+recorded results page, a local SMTP server accepts and counts every message,
+and a synthetic ticket book is seeded into a scratch working directory.
+Reports wall-clock time, the pipeline's own per-stage timings and counters
+(from its run_report.json), messages per second and peak RSS as JSON.
+
+Usage: python -m benchmarks.load_harness [--tickets 2000] [--page benchmarks/fixtures/cash4_results.html]
+"""
+import argparse
+import functools
+import http.server
+import json
+import os
+import re
+import resource
+import socketserver
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, datetime
+from typing import Any, Dict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PAGE = os.path.join(ROOT, 'benchmarks', 'fixtures', 'cash4_results.html')
+
+class SinkSMTPHandler(socketserver.StreamRequestHandler):
+    """Just enough SMTP to accept AUTH and messages from smtplib, then drop them."""
+
+    def reply(self, line: str):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        self.reply('220 localhost sink ready')
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode(errors='replace').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                self.wfile.write(b'250-localhost\r\n250-AUTH PLAIN LOGIN\r\n250 OK\r\n')
+            elif command.startswith('AUTH'):
+                self.reply('235 Authentication successful')
+            elif command.startswith('DATA'):
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                while self.rfile.readline() not in (b'.\r\n', b''):
+                    pass
+                time.sleep(self.server.delay)
+                self.server.count_message()
+                self.reply('250 OK')
+            elif command.startswith('QUIT'):
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+class SinkSMTPServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, delay: float = 0.0):
+        super().__init__(('127.0.0.1', 0), SinkSMTPHandler)
+        # Seconds to wait before accepting each message, like a remote server would
+        self.delay = delay
+        self.messages = 0
+        self._lock = threading.Lock()
+
+    def count_message(self):
+        with self._lock:
+            self.messages += 1
+
+class QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+def _serve(server: socketserver.BaseServer) -> threading.Thread:
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return thread
+
+def shift_draw_dates(page: str, latest: date) -> str:
+    """Move a recorded page's MM/DD/YYYY drawing dates so its most recent drawing falls on latest."""
+    dates = {d: datetime.strptime(d, '%m/%d/%Y').date() for d in re.findall(r'\d{2}/\d{2}/\d{4}', page)}
+    if not dates:
+        return page
+    offset = latest - max(dates.values())
+    return re.sub(r'\d{2}/\d{2}/\d{4}', lambda m: (dates[m.group()] + offset).strftime('%m/%d/%Y'), page)
+
+def seed_workdir(workdir: str, tickets: int, page: str, http_port: int, smtp_port: int):
+    """Write config, ticket book and results page into the scratch directory."""
+    from benchmarks.synthetic import iter_tickets
+
+    os.makedirs(os.path.join(workdir, 'config'))
+    os.makedirs(os.path.join(workdir, 'data'))
+    os.makedirs(os.path.join(workdir, 'site'))
+    # Tickets are checked against each drawing's own date, so the recorded drawings are moved to today
+    with open(page, encoding='utf-8') as src, open(os.path.join(workdir, 'site', 'cash4.html'), 'w',
+                                                  encoding='utf-8') as dst:
+        dst.write(shift_draw_dates(src.read(), date.today()))
+
+    config = {
+        'scraper': {'url': f'http://127.0.0.1:{http_port}/cash4.html', 'use_browser': False},
+        'email': {'smtp_server': '127.0.0.1', 'smtp_port': smtp_port, 'use_tls': False},
+        'data_files': {'tickets': 'data/tickets.json'},
+    }
+    with open(os.path.join(workdir, 'config', 'config.json'), 'w') as f:
+        json.dump(config, f, indent=2)
+    with open(os.path.join(workdir, 'data', 'tickets.json'), 'w') as f:
+        json.dump(list(iter_tickets(tickets, seed=tickets)), f)
+
+def run(tickets: int, page: str, keep: bool = False, smtp_delay: float = 0.0) -> Dict[str, Any]:
+    workdir = tempfile.mkdtemp(prefix='lottrack-load-')
+    smtp = SinkSMTPServer(smtp_delay)
+    http_server = socketserver.ThreadingTCPServer(
+        ('127.0.0.1', 0), functools.partial(QuietHandler, directory=os.path.join(workdir, 'site')))
+    http_server.daemon_threads = True
+    try:
+        seed_workdir(workdir, tickets, page, http_server.server_address[1], smtp.server_address[1])
+        _serve(smtp)
+        _serve(http_server)
+
+        env = dict(os.environ, PYTHONPATH=ROOT, EMAIL_USER='harness@gmail.com', EMAIL_PASSWORD='harness')
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, '-m', 'src.main'],
+            cwd=workdir, env=env, capture_output=True, text=True,
+        )
+        wall = time.perf_counter() - start
+        if proc.returncode != 0:
+            raise RuntimeError(f"Pipeline failed:\n{proc.stderr[-2000:]}")
+        with open(os.path.join(workdir, 'run_report.json'), 'r') as f:
+            run_report = json.load(f)
+    finally:
+        smtp.shutdown()
+        http_server.shutdown()
+        smtp.server_close()
+        http_server.server_close()
+        if not keep:
+            import shutil
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    send_time = sum(span['seconds'] for name, span in run_report['spans'].items() if name.startswith('smtp.'))
+    return {
+        'tickets': tickets,
+        'wall_seconds': wall,
+        'pipeline_seconds': run_report['elapsed_seconds'],
+        'stages': {name: span['seconds'] for name, span in run_report['spans'].items()},
+        'calls': {name: span['count'] for name, span in run_report['spans'].items()},
+        'counters': run_report['counters'],
+        'gauges': run_report.get('gauges', {}),
+        'messages': smtp.messages,
+        'messages_per_second': smtp.messages / wall if wall else None,
+        'send_messages_per_second': smtp.messages / send_time if send_time else None,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        'workdir': workdir if keep else None,
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickets', type=int, default=2000, help='Size of the synthetic ticket book')
+    parser.add_argument('--page', default=DEFAULT_PAGE, help='Recorded results page to serve')
+    parser.add_argument('--keep', action='store_true', help='Keep the scratch directory (logs, data) for inspection')
+    parser.add_argument('--smtp-delay', type=float, default=0.0, metavar='SECONDS',
+                        help='Make the SMTP sink wait this long before accepting each message')
+    parser.add_argument('--output', help='Write the JSON report to this file instead of stdout')
+    args = parser.parse_args()
+
+    report = json.dumps(run(args.tickets, args.page, args.keep, args.smtp_delay), indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(report + '\n')
+    else:
+        print(report)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+"""Synthetic ticket books for benchmarks."""
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, Iterator, List
+
+# Rough mix seen in real books: most players stick to straight and box plays
+PLAY_TYPE_WEIGHTS = {'straight': 40, 'box': 30, 'straightbox': 15, 'combo': 10, 'oneoff': 5}
+DRAW_TIME_WEIGHTS = {'MIDDAY': 30, 'EVENING': 35, 'NIGHT': 35}
+EMAIL_DOMAINS = ['gmail.com', 'yahoo.com', 'hotmail.com', 'outlook.com', 'icloud.com']
+
+def iter_tickets(count: int, seed: int = 0, today: date = None, players: int = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield `count` tickets in the TicketManager format.
+    About 80% are active today; the rest expired up to a year ago or start in the future.
+    Each player (email) owns ~10 tickets unless `players` says otherwise.
+    """
+    rng = random.Random(seed)
+    today = today or date.today()
+    players = players or max(count // 10, 1)
+    play_types, play_weights = zip(*PLAY_TYPE_WEIGHTS.items())
+    draw_times, draw_weights = zip(*DRAW_TIME_WEIGHTS.items())
+
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.8:
+            start = today - timedelta(days=rng.randrange(0, 60))
+            end = today + timedelta(days=rng.randrange(0, 90))
+        elif roll < 0.95:
+            end = today - timedelta(days=rng.randrange(1, 365))
+            start = end - timedelta(days=rng.randrange(0, 90))
+        else:
+            start = today + timedelta(days=rng.randrange(1, 30))
+            end = start + timedelta(days=rng.randrange(0, 90))
+        player = rng.randrange(players)
+        yield {
+            'numbers': list(f"{rng.randrange(10000):04d}"),
+            'play_type': rng.choices(play_types, play_weights)[0],
+            'draw_time': rng.choices(draw_times, draw_weights)[0],
+            'start_date': start.isoformat(),
+            'end_date': end.isoformat(),
+            'email': f"player{player}@{EMAIL_DOMAINS[player % len(EMAIL_DOMAINS)]}",
+            'created_at': start.isoformat(),
+        }
+
+def generate_tickets(count: int, seed: int = 0, today: date = None, players: int = None) -> List[Dict[str, Any]]:
+    """List form of iter_tickets."""
+    return list(iter_tickets(count, seed, today, players))
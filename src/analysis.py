@@ -0,0 +1,90 @@
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .games import DEFAULT_GAME, ticket_game
+from .play_types import PlayType
+
+OUTCOME_COUNT = 10000  # Every Cash 4 draw from 0000 to 9999 is equally likely
+
+def ticket_table(play_type: str, numbers: str, cache: Dict[Tuple[str, str], Any],
+                 game: str = DEFAULT_GAME) -> Optional[Tuple[float, Dict[str, float]]]:
+    """Look up a ticket's wager and winning outcomes, sharing them between identical tickets."""
+    # The draws analyzed are Cash 4 draws, which other games' tickets don't play
+    if game != DEFAULT_GAME:
+        return None
+    key = (play_type, numbers)
+    if key not in cache:
+        play = PlayType.create(play_type, numbers)
+        cache[key] = (play.wager, play.winning_outcomes()) if play else None
+    return cache[key]
+
+def analyze_draw(tickets: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Compute the exact prize distribution of a set of tickets played on a single draw.
+    Each ticket only touches the handful of outcomes it wins on, so the cost is
+    proportional to the number of tickets plus one pass over the 10,000 outcomes.
+    """
+    payouts = [0.0] * OUTCOME_COUNT
+    hits = defaultdict(set)
+    wagered = 0.0
+    ticket_count = 0
+    cache = {}
+
+    for ticket in tickets:
+        numbers = ticket['numbers']
+        if isinstance(numbers, list):
+            numbers = ''.join(numbers)
+        play_type = ticket['play_type']
+        table = ticket_table(play_type, numbers, cache, ticket_game(ticket))
+        if not table:
+            continue
+        wager, outcomes = table
+        ticket_count += 1
+        wagered += wager
+        for outcome, prize in outcomes.items():
+            index = int(outcome)
+            payouts[index] += prize
+            hits[play_type].add(index)
+
+    expected = sum(payouts) / OUTCOME_COUNT
+    second_moment = sum(p * p for p in payouts) / OUTCOME_COUNT
+    distribution = Counter(payouts)
+
+    return {
+        'tickets': ticket_count,
+        'wagered': wagered,
+        'expected_value': expected,
+        'expected_net': expected - wagered,
+        'variance': max(second_moment - expected * expected, 0.0),
+        'hit_probability': (OUTCOME_COUNT - distribution[0.0]) / OUTCOME_COUNT,
+        'hit_probability_by_play_type': {
+            play_type: len(indexes) / OUTCOME_COUNT for play_type, indexes in sorted(hits.items())
+        },
+        'distribution': {
+            prize: count / OUTCOME_COUNT for prize, count in sorted(distribution.items())
+        },
+    }
+
+def analyze_portfolio(tickets: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Analyze a ticket set drawing by drawing. Tickets for different draw times
+    play independent draws, so expected values and variances add up.
+    """
+    by_draw_time = defaultdict(list)
+    for ticket in tickets:
+        by_draw_time[ticket.get('draw_time', '').upper()].append(ticket)
+
+    draws = {draw_time: analyze_draw(group) for draw_time, group in sorted(by_draw_time.items())}
+
+    no_hit = 1.0
+    for result in draws.values():
+        no_hit *= 1.0 - result['hit_probability']
+
+    return {
+        'draws': draws,
+        'tickets': sum(r['tickets'] for r in draws.values()),
+        'wagered': sum(r['wagered'] for r in draws.values()),
+        'expected_value': sum(r['expected_value'] for r in draws.values()),
+        'expected_net': sum(r['expected_net'] for r in draws.values()),
+        'variance': sum(r['variance'] for r in draws.values()),
+        'hit_probability': 1.0 - no_hit,
+    }
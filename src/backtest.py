@@ -0,0 +1,118 @@
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import datetime, date
+from typing import Any, Dict, List, Tuple
+from .analysis import ticket_table
+from .games import ticket_game
+
+def _play_type_summary() -> Dict[str, Any]:
+    return {
+        'tickets': 0,
+        'wagered': 0.0,
+        'won': 0.0,
+        'hits': 0,
+        'draws_played': 0,
+        'draws_hit': 0,
+        'longest_hit_streak': 0,
+        'longest_drought': 0,
+        'current_drought': 0,
+    }
+
+def backtest(tickets: List[Dict[str, Any]], draws: List[Tuple[date, str, str]],
+             respect_dates: bool = True) -> Dict[str, Any]:
+    """
+    Replay tickets against historical drawings.
+
+    `draws` is a chronological list of (date, drawing type, numbers) as returned
+    by ResultsHistory.get_draws(). Instead of checking every ticket against every
+    drawing, all tickets are indexed by the numbers they win on, so each drawing
+    costs one dictionary lookup plus the work for its actual winners. Wagers are
+    counted by bisecting each ticket's date range into the drawing dates.
+    """
+    # Positions of each drawing type's drawings, and their date ordinals, oldest first
+    positions = defaultdict(list)
+    ordinals = defaultdict(list)
+    for i, (draw_date, draw_time, _) in enumerate(draws):
+        positions[draw_time.lower()].append(i)
+        ordinals[draw_time.lower()].append(draw_date.toordinal())
+
+    # winners[drawing type][numbers] -> [(ticket position, prize)]
+    winners = defaultdict(lambda: defaultdict(list))
+    windows = []
+    # Change in tickets in play per (play type, drawing position), summed into counts below
+    in_play = defaultdict(lambda: [0] * (len(draws) + 1))
+    summaries = defaultdict(_play_type_summary)
+    cache = {}
+
+    for pos, ticket in enumerate(tickets):
+        numbers = ticket['numbers']
+        if isinstance(numbers, list):
+            numbers = ''.join(numbers)
+        play_type = ticket['play_type']
+        draw_time = ticket.get('draw_time', '').lower()
+        table = ticket_table(play_type, numbers, cache, ticket_game(ticket))
+        if not table:
+            windows.append(None)
+            continue
+        wager, outcomes = table
+
+        draw_ordinals = ordinals[draw_time]
+        if respect_dates:
+            start = datetime.fromisoformat(ticket['start_date']).date().toordinal()
+            end = datetime.fromisoformat(ticket['end_date']).date().toordinal()
+            first, last = bisect_left(draw_ordinals, start), bisect_right(draw_ordinals, end)
+        else:
+            start, end = date.min.toordinal(), date.max.toordinal()
+            first, last = 0, len(draw_ordinals)
+        windows.append((start, end))
+
+        summary = summaries[play_type]
+        summary['tickets'] += 1
+        summary['wagered'] += wager * (last - first)
+        if first < last:
+            in_play[play_type][positions[draw_time][first]] += 1
+            in_play[play_type][positions[draw_time][last - 1] + 1] -= 1
+
+        for outcome, prize in outcomes.items():
+            winners[draw_time][outcome].append((pos, prize))
+
+    hit_draws = defaultdict(set)
+    for i, (draw_date, draw_time, numbers) in enumerate(draws):
+        day = draw_date.toordinal()
+        for pos, prize in winners[draw_time.lower()].get(numbers, ()):
+            start, end = windows[pos]
+            if start <= day <= end:
+                summary = summaries[tickets[pos]['play_type']]
+                summary['won'] += prize
+                summary['hits'] += 1
+                hit_draws[tickets[pos]['play_type']].add(i)
+
+    for play_type, summary in summaries.items():
+        active = 0
+        streak = 0
+        for i in range(len(draws)):
+            active += in_play[play_type][i]
+            if not active:
+                continue
+            summary['draws_played'] += 1
+            if i in hit_draws[play_type]:
+                summary['draws_hit'] += 1
+                streak = streak + 1 if streak > 0 else 1
+                summary['longest_hit_streak'] = max(summary['longest_hit_streak'], streak)
+            else:
+                streak = streak - 1 if streak < 0 else -1
+                summary['longest_drought'] = max(summary['longest_drought'], -streak)
+        summary['current_drought'] = -streak if streak < 0 else 0
+
+    wagered = sum(s['wagered'] for s in summaries.values())
+    won = sum(s['won'] for s in summaries.values())
+    return {
+        'draws': len(draws),
+        'first_draw': draws[0][0].isoformat() if draws else None,
+        'last_draw': draws[-1][0].isoformat() if draws else None,
+        'tickets': sum(s['tickets'] for s in summaries.values()),
+        'wagered': wagered,
+        'won': won,
+        'net': won - wagered,
+        'play_types': dict(sorted(summaries.items())),
+    }
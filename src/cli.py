@@ -1,9 +1,10 @@
 import click
 import re
 from datetime import datetime, date
-from typing import List, Set
+from typing import List, Optional, Set, Tuple
+from .codec import CodecError
 from .ticket_manager import TicketManager
-from .play_types import PlayType
+from .games import CHECKED_GAMES, DEFAULT_GAME, get_game
 
 # Common email domains
 COMMON_DOMAINS = {
@@ -56,10 +57,27 @@ DRAW_TIMES = {
     '3': 'NIGHT'
 }
 
-@click.group()
-def cli():
+class TrackerGroup(click.Group):
+    """Reports a ticket file that can't be read as a plain error instead of a traceback."""
+
+    def invoke(self, ctx):
+        try:
+            return super().invoke(ctx)
+        except CodecError as e:
+            raise click.ClickException(str(e))
+
+@click.group(cls=TrackerGroup)
+@click.option('--profile', type=click.Choice(['cpu', 'sample', 'memory']), default=None,
+              help='Profile the command and write cli.pstats/cli.collapsed to the current directory')
+@click.pass_context
+def cli(ctx, profile):
     """Georgia Lottery Cash 4 Number Tracker"""
-    pass
+    if profile:
+        from .profiling import Profiler
+
+        profiler = Profiler(profile, 'cli')
+        profiler.start()
+        ctx.call_on_close(lambda: click.echo(f"Profile written to {', '.join(profiler.stop())}", err=True))
 
 def get_play_types() -> Set[str]:
     """Get play types from user input."""
@@ -120,14 +138,23 @@ def get_email() -> str:
 @cli.command()
 @click.option('--numbers', prompt='Enter your 4-digit number (e.g., 1234)',
               help='Your 4-digit lottery number')
-def add_ticket(numbers):
+@click.option('--game', default=DEFAULT_GAME, show_default=True,
+              help='Game the ticket is for (only cash4 results are checked so far)')
+def add_ticket(numbers, game):
     """Add a new lottery ticket to track."""
     ticket_manager = TicketManager()
+    game_rules = get_game(game)
+    if game_rules is None:
+        click.echo(f'Error: Unknown game {game}')
+        return
+    if game_rules.key not in CHECKED_GAMES:
+        click.echo(f'Error: {game_rules.name} results are not checked yet, so its tickets would never be checked')
+        return
     
     # Validate numbers
     number_list = list(numbers)
-    if not ticket_manager._validate_numbers(number_list):
-        click.echo('Error: Invalid number format. Please enter 4 digits (0-9)')
+    if not ticket_manager._validate_numbers(number_list, game):
+        click.echo(f'Error: Invalid number format. Please enter {game_rules.digits} digits (0-9)')
         return
     
     # Get email
@@ -135,6 +162,10 @@ def add_ticket(numbers):
     
     # Get play types
     selected_play_types = get_play_types()
+    unavailable = sorted(selected_play_types - set(game_rules.plays))
+    if unavailable:
+        click.echo(f"Error: {game_rules.name} has no {', '.join(unavailable)} play")
+        return
     
     # Get draw times
     selected_draw_times = get_draw_times()
@@ -146,6 +177,7 @@ def add_ticket(numbers):
     # Show summary before creating tickets
     total_tickets = len(selected_play_types) * len(selected_draw_times)
     click.echo(f"\nYou are about to create {total_tickets} ticket(s):")
+    click.echo(f"Game: {game_rules.name}")
     click.echo(f"Number: {numbers}")
     click.echo(f"Email: {email}")
     click.echo(f"Play Types: {', '.join(selected_play_types)}")
@@ -158,135 +190,432 @@ def add_ticket(numbers):
         return
     
     # Add tickets for each combination
-    success_count = 0
+    created = []
     for play_type in selected_play_types:
         for draw_time in selected_draw_times:
-            if ticket_manager.add_ticket(number_list, play_type, draw_time, start_date, end_date, email):
-                success_count += 1
+            ticket_id = ticket_manager.add_ticket(number_list, play_type, draw_time, start_date, end_date, email, game)
+            if ticket_id:
+                created.append((ticket_id, play_type, draw_time))
     
-    if success_count > 0:
-        click.echo(f'\nSuccessfully added {success_count} ticket(s)!')
+    if created:
+        click.echo(f'\nSuccessfully added {len(created)} ticket(s)!')
         click.echo("\nCreated tickets:")
-        for play_type in selected_play_types:
-            for draw_time in selected_draw_times:
-                click.echo(f"- {play_type} play for {draw_time} drawing")
+        for ticket_id, play_type, draw_time in created:
+            click.echo(f"- {ticket_id}: {play_type} play for {draw_time} drawing")
     else:
         click.echo('Error: Failed to add tickets')
 
+def ticket_query_options(command):
+    """Filter, paging and output options shared by the ticket listing commands."""
+    options = [
+        click.option('--email', help='Only tickets for this email address'),
+        click.option('--draw-time', type=click.Choice(list(DRAW_TIMES.values()), case_sensitive=False),
+                     help='Only tickets for this drawing'),
+        click.option('--play-type', type=click.Choice(list(PLAY_TYPES.values())), help='Only tickets of this play type'),
+        click.option('--number', help='Only tickets playing this 4-digit number'),
+        click.option('--expiring-within', type=click.IntRange(0), metavar='DAYS', help='Only tickets ending within DAYS days'),
+        click.option('--limit', type=click.IntRange(0), help='Show at most this many tickets'),
+        click.option('--offset', type=click.IntRange(0), default=0, help='Skip this many matching tickets'),
+        click.option('--format', 'output', type=click.Choice(['detail', 'table', 'json']), default='detail',
+                     show_default=True, help='Output format'),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+def echo_tickets(tickets: List[dict], total: int, offset: int, output: str):
+    """Print one page of tickets in the chosen format."""
+    import json
+
+    if output == 'json':
+        click.echo(json.dumps({'total': total, 'offset': offset, 'tickets': tickets}, indent=2))
+        return
+    if output == 'table':
+        click.echo(f"{'ID':<6}  {'NUM':<4}  {'PLAY TYPE':<11}  {'DRAW':<7}  {'START':<10}  {'END':<10}  EMAIL")
+        for ticket in tickets:
+            click.echo(f"{ticket['id']:<6}  {''.join(ticket['numbers']):<4}  {ticket['play_type']:<11}  "
+                       f"{ticket.get('draw_time', ''):<7}  {ticket['start_date']:<10}  {ticket['end_date']:<10}  "
+                       f"{ticket.get('email', '')}")
+    else:
+        for ticket in tickets:
+            click.echo(f"\nTicket {ticket['id']}:")
+            # Handle both string and list number formats
+            numbers = ticket['numbers']
+            if isinstance(numbers, list):
+                numbers = ''.join(numbers)
+            click.echo(f"Numbers: {numbers}")
+            click.echo(f"Play Type: {ticket['play_type']}")
+            # Handle optional draw_time field
+            if 'draw_time' in ticket:
+                click.echo(f"Draw Time: {ticket['draw_time']}")
+            click.echo(f"Start Date: {ticket['start_date']}")
+            click.echo(f"End Date: {ticket['end_date']}")
+            if 'email' in ticket:
+                click.echo(f"Email: {ticket['email']}")
+    if len(tickets) < total:
+        click.echo(f"\nShowing {offset + 1}-{offset + len(tickets)} of {total} tickets (use --offset/--limit for more)")
+
+def find_tickets(output: str, offset: int, limit: Optional[int], **filters) -> Tuple[int, List[dict]]:
+    """
+    Query tickets from the snapshot's persisted indexes when it is up to date,
+    else from the ticket file. JSON output needs every field of each ticket,
+    so it always reads the ticket file.
+    """
+    from .snapshot import open_snapshot
+
+    snapshot = open_snapshot() if output != 'json' else None
+    if snapshot:
+        with snapshot:
+            return snapshot.query(offset=offset, limit=limit, **filters)
+    return TicketManager().query_tickets(offset=offset, limit=limit, **filters)
+
 @cli.command()
-def list_tickets():
-    """List all your lottery tickets."""
-    ticket_manager = TicketManager()
-    tickets = ticket_manager.list_tickets()
+@ticket_query_options
+@click.option('--active-on', type=click.DateTime(formats=['%Y-%m-%d']), help='Only tickets valid on YYYY-MM-DD')
+def list_tickets(email, draw_time, play_type, number, expiring_within, limit, offset, output, active_on):
+    """List your lottery tickets."""
+    total, tickets = find_tickets(
+        output, offset, limit, email=email, draw_time=draw_time, play_type=play_type, numbers=number,
+        active_on=active_on.date() if active_on else None, expiring_within=expiring_within,
+    )
     
-    if not tickets:
+    if not tickets and output != 'json':
         click.echo('No tickets found.')
         return
     
-    for i, ticket in enumerate(tickets):
-        click.echo(f"\nTicket #{i + 1}:")
-        # Handle both string and list number formats
-        numbers = ticket['numbers']
-        if isinstance(numbers, list):
-            numbers = ''.join(numbers)
-        click.echo(f"Numbers: {numbers}")
-        click.echo(f"Play Type: {ticket['play_type']}")
-        # Handle optional draw_time field
-        if 'draw_time' in ticket:
-            click.echo(f"Draw Time: {ticket['draw_time']}")
-        click.echo(f"Start Date: {ticket['start_date']}")
-        click.echo(f"End Date: {ticket['end_date']}")
-        if 'email' in ticket:
-            click.echo(f"Email: {ticket['email']}")
+    echo_tickets(tickets, total, offset, output)
 
 @cli.command()
-@click.option('--ticket-number', prompt='Enter the ticket number to delete (1-N)',
-              help='The number of the ticket to delete')
-def delete_ticket(ticket_number):
+@click.option('--ticket-id', prompt='Enter the ID of the ticket to delete (see list-tickets)',
+              help='The ID of the ticket to delete')
+def delete_ticket(ticket_id):
     """Delete a lottery ticket."""
-    try:
-        ticket_index = int(ticket_number) - 1  # Convert to 0-based index
-        ticket_manager = TicketManager()
+    ticket_manager = TicketManager()
+    
+    # Show ticket details so the user can see what they're deleting
+    ticket = ticket_manager.get_ticket(ticket_id)
+    if not ticket:
+        click.echo(f'Error: No ticket with ID {ticket_id}. Use list-tickets to see ticket IDs.')
+        return
         
-        # List tickets first so user can see what they're deleting
-        tickets = ticket_manager.list_tickets()
-        if not tickets:
-            click.echo('No tickets found.')
-            return
-            
-        if not 0 <= ticket_index < len(tickets):
-            click.echo(f'Error: Invalid ticket number. Please enter a number between 1 and {len(tickets)}')
-            return
-            
-        # Show ticket details before deletion
-        ticket = tickets[ticket_index]
-        click.echo("\nTicket to be deleted:")
-        numbers = ticket['numbers']
-        if isinstance(numbers, list):
-            numbers = ''.join(numbers)
-        click.echo(f"Numbers: {numbers}")
-        click.echo(f"Play Type: {ticket['play_type']}")
-        if 'draw_time' in ticket:
-            click.echo(f"Draw Time: {ticket['draw_time']}")
-        click.echo(f"Start Date: {ticket['start_date']}")
-        click.echo(f"End Date: {ticket['end_date']}")
-        if 'email' in ticket:
-            click.echo(f"Email: {ticket['email']}")
-            
-        # Confirm deletion
-        if click.confirm("\nAre you sure you want to delete this ticket?"):
-            if ticket_manager.remove_ticket(ticket_index):
-                click.echo('Ticket deleted successfully.')
-            else:
-                click.echo('Error: Failed to delete ticket.')
+    click.echo("\nTicket to be deleted:")
+    numbers = ticket['numbers']
+    if isinstance(numbers, list):
+        numbers = ''.join(numbers)
+    click.echo(f"Numbers: {numbers}")
+    click.echo(f"Play Type: {ticket['play_type']}")
+    if 'draw_time' in ticket:
+        click.echo(f"Draw Time: {ticket['draw_time']}")
+    click.echo(f"Start Date: {ticket['start_date']}")
+    click.echo(f"End Date: {ticket['end_date']}")
+    if 'email' in ticket:
+        click.echo(f"Email: {ticket['email']}")
+        
+    # Confirm deletion
+    if click.confirm("\nAre you sure you want to delete this ticket?"):
+        if ticket_manager.remove_ticket(ticket['id']):
+            click.echo('Ticket deleted successfully.')
         else:
-            click.echo('Ticket deletion cancelled.')
-            
-    except ValueError:
-        click.echo('Error: Please enter a valid ticket number.')
+            click.echo('Error: Failed to delete ticket.')
+    else:
+        click.echo('Ticket deletion cancelled.')
 
 @cli.command()
-@click.argument('ticket_index', type=int)
-def update_dates(ticket_index):
+@click.argument('ticket_id')
+@click.option('--start-date', type=click.DateTime(formats=['%Y-%m-%d']), help='New start date (YYYY-MM-DD)')
+@click.option('--end-date', type=click.DateTime(formats=['%Y-%m-%d']), help='New end date (YYYY-MM-DD)')
+def update_dates(ticket_id, start_date, end_date):
     """Update the validity dates of a ticket."""
     ticket_manager = TicketManager()
     
-    start_date = get_date("New start date")
-    end_date = get_date("New end date")
+    start_date = start_date.date() if start_date else get_date("New start date")
+    end_date = end_date.date() if end_date else get_date("New end date")
     
-    if ticket_manager.update_ticket_dates(ticket_index - 1, start_date, end_date):
+    if ticket_manager.update_ticket_dates(ticket_id, start_date, end_date):
         click.echo('Dates updated successfully!')
     else:
         click.echo('Error: Failed to update dates. Check if the ticket exists.')
 
 @cli.command()
-@click.argument('ticket_index', type=int)
-def remove_ticket(ticket_index):
+@click.argument('ticket_id')
+def remove_ticket(ticket_id):
     """Remove a lottery ticket."""
     ticket_manager = TicketManager()
     
-    if ticket_manager.remove_ticket(ticket_index - 1):
+    if ticket_manager.remove_ticket(ticket_id):
         click.echo('Ticket removed successfully!')
     else:
         click.echo('Error: Failed to remove ticket. Check if the ticket exists.')
 
 @cli.command()
-def check_active():
+@ticket_query_options
+def check_active(email, draw_time, play_type, number, expiring_within, limit, offset, output):
     """Check all active tickets."""
-    ticket_manager = TicketManager()
-    active_tickets = ticket_manager.get_active_tickets()
+    total, active_tickets = find_tickets(
+        output, offset, limit, email=email, draw_time=draw_time, play_type=play_type, numbers=number,
+        active_on=date.today(), expiring_within=expiring_within,
+    )
     
-    if not active_tickets:
+    if not active_tickets and output != 'json':
         click.echo('No active tickets found.')
         return
     
-    click.echo(f"Found {len(active_tickets)} active tickets:")
-    for i, ticket in enumerate(active_tickets):
-        click.echo(f"\nTicket #{i + 1}:")
-        click.echo(f"Numbers: {''.join(ticket['numbers'])}")
-        click.echo(f"Play Type: {ticket['play_type']}")
-        click.echo(f"Draw Time: {ticket['draw_time']}")
-        click.echo(f"Valid until: {ticket['end_date']}")
+    if output == 'detail':
+        click.echo(f"Found {total} active tickets:")
+    echo_tickets(active_tickets, total, offset, output)
+
+@cli.command()
+def snapshot():
+    """Write the binary ticket snapshot and indexes used for counts and listings (kept current from then on)."""
+    import os
+    import time
+
+    ticket_manager = TicketManager()
+    start = time.perf_counter()
+    ticket_manager.write_snapshot()
+    click.echo(f"Wrote {len(ticket_manager.get_tickets())} ticket(s) to {ticket_manager.snapshot_file} "
+               f"({os.path.getsize(ticket_manager.snapshot_file):,} bytes) in {time.perf_counter() - start:.2f}s")
+
+@cli.command()
+@click.option('--email', help='Only tickets for this email address')
+@click.option('--draw-time', type=click.Choice(list(DRAW_TIMES.values()), case_sensitive=False),
+              help='Only tickets for this drawing')
+@click.option('--play-type', type=click.Choice(list(PLAY_TYPES.values())), help='Only tickets of this play type')
+@click.option('--active-on', type=click.DateTime(formats=['%Y-%m-%d']), help='Only tickets valid on YYYY-MM-DD')
+def count_tickets(email, draw_time, play_type, active_on):
+    """Count tickets, from the snapshot when it is up to date."""
+    count, _ = find_tickets('table', 0, 0, email=email, draw_time=draw_time, play_type=play_type,
+                            active_on=active_on.date() if active_on else None)
+    click.echo(f"{count} ticket(s)")
+
+@cli.command()
+@click.argument('source', type=click.File('r', encoding='utf-8-sig'), default='-')
+@click.option('--format', 'fmt', type=click.Choice(['csv', 'ndjson']),
+              help='Input format (default: from the file extension, csv for stdin)')
+@click.option('--dry-run', is_flag=True, help='Validate only; do not add any tickets')
+@click.option('--max-rejects', default=50, show_default=True, help='How many rejected rows to print')
+def import_tickets(source, fmt, dry_run, max_rejects):
+    """Import tickets from a CSV or NDJSON file (or - for stdin).
+
+    Rows need numbers, play_type, draw_time, start_date, end_date (YYYY-MM-DD) and email.
+    """
+    from .importer import detect_format, import_tickets as run_import
+
+    fmt = fmt or detect_format(source.name) or 'csv'
+    rejected = 0
+
+    def on_reject(line_number, reason):
+        nonlocal rejected
+        rejected += 1
+        if rejected <= max_rejects:
+            click.echo(f"Rejected line {line_number}: {reason}", err=True)
+
+    reported = 0
+
+    def on_batch(read, accepted):
+        nonlocal reported
+        if read - reported >= 100000:
+            reported = read
+            click.echo(f"Validated {read:,} rows ({accepted:,} accepted)...", err=True)
+
+    accepted = run_import(TicketManager(), source, fmt, on_reject, dry_run=dry_run, on_batch=on_batch)
+    if rejected > max_rejects:
+        click.echo(f"... {rejected - max_rejects:,} more rejected rows not shown", err=True)
+    action = 'Validated' if dry_run else 'Imported'
+    click.echo(f"{action} {accepted:,} ticket(s); {rejected:,} row(s) rejected.")
+
+@cli.command()
+@click.option('--grace-days', type=int, default=TicketManager.ARCHIVE_GRACE_DAYS, show_default=True,
+              help='Keep tickets this many days past their end date')
+def archive_expired(grace_days):
+    """Move expired tickets into the compressed archive."""
+    ticket_manager = TicketManager()
+    archived = ticket_manager.archive_expired(grace_days=grace_days)
+    click.echo(f"Archived {archived} ticket(s) to {ticket_manager.archive_file}; {len(ticket_manager.get_tickets())} remain.")
+
+@cli.command()
+@click.option('--ticket-id', help='Archived ticket ID')
+@click.option('--email', help='Only show archived tickets for this email address')
+@click.option('--numbers', help='Only show archived tickets with this 4-digit number')
+def archived(ticket_id, email, numbers):
+    """Search the archive of expired tickets."""
+    tickets = TicketManager().find_archived_tickets(ticket_id, email, numbers)
+    if not tickets:
+        click.echo('No archived tickets found.')
+        return
+
+    for ticket in tickets:
+        click.echo(f"{ticket['id']}  {''.join(ticket['numbers'])}  {ticket['play_type']:<11} "
+                   f"{ticket.get('draw_time', ''):<7}  {ticket['start_date']} to {ticket['end_date']}  "
+                   f"{ticket.get('email', '')}")
+
+@cli.command()
+@click.argument('email')
+@click.option('--year', type=int, help='Only count drawings in this year')
+def winnings(email, year):
+    """Show an email address's recorded wins from the outcome ledger."""
+    from .ledger import open_ledgers
+
+    totals = {'checked': 0, 'wins': 0, 'won': 0.0}
+    for ledger in open_ledgers():
+        for key, value in ledger.user_totals(email, year).items():
+            totals[key] += value
+    period = f" in {year}" if year else ""
+    click.echo(f"{email}{period}: {totals['checked']} ticket check(s), {totals['wins']} win(s), "
+               f"${totals['won']:,.2f} won")
+
+@cli.command()
+@click.option('--ticket-id', help='Show the recorded outcomes of this ticket')
+@click.option('--email', help='Only show winning tickets for this email address')
+def outcomes(ticket_id, email):
+    """List tickets that have ever won, from the outcome ledger."""
+    from .ledger import open_ledgers
+
+    ledgers = open_ledgers()
+    if ticket_id:
+        found = [totals for totals in (ledger.ticket_totals(ticket_id) for ledger in ledgers) if totals]
+        rows = [(ticket_id.lower(), totals) for totals in found]
+    else:
+        rows = sorted((row for ledger in ledgers for row in ledger.winning_tickets(email)),
+                      key=lambda row: row[1]['last_win'] or '', reverse=True)
+    if not rows:
+        click.echo('No recorded outcomes found.')
+        return
+
+    for ticket_id, totals in rows:
+        click.echo(f"{ticket_id}  {totals['email']}  {totals['checked']} drawing(s), {totals['wins']} win(s), "
+                   f"${totals['won']:,.2f} won, last win: {totals['last_win'] or 'never'}")
+
+@cli.command()
+@click.option('--email', help='Only analyze tickets for this email address')
+@click.option('--all', 'include_inactive', is_flag=True, help='Include tickets that are not active today')
+def analyze(email, include_inactive):
+    """Show expected value and risk of your tickets per drawing."""
+    from .analysis import analyze_portfolio
+
+    ticket_manager = TicketManager()
+    tickets = ticket_manager.get_tickets() if include_inactive else ticket_manager.get_active_tickets()
+    if email:
+        tickets = [t for t in tickets if t.get('email', '').lower() == email.lower()]
+
+    if not tickets:
+        click.echo('No tickets found.')
+        return
+
+    report = analyze_portfolio(tickets)
+    for draw_time, result in report['draws'].items():
+        click.echo(f"\n{draw_time or 'UNKNOWN'} drawing ({result['tickets']} ticket(s)):")
+        click.echo(f"Wagered: ${result['wagered']:,.2f}")
+        click.echo(f"Expected Return: ${result['expected_value']:,.2f} (net ${result['expected_net']:,.2f})")
+        click.echo(f"Standard Deviation: ${result['variance'] ** 0.5:,.2f}")
+        click.echo(f"Chance of Any Win: {result['hit_probability']:.2%}")
+        for play_type, probability in result['hit_probability_by_play_type'].items():
+            click.echo(f"  {play_type}: {probability:.2%}")
+
+    click.echo(f"\nTotal per day of drawings ({report['tickets']} ticket(s)):")
+    click.echo(f"Wagered: ${report['wagered']:,.2f}")
+    click.echo(f"Expected Return: ${report['expected_value']:,.2f} (net ${report['expected_net']:,.2f})")
+    click.echo(f"Standard Deviation: ${report['variance'] ** 0.5:,.2f}")
+    click.echo(f"Chance of Any Win: {report['hit_probability']:.2%}")
+
+@cli.command()
+@click.option('--email', help='Only replay tickets for this email address')
+@click.option('--numbers', multiple=True, help='Replay a hypothetical 4-digit number instead of stored tickets (repeatable)')
+@click.option('--play-type', 'play_types', multiple=True, type=click.Choice(list(PLAY_TYPES.values())),
+              help='Play type(s) for --numbers (default: straight)')
+@click.option('--draw-time', 'draw_times', multiple=True, type=click.Choice(list(DRAW_TIMES.values()), case_sensitive=False),
+              help='Draw time(s) for --numbers (default: all)')
+@click.option('--since', type=click.DateTime(formats=['%Y-%m-%d']), help='Only replay drawings on or after YYYY-MM-DD')
+def backtest(email, numbers, play_types, draw_times, since):
+    """Replay tickets against the stored drawing history."""
+    from .backtest import backtest as run_backtest
+    from .history import ResultsHistory
+
+    draws = ResultsHistory().get_draws()
+    if since:
+        draws = [d for d in draws if d[0] >= since.date()]
+    if not draws:
+        click.echo('No drawing history found.')
+        return
+
+    if numbers:
+        game_rules = get_game()
+        for number in numbers:
+            if not game_rules.valid_numbers(list(number)):
+                click.echo(f'Error: Invalid number {number}. Please enter {game_rules.digits} digits (0-9)')
+                return
+        tickets = [
+            {'numbers': list(number), 'play_type': play_type, 'draw_time': draw_time.upper()}
+            for number in numbers
+            for play_type in (play_types or ['straight'])
+            for draw_time in (draw_times or DRAW_TIMES.values())
+        ]
+        report = run_backtest(tickets, draws, respect_dates=False)
+    else:
+        tickets = TicketManager().get_tickets()
+        if email:
+            tickets = [t for t in tickets if t.get('email', '').lower() == email.lower()]
+        if not tickets:
+            click.echo('No tickets found.')
+            return
+        report = run_backtest(tickets, draws)
+
+    click.echo(f"Replayed {report['tickets']} ticket(s) over {report['draws']} drawing(s) "
+               f"from {report['first_draw']} to {report['last_draw']}")
+    click.echo(f"Wagered: ${report['wagered']:,.2f}")
+    click.echo(f"Won: ${report['won']:,.2f}")
+    click.echo(f"Net: ${report['net']:,.2f}")
+    for play_type, summary in report['play_types'].items():
+        click.echo(f"\n{play_type}:")
+        click.echo(f"  Wagered: ${summary['wagered']:,.2f}  Won: ${summary['won']:,.2f}  Hits: {summary['hits']}")
+        click.echo(f"  Drawings hit: {summary['draws_hit']} of {summary['draws_played']}")
+        click.echo(f"  Longest hit streak: {summary['longest_hit_streak']}  "
+                   f"Longest drought: {summary['longest_drought']}  Current drought: {summary['current_drought']}")
+
+@cli.command()
+@click.option('--number', help='Show how often and how recently a 4-digit number was drawn')
+@click.option('--top', default=3, show_default=True, help='How many hot/cold digits to show')
+def stats(number, top):
+    """Show digit, pair and number statistics for past drawings."""
+    import os
+    from .stats import DrawStatistics
+
+    # The running aggregates answer everything; the history is only parsed to create them
+    statistics = DrawStatistics()
+    if not os.path.exists(statistics.data_file):
+        from .history import ResultsHistory
+        statistics.rebuild(ResultsHistory().get_draws())
+    if not statistics.draw_count:
+        click.echo('No drawing history found.')
+        return
+
+    click.echo(f"Drawings recorded: {statistics.draw_count} (latest {statistics.stats['last_draw']})")
+
+    click.echo("\nDigit frequency by position:")
+    click.echo("Digit " + " ".join(f"{d:>5}" for d in range(10)))
+    for position, counts in enumerate(statistics.position_frequencies(), start=1):
+        click.echo(f"Pos {position} " + " ".join(f"{c:>5}" for c in counts))
+
+    click.echo("\nHot and cold digits:")
+    for draw_time in DRAW_TIMES.values():
+        hot = ', '.join(map(str, statistics.hot_digits(draw_time, top)))
+        cold = ', '.join(map(str, statistics.cold_digits(draw_time, top)))
+        click.echo(f"{draw_time:8} hot: {hot}  cold: {cold}")
+
+    if number:
+        game_rules = get_game()
+        if not game_rules.valid_numbers(list(number)):
+            click.echo(f'Error: Invalid number format. Please enter {game_rules.digits} digits (0-9)')
+            return
+        days = statistics.days_since_seen(number)
+        click.echo(f"\nNumber {number}:")
+        click.echo(f"Last drawn: {'never' if days is None else f'{days} day(s) ago'}")
+        click.echo(f"Drawn in any order: {statistics.class_count(number)} time(s)")
+        digits = sorted(set(number))
+        for i, a in enumerate(digits):
+            for b in digits[i:]:
+                if a != b or number.count(a) > 1:
+                    click.echo(f"Digits {a} and {b} together: {statistics.pair_count(int(a), int(b))} drawing(s)")
 
 if __name__ == '__main__':
     cli() 
\ No newline at end of file
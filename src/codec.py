@@ -0,0 +1,130 @@
+"""
+Serialization for the JSON data files (tickets, scraped results, results history).
+
+Uses orjson, or msgspec, when installed and falls back to the standard json
+module. Output is compact JSON, optionally gzip- or zstd-compressed. Files
+are read back whatever they were written with: compression is detected from
+the file's magic bytes, and the indented JSON written by earlier versions
+decodes like any other JSON.
+"""
+import json
+import logging
+import os
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ('gzip', 'zstd')
+GZIP_MAGIC = b'\x1f\x8b'
+ZSTD_MAGIC = b'\x28\xb5\x2f\xfd'
+
+_backend = None
+_library = None
+
+class CodecError(ValueError):
+    """A data file that can't be decoded: corrupt, or compressed with a library that isn't installed."""
+
+def backend() -> str:
+    """Name of the JSON library in use: orjson, msgspec or json."""
+    global _backend, _library
+    # Resolved on first use rather than at import: importing orjson alone would
+    # take a third of src.main's startup budget
+    if _backend is None:
+        try:
+            import orjson as _library
+            _backend = 'orjson'
+        except ImportError:
+            try:
+                import msgspec.json as _library
+                _backend = 'msgspec'
+            except ImportError:
+                _library, _backend = json, 'json'
+    return _backend
+
+def configured_compression(config_file: str = "config/config.json") -> Optional[str]:
+    """The data_files.compression setting, if any."""
+    try:
+        with open(config_file, 'rb') as f:
+            compression = loads(f.read())['data_files'].get('compression')
+    except Exception:
+        return None
+    if compression and compression not in COMPRESSIONS:
+        logger.warning(f"Unknown data file compression {compression!r}; writing uncompressed")
+        return None
+    return compression or None
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Encode obj as compact UTF-8 JSON."""
+    name = backend()
+    if name == 'orjson':
+        return _library.dumps(obj, option=_library.OPT_SORT_KEYS if sort_keys else 0)
+    if name == 'msgspec':
+        return _library.encode(obj, order='sorted' if sort_keys else None)
+    return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys, ensure_ascii=False).encode('utf-8')
+
+def loads(data: bytes) -> Any:
+    """Decode JSON, decompressing it first if it is gzip or zstd compressed."""
+    data = decompress(data)
+    name = backend()
+    if name == 'orjson':
+        return _library.loads(data)
+    if name == 'msgspec':
+        return _library.decode(data)
+    return json.loads(data)
+
+def compress(data: bytes, compression: Optional[str]) -> bytes:
+    if compression == 'gzip':
+        import gzip
+
+        # Level 6 is most of level 9's ratio at a fraction of the time
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            logger.warning("zstandard is not installed; writing gzip instead of zstd")
+            return compress(data, 'gzip')
+        return zstandard.ZstdCompressor().compress(data)
+    return data
+
+def decompress(data: bytes) -> bytes:
+    """Decompress gzip or zstd data; anything else is returned as it is."""
+    if data[:2] == GZIP_MAGIC:
+        import gzip
+        import zlib
+
+        try:
+            return gzip.decompress(data)
+        except (OSError, EOFError, zlib.error) as e:
+            raise CodecError(f"corrupt gzip data: {e}") from e
+    if data[:4] == ZSTD_MAGIC:
+        try:
+            import zstandard
+        except ImportError as e:
+            raise CodecError("data is zstd-compressed but zstandard is not installed "
+                             "(pip install zstandard)") from e
+        try:
+            return zstandard.ZstdDecompressor().decompressobj().decompress(data)
+        except zstandard.ZstdError as e:
+            raise CodecError(f"corrupt zstd data: {e}") from e
+    return data
+
+def load_file(path: str) -> Any:
+    """Read a data file. Raises CodecError, naming the file, if it can't be decoded."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    try:
+        return loads(data)
+    except CodecError as e:
+        raise CodecError(f"Can't read {path}: {e}") from e
+    except Exception as e:
+        # json and orjson raise ValueErrors, msgspec its own DecodeError
+        raise CodecError(f"Can't read {path}: invalid JSON ({e})") from e
+
+def dump_file(path: str, obj: Any, compression: Optional[str] = None, sort_keys: bool = False):
+    """Write obj to path, replacing the file only once the new contents are fully written."""
+    data = compress(dumps(obj, sort_keys), compression)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
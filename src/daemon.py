@@ -0,0 +1,163 @@
+"""
+Long-running checker that processes each drawing as soon as its result posts.
+
+Run with: python -m src.daemon
+"""
+import argparse
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Optional, Set, Tuple
+import pytz
+import schedule
+from .ledger import OutcomeLedger
+from .main import configure_logging, process_drawing
+from .precompute import WinnerTable
+from .scraper import LotteryScraper
+from .ticket_manager import TicketManager
+from .email_notifier import EmailNotifier
+
+logger = logging.getLogger(__name__)
+
+TIMEZONE = 'US/Eastern'  # Drawing times are Georgia local time
+# Winners are precomputed this many minutes before each drawing
+PREPARE_MINUTES = 15
+
+class DrawWatcher:
+    """Keeps the scraper, tickets and notifier loaded between drawings."""
+
+    def __init__(self, scraper: LotteryScraper, ticket_manager: TicketManager, email_notifier: EmailNotifier,
+                 initial_delay: float = 30, max_delay: float = 600, max_wait: float = 3 * 3600,
+                 sleep: Callable[[float], None] = time.sleep, ledger: Optional[OutcomeLedger] = None):
+        self.scraper = scraper
+        self.ticket_manager = ticket_manager
+        self.email_notifier = email_notifier
+        self.ledger = ledger
+        self.initial_delay = initial_delay
+        self.max_delay = max_delay
+        self.max_wait = max_wait
+        self.sleep = sleep
+        self.processed: Set[Tuple[str, str]] = set()
+        # Winner tables built ahead of each drawing, by draw time
+        self.tables: Dict[str, WinnerTable] = {}
+
+    @staticmethod
+    def today() -> str:
+        """Today's date in the lottery's time zone, in the results table's MM/DD/YYYY format."""
+        return datetime.now(pytz.timezone(TIMEZONE)).strftime('%m/%d/%Y')
+
+    def wait_for_drawing(self, draw_time: str, draw_date: str) -> Optional[str]:
+        """
+        Poll the results page until the drawing for draw_date shows up.
+        The delay between polls doubles up to max_delay; gives up after max_wait seconds.
+        """
+        delay = self.initial_delay
+        waited = 0.0
+        while True:
+            try:
+                result = self.scraper.get_winning_numbers(refresh=True).get(draw_time.lower())
+            except Exception as e:
+                logger.error(f"Error fetching {draw_time} results: {str(e)}")
+                result = None
+            if result and result[1] == draw_date:
+                return result[0]
+            if waited >= self.max_wait:
+                return None
+            logger.info(f"{draw_time} drawing for {draw_date} not posted yet, retrying in {delay:.0f}s")
+            self.sleep(delay)
+            waited += delay
+            delay = min(delay * 2, self.max_delay)
+
+    def prepare(self, draw_time: str) -> Optional[WinnerTable]:
+        """
+        Before draw_time's drawing, work out the winners of every possible result
+        and render their emails, so they can be sent as soon as the result posts.
+        """
+        # Pick up tickets added or changed through the CLI since the last drawing
+        if self.ticket_manager.reload_if_changed():
+            logger.info("Reloaded tickets")
+        try:
+            # Tickets active on the drawing's Eastern date, which the check compares against
+            table = WinnerTable.build(self.ticket_manager, draw_time,
+                                      active_on=datetime.strptime(self.today(), '%m/%d/%Y').date())
+            rendered = table.render(self.email_notifier)
+        except Exception as e:
+            logger.error(f"Error precomputing {draw_time} winners: {str(e)}")
+            return None
+        self.tables[draw_time] = table
+        logger.info(f"Precomputed {draw_time} winners: {table.tickets} tickets, {table.pairs} winning "
+                    f"(result, ticket) pairs, {rendered} emails rendered")
+        return table
+
+    def check(self, draw_time: str) -> bool:
+        """Wait for today's result for draw_time and process just that drawing."""
+        draw_date = self.today()
+        if (draw_date, draw_time) in self.processed:
+            return False
+
+        winning_numbers = self.wait_for_drawing(draw_time, draw_date)
+        if not winning_numbers:
+            logger.warning(f"Gave up waiting for the {draw_time} drawing for {draw_date}")
+            return False
+
+        # Pick up tickets added or changed through the CLI since the last drawing
+        if self.ticket_manager.reload_if_changed():
+            logger.info("Reloaded tickets")
+
+        logger.info(f"Processing {draw_time} drawing for {draw_date}: {winning_numbers}")
+        try:
+            # A table built before the drawing is only used if the tickets haven't changed since
+            process_drawing(draw_time, winning_numbers, self.ticket_manager, self.email_notifier,
+                            draw_date=datetime.strptime(draw_date, '%m/%d/%Y').date(), ledger=self.ledger,
+                            table=self.tables.pop(draw_time, None))
+        except Exception as e:
+            logger.error(f"Error processing {draw_time} drawing: {str(e)}")
+            return False
+        self.processed.add((draw_date, draw_time))
+        return True
+
+def schedule_drawings(watcher: DrawWatcher, offset_minutes: int = 2, scheduler: schedule.Scheduler = None,
+                      prepare_minutes: int = PREPARE_MINUTES) -> schedule.Scheduler:
+    """
+    Schedule a check shortly after each drawing time in LotteryScraper.DRAWING_TIMES,
+    and precomputing its winners prepare_minutes before it (0 to skip).
+    """
+    scheduler = scheduler or schedule.Scheduler()
+    for draw_time, clock in LotteryScraper.DRAWING_TIMES.items():
+        drawn = datetime.strptime(clock, '%I:%M %p')
+        at = drawn + timedelta(minutes=offset_minutes)
+        scheduler.every().day.at(at.strftime('%H:%M'), TIMEZONE).do(watcher.check, draw_time.upper())
+        if prepare_minutes:
+            at = drawn - timedelta(minutes=prepare_minutes)
+            scheduler.every().day.at(at.strftime('%H:%M'), TIMEZONE).do(watcher.prepare, draw_time.upper())
+    return scheduler
+
+def run(offset_minutes: int = 2, max_wait_minutes: int = 180):
+    """Run the checker until interrupted."""
+    scraper = LotteryScraper(keep_browser=True)
+    watcher = DrawWatcher(scraper, TicketManager(), EmailNotifier(), max_wait=max_wait_minutes * 60,
+                          ledger=OutcomeLedger())
+    scheduler = schedule_drawings(watcher, offset_minutes)
+    for job in scheduler.get_jobs():
+        logger.info(f"Scheduled: {job}")
+    try:
+        while True:
+            scheduler.run_pending()
+            time.sleep(min(max(scheduler.idle_seconds or 60, 1), 60))
+    except KeyboardInterrupt:
+        logger.info("Stopping")
+    finally:
+        scraper.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Check each Cash 4 drawing as soon as it posts.")
+    parser.add_argument('--offset-minutes', type=int, default=2,
+                        help='Minutes after the drawing time to start polling (default: 2)')
+    parser.add_argument('--max-wait-minutes', type=int, default=180,
+                        help='Give up on a drawing that has not posted after this long (default: 180)')
+    args = parser.parse_args()
+    configure_logging()
+    run(args.offset_minutes, args.max_wait_minutes)
+
+if __name__ == "__main__":
+    main()
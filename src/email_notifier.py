@@ -1,12 +1,9 @@
 import os
-import smtplib
 import json
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 import logging
-from datetime import datetime, date
 import re
+from .metrics import metrics
 
 logger = logging.getLogger(__name__)
 
@@ -50,81 +47,11 @@ class EmailNotifier:
             logger.error(f"Error loading config file: {str(e)}")
             return {}
 
-    def _create_html_content(self, drawing_type: str, winning_numbers: str,
-                           results: Dict[str, List[Dict]]) -> str:
-        """Create HTML content for the email."""
-        html = f"""
-        <html>
-        <head>
-            <style>
-                body {{ font-family: Arial, sans-serif; }}
-                .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                .header {{ background-color: #f8f9fa; padding: 20px; text-align: center; }}
-                .content {{ padding: 20px; }}
-                .ticket {{ border: 1px solid #ddd; padding: 10px; margin: 10px 0; }}
-                .win {{ color: green; }}
-                .no-win {{ color: red; }}
-            </style>
-        </head>
-        <body>
-            <div class="container">
-                <div class="header">
-                    <h2>Georgia Cash 4 Results</h2>
-                    <p>Drawing Type: {drawing_type}</p>
-                    <p>Winning Numbers: {winning_numbers}</p>
-                    <p>Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
-                </div>
-                <div class="content">
-        """
-        
-        if not results:
-            html += "<p class='no-win'>No winning tickets for this drawing.</p>"
-        else:
-            for user_id, user_results in results.items():
-                html += f"<h3>User: {user_id}</h3>"
-                for result in user_results:
-                    html += f"""
-                    <div class="ticket">
-                        <p>Ticket ID: {result['ticket_id']}</p>
-                        <p class="win">Prize Amount: ${result['prize']:.2f}</p>
-                    </div>
-                    """
-                    
-        html += """
-                </div>
-            </div>
-        </body>
-        </html>
-        """
-        return html
-        
-    def _create_plain_content(self, drawing_type: str, winning_numbers: str,
-                            results: Dict[str, List[Dict]]) -> str:
-        """Create plain text content for the email."""
-        content = f"""
-Georgia Cash 4 Results
-=====================
-Drawing Type: {drawing_type}
-Winning Numbers: {winning_numbers}
-Date: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-"""
-        
-        if not results:
-            content += "No winning tickets for this drawing."
-        else:
-            for user_id, user_results in results.items():
-                content += f"\nUser: {user_id}\n"
-                for result in user_results:
-                    content += f"""
-Ticket ID: {result['ticket_id']}
-Prize Amount: ${result['prize']:.2f}
-"""
-                    
-        return content
-        
-    def _create_message(self, subject: str, body: str, recipient_email: str) -> MIMEMultipart:
+    def _create_message(self, subject: str, body: str, recipient_email: str) -> 'MIMEMultipart':
         """Create an email message."""
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
+
         message = MIMEMultipart()
         message['From'] = self.sender_email
         message['To'] = recipient_email
@@ -133,37 +60,70 @@ Prize Amount: ${result['prize']:.2f}
         message.attach(MIMEText(body, 'plain'))
         return message
 
+    def _send_message(self, message: 'MIMEMultipart'):
+        """Send a message through the configured SMTP server."""
+        import smtplib
+
+        # Connect to Gmail SMTP server
+        with metrics.span('smtp.connect'):
+            server = smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port'])
+        with server:
+            with metrics.span('smtp.auth'):
+                if self.email_config.get('use_tls', True):
+                    server.starttls()  # Enable TLS
+                server.login(self.sender_email, self.sender_password)
+            with metrics.span('smtp.send'):
+                server.send_message(message)
+
     def send_notification(self, ticket: Dict, winning_numbers: list, prize_amount: float) -> bool:
         """Send notification about lottery results."""
+        message = self.render_notification(ticket, winning_numbers, prize_amount)
+        return message is not None and self.deliver(message)
+
+    def render_notification(self, ticket: Dict, winning_numbers: list,
+                            prize_amount: float) -> Optional['MIMEMultipart']:
+        """
+        Build the results message for a ticket without sending it, so the
+        pipeline in src.main can render and deliver in separate stages.
+        Returns None (counted as a failed email) if it cannot be sent.
+        """
         try:
             if not all([self.sender_email, self.sender_password]):
-                logger.error("Email configuration is incomplete")
-                return False
+                metrics.incr('emails_failed')
+                logger.debug("Email configuration is incomplete")
+                return None
 
             recipient_email = ticket.get('email')
             if not validate_email(recipient_email):
-                logger.error(f"Invalid or missing recipient email: {recipient_email} for ticket: {ticket}")
-                return False
+                metrics.incr('emails_failed')
+                logger.error(f"Invalid or missing recipient email: {recipient_email} for ticket {ticket.get('numbers')}")
+                return None
 
-            if prize_amount > 0:
-                subject = "🎉 Congratulations! You Won the Georgia Cash 4!"
-                body = self.format_winning_message(ticket, winning_numbers, prize_amount)
-            else:
-                subject = "Georgia Cash 4 Results"
-                body = self.format_losing_message(ticket, winning_numbers)
-
-            message = self._create_message(subject, body, recipient_email)
-            
-            # Connect to Gmail SMTP server
-            with smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port']) as server:
-                server.starttls()  # Enable TLS
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
-                
-            logger.info(f"Email notification sent successfully to {recipient_email}")
+            with metrics.span('email.render'):
+                if prize_amount > 0:
+                    subject = "🎉 Congratulations! You Won the Georgia Cash 4!"
+                    body = self.format_winning_message(ticket, winning_numbers, prize_amount)
+                else:
+                    subject = "Georgia Cash 4 Results"
+                    body = self.format_losing_message(ticket, winning_numbers)
+
+                return self._create_message(subject, body, recipient_email)
+
+        except Exception as e:
+            metrics.incr('emails_failed')
+            logger.error(f"Error rendering email notification: {str(e)}")
+            return None
+
+    def deliver(self, message: 'MIMEMultipart') -> bool:
+        """Send a message built by render_notification."""
+        try:
+            self._send_message(message)
+            metrics.incr('emails_sent')
+            logger.debug(f"Email notification sent successfully to {message['To']}")
             return True
 
         except Exception as e:
+            metrics.incr('emails_failed')
             logger.error(f"Error sending email notification: {str(e)}")
             return False
 
@@ -171,36 +131,69 @@ Prize Amount: ${result['prize']:.2f}
         """Send notification about ticket expiration."""
         try:
             if not all([self.sender_email, self.sender_password]):
-                logger.error("Email configuration is incomplete")
+                metrics.incr('emails_failed')
+                logger.debug("Email configuration is incomplete")
                 return False
 
             recipient_email = ticket.get('email')
             if not validate_email(recipient_email):
-                logger.error(f"Invalid or missing recipient email: {recipient_email} for ticket: {ticket}")
+                metrics.incr('emails_failed')
+                logger.error(f"Invalid or missing recipient email: {recipient_email} for ticket {ticket.get('numbers')}")
                 return False
 
-            subject = "⚠️ Your Georgia Cash 4 Ticket is Expiring Soon"
-            body = self.format_expiration_message(ticket, days_remaining)
-            
-            message = self._create_message(subject, body, recipient_email)
-            
-            with smtplib.SMTP(self.email_config['smtp_server'], self.email_config['smtp_port']) as server:
-                server.starttls()
-                server.login(self.sender_email, self.sender_password)
-                server.send_message(message)
+            with metrics.span('email.render'):
+                subject = "⚠️ Your Georgia Cash 4 Ticket is Expiring Soon"
+                body = self.format_expiration_message(ticket, days_remaining)
                 
-            logger.info(f"Expiration notification sent successfully to {recipient_email}")
+                message = self._create_message(subject, body, recipient_email)
+            self._send_message(message)
+                
+            metrics.incr('emails_sent')
+            logger.debug(f"Expiration notification sent successfully to {recipient_email}")
             return True
 
         except Exception as e:
+            metrics.incr('emails_failed')
             logger.error(f"Error sending expiration notification: {str(e)}")
             return False
 
+    def send_expiration_digest(self, recipient_email: str, expiring: List[Tuple[Dict, int]]) -> bool:
+        """Send one notice covering all of a recipient's expiring (ticket, days_remaining) pairs."""
+        if len(expiring) == 1:
+            return self.send_expiration_notification(*expiring[0])
+        try:
+            if not all([self.sender_email, self.sender_password]):
+                metrics.incr('emails_failed')
+                logger.debug("Email configuration is incomplete")
+                return False
+
+            if not validate_email(recipient_email):
+                metrics.incr('emails_failed')
+                logger.error(f"Invalid or missing recipient email: {recipient_email} for {len(expiring)} tickets")
+                return False
+
+            with metrics.span('email.render'):
+                subject = f"⚠️ {len(expiring)} of Your Georgia Cash 4 Tickets Are Expiring Soon"
+                body = self.format_expiration_digest(expiring)
+
+                message = self._create_message(subject, body, recipient_email)
+            self._send_message(message)
+
+            metrics.incr('emails_sent')
+            logger.debug(f"Expiration digest for {len(expiring)} tickets sent successfully to {recipient_email}")
+            return True
+
+        except Exception as e:
+            metrics.incr('emails_failed')
+            logger.error(f"Error sending expiration digest: {str(e)}")
+            return False
+
     def format_winning_message(self, ticket: Dict, winning_numbers: list, prize_amount: float) -> str:
         """Format winning notification message."""
         return f"""
 Congratulations! Your Georgia Cash 4 ticket has won!
 
+Ticket ID: {ticket.get('id', 'n/a')}
 Your Numbers: {'-'.join(ticket['numbers'])}
 Winning Numbers: {'-'.join(winning_numbers)}
 Play Type: {ticket['play_type']}
@@ -217,6 +210,7 @@ Good luck with your next ticket!
         return f"""
 Your Georgia Cash 4 results are in:
 
+Ticket ID: {ticket.get('id', 'n/a')}
 Your Numbers: {'-'.join(ticket['numbers'])}
 Winning Numbers: {'-'.join(winning_numbers)}
 Play Type: {ticket['play_type']}
@@ -231,11 +225,30 @@ Unfortunately, this ticket did not win. Better luck next time!
 Your Georgia Cash 4 ticket is expiring soon!
 
 Ticket Details:
+Ticket ID: {ticket.get('id', 'n/a')}
 Numbers: {'-'.join(ticket['numbers'])}
 Play Type: {ticket['play_type']}
 Draw Time: {ticket['draw_time']}
 Days Remaining: {days_remaining}
 
 If you want to continue tracking these numbers, please update the ticket's end date using the CLI:
-python -m src.cli update-dates <ticket_number> --start-date YYYY-MM-DD --end-date YYYY-MM-DD
-""" 
\ No newline at end of file
+python -m src.cli update-dates {ticket.get('id', '<ticket_id>')} --start-date YYYY-MM-DD --end-date YYYY-MM-DD
+"""
+
+    def format_expiration_digest(self, expiring: List[Tuple[Dict, int]]) -> str:
+        """Format one expiration notice for several tickets."""
+        lines = [
+            f"{ticket.get('id', 'n/a'):<8}{'-'.join(ticket['numbers']):<10}{ticket['play_type']:<13}"
+            f"{ticket['draw_time']:<9}{days_remaining}"
+            for ticket, days_remaining in sorted(expiring, key=lambda item: item[1])
+        ]
+        table = '\n'.join(lines)
+        return f"""
+{len(expiring)} of your Georgia Cash 4 tickets are expiring soon!
+
+Ticket  Numbers   Play Type    Draw     Days Remaining
+{table}
+
+If you want to continue tracking these numbers, please update each ticket's end date using the CLI:
+python -m src.cli update-dates <ticket_id> --start-date YYYY-MM-DD --end-date YYYY-MM-DD
+"""
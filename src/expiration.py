@@ -0,0 +1,72 @@
+import json
+import os
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Days before the end date at which an expiration notice goes out: a heads-up, then a last reminder
+EXPIRATION_THRESHOLDS = (3, 1)
+
+class ExpirationNotices:
+    """
+    Remembers which expiration notices each ticket has been sent, so each
+    threshold fires once per ticket instead of on every nightly run.
+    Stored as {ticket_id: [end_date, threshold]}, with the tightest threshold
+    sent so far; changing a ticket's end date starts its notices over.
+    """
+
+    DATA_FILE = "data/expiration_notices.json"
+
+    def __init__(self, data_file: str = None):
+        self.data_file = data_file or self.DATA_FILE
+        self.notices = self._load_notices()
+
+    def _load_notices(self) -> Dict[str, List[Any]]:
+        if os.path.exists(self.data_file):
+            try:
+                with open(self.data_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                return {}
+        return {}
+
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+            with open(self.data_file, 'w') as f:
+                json.dump(self.notices, f)
+        except Exception:
+            pass
+
+    def due_threshold(self, ticket: Dict[str, Any], days_remaining: int) -> Optional[int]:
+        """The threshold a notice is due for now, or None if nothing new is due."""
+        passed = [t for t in EXPIRATION_THRESHOLDS if days_remaining <= t]
+        if not passed:
+            return None
+        threshold = min(passed)
+        sent = self.notices.get(ticket['id'])
+        if sent and sent[0] == ticket['end_date'] and sent[1] <= threshold:
+            return None
+        return threshold
+
+    def mark_sent(self, ticket: Dict[str, Any], threshold: int):
+        self.notices[ticket['id']] = [ticket['end_date'], threshold]
+
+    def prune(self, ticket_ids: Iterable[str]):
+        """Forget tickets that are no longer in the book."""
+        keep = set(ticket_ids)
+        self.notices = {ticket_id: sent for ticket_id, sent in self.notices.items() if ticket_id in keep}
+
+    def collect_due(self, tickets: Iterable[Dict[str, Any]],
+                    today: date = None) -> Dict[str, List[Tuple[Dict[str, Any], int, int]]]:
+        """
+        Group the tickets that are due a notice by recipient.
+        Returns {email: [(ticket, days_remaining, threshold)]}, keyed by the lowercased email.
+        """
+        today = today or date.today()
+        due = {}
+        for ticket in tickets:
+            days_remaining = (datetime.fromisoformat(ticket['end_date']).date() - today).days
+            threshold = self.due_threshold(ticket, days_remaining)
+            if threshold is not None:
+                due.setdefault(ticket.get('email', '').lower(), []).append((ticket, days_remaining, threshold))
+        return due
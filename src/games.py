@@ -0,0 +1,291 @@
+"""
+Digit game definitions and the prize tables generated from them.
+
+A game is plain data: how many digits a ticket has and, for each play type,
+what it pays on a straight (exact order) match, a box (any order) match and
+a one-off (one digit off by one) match. A prize is either one amount or a
+schedule keyed by box class, the number of distinct orderings of the
+ticket's digits ("24" for 1234, "12" for 1123, ...); classes left out of a
+schedule don't win. 'wager': 'ways' makes a play cost one base wager per
+ordering, like Combo.
+
+Games from the "games" section of config/config.json are added to, or
+replace, the built-in ones, so adding a game needs no code.
+
+From a definition a Game generates its lookup tables: the box class of every
+possible number, and each play's straight, box and one-off prize by class.
+They are written to TABLE_DIR on first use and read back by later runs.
+"""
+import json
+import logging
+import os
+import struct
+import sys
+import zlib
+from array import array
+from collections import Counter
+from itertools import permutations
+from math import factorial
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+BASE_WAGER = 1.0
+DEFAULT_GAME = 'cash4'
+# Games whose results the scraper fetches, so src.main can check their tickets.
+# Tickets for any other game would never be checked, so they can't be added yet.
+CHECKED_GAMES = (DEFAULT_GAME,)
+MATCHES = ('straight', 'box', 'one_off')
+TABLE_DIR = "data/game_tables"
+
+GAMES: Dict[str, Dict[str, Any]] = {
+    'cash3': {
+        'name': 'Cash 3',
+        'digits': 3,
+        'plays': {
+            'straight': {'straight': 500.0},
+            'box': {'box': {'3': 160.0, '6': 80.0}},
+            'straightbox': {'straight': {'3': 660.0, '6': 580.0}, 'box': {'3': 160.0, '6': 80.0}},
+            'combo': {'box': 500.0, 'wager': 'ways'},
+        },
+    },
+    'cash4': {
+        'name': 'Cash 4',
+        'digits': 4,
+        'plays': {
+            'straight': {'straight': 5000.0},
+            'box': {'box': 500.0},
+            'straightbox': {'straight': 5500.0, 'box': 500.0},
+            'combo': {'box': 5000.0, 'wager': 'ways'},
+            'oneoff': {'straight': 5000.0, 'one_off': 1000.0},
+        },
+    },
+    'georgia5': {
+        'name': 'Georgia Five',
+        'digits': 5,
+        'plays': {
+            'straight': {'straight': 10000.0},
+            'box': {'box': {'5': 2000.0, '10': 1000.0, '20': 500.0, '30': 333.0, '60': 166.0, '120': 83.0}},
+            'combo': {'box': 10000.0, 'wager': 'ways'},
+        },
+    },
+}
+
+# magic, version, little-endian flag, digits, class count, play count, definition checksum
+TABLE_HEADER = struct.Struct('<8sIIIIII')
+TABLE_MAGIC = b'LOTGAME1'
+TABLE_VERSION = 1
+
+def sorted_key(numbers) -> str:
+    """Return the sorted-digit class of a number (e.g. '4121' -> '1124')."""
+    return ''.join(sorted(numbers))
+
+def permutation_count(numbers) -> int:
+    """Return how many distinct orderings the digits have (1, 4, 6, 12 or 24 for Cash 4)."""
+    count = factorial(len(numbers))
+    for repeats in Counter(numbers).values():
+        count //= factorial(repeats)
+    return count
+
+def distinct_permutations(numbers) -> Set[str]:
+    """Return every distinct ordering of the digits as a string."""
+    return {''.join(p) for p in permutations(numbers)}
+
+def _prize(value: Any, ways: int) -> float:
+    """A prize amount, or the entry for `ways` in a schedule by box class."""
+    if isinstance(value, dict):
+        value = value.get(str(ways), 0.0)
+    return float(value or 0.0)
+
+def validate_definition(definition: Dict[str, Any]):
+    """Raise ValueError if a game definition can't be used."""
+    digits = definition.get('digits')
+    if not isinstance(digits, int) or not 1 <= digits <= 6:
+        raise ValueError(f"digits must be 1 to 6, not {digits!r}")
+    plays = definition.get('plays')
+    if not isinstance(plays, dict) or not plays:
+        raise ValueError("no plays defined")
+    for play_type, play in plays.items():
+        unknown = set(play) - set(MATCHES) - {'wager'}
+        if unknown:
+            raise ValueError(f"{play_type}: unknown keys {sorted(unknown)}")
+        if play.get('wager', 'single') not in ('single', 'ways'):
+            raise ValueError(f"{play_type}: wager must be 'single' or 'ways'")
+        for match in MATCHES:
+            try:
+                amounts = play.get(match, 0.0)
+                for amount in (amounts.values() if isinstance(amounts, dict) else [amounts]):
+                    float(amount or 0.0)
+            except (TypeError, ValueError, AttributeError):
+                raise ValueError(f"{play_type}: invalid {match} prize {play.get(match)!r}")
+
+def _checksum(definition: Dict[str, Any]) -> int:
+    return zlib.crc32(json.dumps(definition, sort_keys=True).encode('utf-8'))
+
+class Game:
+    """A digit game with its generated prize tables."""
+
+    def __init__(self, key: str, definition: Dict[str, Any], table_dir: Optional[str] = TABLE_DIR):
+        validate_definition(definition)
+        self.key = key
+        self.name = definition.get('name', key)
+        self.digits = definition['digits']
+        self.plays = definition['plays']
+        self.play_types: Tuple[str, ...] = tuple(self.plays)
+        self.outcome_count = 10 ** self.digits
+        self._checksum = _checksum(definition)
+        self.table_file = os.path.join(table_dir, f"{key}.table") if table_dir else None
+        if not self._load_tables():
+            self._build_tables()
+            if self.table_file:
+                self._save_tables()
+
+    def _build_tables(self):
+        # class_of[number] is the box class index of every possible number
+        self.class_of = array('H', bytes(2 * self.outcome_count))
+        classes: Dict[str, int] = {}
+        for number in range(self.outcome_count):
+            self.class_of[number] = classes.setdefault(sorted_key(f"{number:0{self.digits}d}"), len(classes))
+        self.ways = array('H', (permutation_count(key) for key in classes))
+        # prizes[play_type][match][class]
+        self.prizes = {
+            play_type: {match: array('d', (_prize(play.get(match), ways) for ways in self.ways)) for match in MATCHES}
+            for play_type, play in self.plays.items()
+        }
+
+    def _load_tables(self) -> bool:
+        if not self.table_file:
+            return False
+        try:
+            with open(self.table_file, 'rb') as f:
+                data = f.read()
+            magic, version, little, digits, class_count, play_count, checksum = TABLE_HEADER.unpack_from(data)
+        except (OSError, struct.error):
+            return False
+        if (magic, version, bool(little), digits, play_count, checksum) != \
+                (TABLE_MAGIC, TABLE_VERSION, sys.byteorder == 'little', self.digits, len(self.plays), self._checksum):
+            return False
+        sizes = [2 * self.outcome_count, 2 * class_count] + [8 * class_count] * (len(MATCHES) * play_count)
+        if len(data) != TABLE_HEADER.size + sum(sizes):
+            return False
+        columns = []
+        offset = TABLE_HEADER.size
+        for size in sizes:
+            column = array('H' if len(columns) < 2 else 'd')
+            column.frombytes(data[offset:offset + size])
+            columns.append(column)
+            offset += size
+        self.class_of, self.ways = columns[0], columns[1]
+        prize_columns = iter(columns[2:])
+        self.prizes = {play_type: {match: next(prize_columns) for match in MATCHES} for play_type in self.plays}
+        return True
+
+    def _save_tables(self):
+        try:
+            os.makedirs(os.path.dirname(self.table_file), exist_ok=True)
+            tmp_path = f"{self.table_file}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, sys.byteorder == 'little', self.digits,
+                                          len(self.ways), len(self.plays), self._checksum))
+                f.write(self.class_of.tobytes())
+                f.write(self.ways.tobytes())
+                for play_type in self.plays:
+                    for match in MATCHES:
+                        f.write(self.prizes[play_type][match].tobytes())
+            os.replace(tmp_path, self.table_file)
+        except OSError:
+            # Without a cache the tables are just rebuilt next time
+            pass
+
+    def valid_numbers(self, numbers: List[str]) -> bool:
+        """Whether numbers is a list of this game's number of single digits."""
+        return len(numbers) == self.digits and all(
+            isinstance(n, str) and len(n) == 1 and n.isdigit() for n in numbers)
+
+    def wager(self, play_type: str, ways: int) -> float:
+        """Cost of play_type on numbers with `ways` distinct orderings."""
+        if self.plays[play_type].get('wager') == 'ways':
+            return BASE_WAGER * ways
+        return BASE_WAGER
+
+    def ticket_prizes(self, play_type: str, ticket: int) -> Tuple[float, float, float]:
+        """The straight, box and one-off prizes of ticket (as an int) with play_type."""
+        prizes = self.prizes[play_type]
+        box_class = self.class_of[ticket]
+        return prizes['straight'][box_class], prizes['box'][box_class], prizes['one_off'][box_class]
+
+    def prize(self, play_type: str, ticket: int, draw: int) -> float:
+        """What ticket (as an int) pays on draw (as an int); 0.0 if it doesn't win."""
+        straight, box, one_off = self.ticket_prizes(play_type, ticket)
+        if straight and ticket == draw:
+            return straight
+        if box and self.class_of[draw] == self.class_of[ticket]:
+            return box
+        if one_off and self.one_off(ticket, draw):
+            return one_off
+        return 0.0
+
+    def one_off(self, ticket: int, draw: int) -> bool:
+        """Exactly one digit differs, by one."""
+        differences = 0
+        for _ in range(self.digits):
+            difference = abs(ticket % 10 - draw % 10)
+            if difference > 1:
+                return False
+            differences += difference
+            ticket //= 10
+            draw //= 10
+        return differences == 1
+
+    def winning_outcomes(self, play_type: str, numbers: str) -> Dict[str, float]:
+        """Map every draw that numbers wins on with play_type to its prize."""
+        straight, box, one_off = self.ticket_prizes(play_type, int(numbers))
+        outcomes = {}
+        if one_off:
+            for i, digit in enumerate(numbers):
+                for neighbour in (int(digit) - 1, int(digit) + 1):
+                    if 0 <= neighbour <= 9:
+                        outcomes[numbers[:i] + str(neighbour) + numbers[i + 1:]] = one_off
+        if box:
+            outcomes.update(dict.fromkeys(distinct_permutations(numbers), box))
+        if straight:
+            outcomes[numbers] = straight
+        return outcomes
+
+_definitions: Optional[Dict[str, Dict[str, Any]]] = None
+_games: Dict[str, Game] = {}
+
+def game_definitions(config_file: str = "config/config.json") -> Dict[str, Dict[str, Any]]:
+    """The built-in games plus, or overridden by, the config file's "games" section."""
+    global _definitions
+    if _definitions is None:
+        definitions = dict(GAMES)
+        try:
+            with open(config_file, 'r') as f:
+                configured = json.load(f).get('games', {})
+        except Exception:
+            configured = {}
+        for key, definition in configured.items():
+            try:
+                validate_definition(definition)
+            except ValueError as e:
+                logger.warning(f"Ignoring game {key!r} in {config_file}: {e}")
+                continue
+            definitions[key] = definition
+        _definitions = definitions
+    return _definitions
+
+def get_game(key: str = DEFAULT_GAME) -> Optional[Game]:
+    """The game named key, with its tables loaded or generated on first use, or None."""
+    key = (key or DEFAULT_GAME).lower()
+    game = _games.get(key)
+    if game is None:
+        definition = game_definitions().get(key)
+        if definition is None:
+            return None
+        game = _games[key] = Game(key, definition)
+    return game
+
+def ticket_game(ticket: Dict[str, Any]) -> str:
+    """The game a ticket is for; tickets from before games existed are Cash 4."""
+    return (ticket.get('game') or DEFAULT_GAME).lower()
@@ -0,0 +1,103 @@
+import os
+from datetime import datetime, date
+from typing import Dict, List, Optional, Tuple
+from . import codec
+from .stats import DrawStatistics
+
+# Chronological order of the drawings within a day
+DRAW_ORDER = ('midday', 'evening', 'night')
+
+class ResultsHistory:
+    """Keeps every scraped Cash 4 result, keyed by drawing date and drawing type."""
+
+    DATA_FILE = "data/results_history.json"
+
+    def __init__(self, data_file: str = None):
+        self.data_file = data_file or self.DATA_FILE
+        os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+        self.results = self._load_results()
+        self._statistics = None
+
+    def _load_results(self) -> Dict[str, Dict[str, str]]:
+        """
+        Load the history from its JSON file. Only a missing or empty file is an
+        empty history; one that can't be decoded raises codec.CodecError rather
+        than being replaced by the next save.
+        """
+        if not os.path.exists(self.data_file) or os.path.getsize(self.data_file) == 0:
+            return {}
+        results = codec.load_file(self.data_file)
+        if not isinstance(results, dict):
+            raise codec.CodecError(f"Can't read {self.data_file}: expected results keyed by drawing date")
+        return results
+
+    def _save_results(self):
+        """Save the history and its statistics."""
+        try:
+            codec.dump_file(self.data_file, self.results, sort_keys=True)
+        except Exception:
+            pass
+        if self._statistics is not None:
+            self._statistics.save()
+
+    @property
+    def statistics(self) -> DrawStatistics:
+        """Running statistics kept next to the history file, rebuilt if they are out of step."""
+        if self._statistics is None:
+            stats_file = os.path.join(os.path.dirname(self.data_file), os.path.basename(DrawStatistics.DATA_FILE))
+            self._statistics = DrawStatistics(stats_file)
+            if self._statistics.draw_count != sum(len(day) for day in self.results.values()):
+                self._statistics.rebuild(self.get_draws())
+        return self._statistics
+
+    def _store(self, draw_date: date, draw_time: str, numbers: str) -> bool:
+        """Store a drawing in memory. Returns False if it was already stored."""
+        day = self.results.setdefault(draw_date.isoformat(), {})
+        draw_time = draw_time.lower()
+        previous = day.get(draw_time)
+        if previous == numbers:
+            return False
+        statistics = self.statistics
+        if previous:
+            # A corrected result replaces the one counted before
+            statistics.record(draw_date, draw_time, previous, count=-1)
+        day[draw_time] = numbers
+        if previous:
+            statistics.forget_last_seen(draw_date, previous, self.get_draws())
+        statistics.record(draw_date, draw_time, numbers)
+        return True
+
+    def add_result(self, draw_date: date, draw_time: str, numbers: str) -> bool:
+        """Record a single drawing. Returns False if it was already stored."""
+        if not self._store(draw_date, draw_time, numbers):
+            return False
+        self._save_results()
+        return True
+
+    def add_results(self, results: Dict[str, Tuple[str, str]]) -> int:
+        """
+        Record results in the scraper's format: drawing type -> (numbers, 'MM/DD/YYYY').
+        Returns how many drawings were new.
+        """
+        added = 0
+        for draw_time, (numbers, date_str) in results.items():
+            try:
+                draw_date = datetime.strptime(date_str, '%m/%d/%Y').date()
+            except (TypeError, ValueError):
+                continue
+            if self._store(draw_date, draw_time, numbers):
+                added += 1
+        if added:
+            self._save_results()
+        return added
+
+    def get_draws(self, draw_time: Optional[str] = None) -> List[Tuple[date, str, str]]:
+        """Get stored drawings as (date, drawing type, numbers), oldest first."""
+        draws = []
+        for day in sorted(self.results):
+            draw_date = date.fromisoformat(day)
+            for time_key in DRAW_ORDER:
+                numbers = self.results[day].get(time_key)
+                if numbers and (draw_time is None or draw_time.lower() == time_key):
+                    draws.append((draw_date, time_key, numbers))
+        return draws
@@ -0,0 +1,148 @@
+"""
+Bulk ticket import from CSV or NDJSON.
+
+Rows are read lazily and validated a batch at a time, so a large file is
+never held in memory as rows; only the accepted tickets are kept, and they
+are written with a single TicketManager.add_tickets call.
+
+Each row needs numbers, play_type, draw_time, start_date, end_date (YYYY-MM-DD)
+and email, and may name a game (Cash 4 if not). Only games in CHECKED_GAMES
+are accepted, since tickets for the others would never be checked. CSV files
+need a header row with those column names.
+"""
+import csv
+import json
+from datetime import date
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+from .email_notifier import validate_email
+from .games import CHECKED_GAMES, DEFAULT_GAME, get_game
+from .ticket_manager import TicketManager
+
+FORMATS = ('csv', 'ndjson')
+DRAW_TIMES = ('MIDDAY', 'EVENING', 'NIGHT')
+BATCH_SIZE = 5000
+
+class RowError(ValueError):
+    """A row that can't be imported."""
+
+def detect_format(path: str) -> Optional[str]:
+    """Guess the format from a file name, or None if it can't be told."""
+    lowered = path.lower()
+    if lowered.endswith('.csv'):
+        return 'csv'
+    if lowered.endswith(('.ndjson', '.jsonl', '.json')):
+        return 'ndjson'
+    return None
+
+def iter_rows(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (line number, row) pairs. NDJSON rows that don't parse are yielded as RowError."""
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'ndjson':
+        for line_number, line in enumerate(stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except ValueError as e:
+                yield line_number, RowError(f"invalid JSON: {e}")
+    else:
+        raise ValueError(f"Unknown import format: {fmt}")
+
+def _text(row: Dict[str, Any], field: str) -> str:
+    """A field's value with surrounding whitespace removed; '' if missing. Raises RowError if it isn't a string."""
+    value = row.get(field)
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        raise RowError(f"{field} must be a string, got {value!r}")
+    return value.strip()
+
+def parse_row(row: Any) -> Dict[str, Any]:
+    """Turn one input row into a ticket dict, or raise RowError."""
+    if isinstance(row, RowError):
+        raise row
+    if not isinstance(row, dict):
+        raise RowError("row is not an object")
+
+    game_key = (_text(row, 'game') or DEFAULT_GAME).lower()
+    game = get_game(game_key)
+    if game is None:
+        raise RowError(f"unknown game {row.get('game')!r}")
+    if game_key not in CHECKED_GAMES:
+        raise RowError(f"{game.name} results are not checked yet")
+
+    numbers = row.get('numbers')
+    if isinstance(numbers, str):
+        numbers = list(numbers.strip())
+    if not isinstance(numbers, list) or not game.valid_numbers(numbers):
+        raise RowError(f"invalid numbers {row.get('numbers')!r}, expected {game.digits} digits")
+
+    play_type = _text(row, 'play_type').lower()
+    if play_type not in game.plays:
+        raise RowError(f"invalid play_type {row.get('play_type')!r}")
+    draw_time = _text(row, 'draw_time').upper()
+    if draw_time not in DRAW_TIMES:
+        raise RowError(f"invalid draw_time {row.get('draw_time')!r}")
+
+    start_date, end_date = _text(row, 'start_date'), _text(row, 'end_date')
+    try:
+        start_date, end_date = date.fromisoformat(start_date), date.fromisoformat(end_date)
+    except ValueError:
+        raise RowError("dates must be YYYY-MM-DD")
+    if end_date < start_date:
+        raise RowError("end_date is before start_date")
+
+    email = _text(row, 'email')
+    if not validate_email(email):
+        raise RowError(f"invalid email {email!r}")
+
+    ticket = {
+        'numbers': numbers,
+        'play_type': play_type,
+        'draw_time': draw_time,
+        'start_date': start_date.isoformat(),
+        'end_date': end_date.isoformat(),
+        'email': email,
+    }
+    if game_key != DEFAULT_GAME:
+        ticket['game'] = game_key
+    return ticket
+
+def iter_valid_tickets(stream: TextIO, fmt: str, on_reject: Callable[[int, str], None],
+                       batch_size: int = BATCH_SIZE,
+                       on_batch: Callable[[int, int], None] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Validate rows batch_size at a time and yield the valid tickets.
+    on_reject(line_number, reason) is called for each bad row and
+    on_batch(rows_read, rows_accepted) after each batch.
+    """
+    rows = iter_rows(stream, fmt)
+    read = accepted = 0
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        valid: List[Dict[str, Any]] = []
+        for line_number, row in batch:
+            try:
+                valid.append(parse_row(row))
+            except RowError as e:
+                on_reject(line_number, str(e))
+        read += len(batch)
+        accepted += len(valid)
+        yield from valid
+        if on_batch:
+            on_batch(read, accepted)
+
+def import_tickets(ticket_manager: TicketManager, stream: TextIO, fmt: str,
+                   on_reject: Callable[[int, str], None], dry_run: bool = False,
+                   batch_size: int = BATCH_SIZE, on_batch: Callable[[int, int], None] = None) -> int:
+    """Import tickets from stream with a single write. Returns how many were accepted."""
+    tickets: Iterable[Dict[str, Any]] = iter_valid_tickets(stream, fmt, on_reject, batch_size, on_batch)
+    if dry_run:
+        return sum(1 for _ in tickets)
+    return len(ticket_manager.add_tickets(tickets))
@@ -0,0 +1,191 @@
+import os
+from datetime import date
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from . import codec
+from .games import ticket_game
+from .history import DRAW_ORDER
+
+# One compact JSON array per outcome, in this order
+ROW_FIELDS = ('ticket_id', 'email', 'draw_date', 'draw_time', 'game', 'play_type', 'numbers',
+              'winning_numbers', 'prize')
+
+class OutcomeLedger:
+    """
+    Every checked ticket's outcome, appended as a row to a gzip-compressed
+    JSON-lines file, with running per-ticket and per-user totals.
+
+    The totals are updated as each row is appended and saved as one JSON file
+    next to the ledger, so "how much has this user won this year" is a dict
+    lookup and no outcome is ever checked twice. A ticket's outcome for a
+    drawing is only recorded once, however often the drawing is processed:
+    once finish_drawing marks a drawing processed, its outcomes are never
+    recorded again, whatever order drawings come in. Until then the totals
+    keep the IDs of the tickets recorded for it, so a rerun of a drawing that
+    failed part way records only the tickets it missed.
+    """
+
+    DATA_FILE = "data/outcomes.jsonl.gz"
+
+    def __init__(self, data_file: str = None, shard: Optional[Tuple[int, int]] = None):
+        self.data_file = data_file or self.DATA_FILE
+        if shard is not None:
+            # Shard jobs run side by side, so each keeps its own ledger
+            self.data_file = self.data_file.replace('.jsonl', f'.shard{shard[0]}of{shard[1]}.jsonl')
+        self.totals_file = self.data_file.replace('.jsonl.gz', '') + '.totals.json'
+        self.totals = self._load_totals()
+        self._rows = None
+        self._drawings: Set[str] = set(self.totals.get('drawings', ()))
+        # (ticket ID, draw key) recorded for drawings that aren't finished yet
+        self._recorded: Set[Tuple[str, str]] = {
+            (ticket_id, key) for key, ticket_ids in self.totals.get('partial', {}).items() for ticket_id in ticket_ids
+        }
+        if 'drawings' not in self.totals:
+            # Totals from before processed drawings were kept
+            self.rebuild()
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {
+            'rows': 0,
+            # draw keys of the drawings that have been processed in full
+            'drawings': [],
+            # partial[draw key]: IDs of the tickets recorded for a drawing that isn't finished yet
+            'partial': {},
+            # tickets[id]: email, checked, wins, won, last_win (date and drawing)
+            'tickets': {},
+            # users[lowercased email]: checked, wins, won, and the same per year of the drawing
+            'users': {},
+        }
+
+    def _load_totals(self) -> Dict[str, Any]:
+        if os.path.exists(self.totals_file):
+            try:
+                return codec.load_file(self.totals_file)
+            except Exception:
+                pass
+        return self._empty()
+
+    @staticmethod
+    def draw_key(draw_date: str, draw_time: str) -> str:
+        """Identifies a drawing, and sorts drawings in the order they happen."""
+        return f"{draw_date}:{DRAW_ORDER.index(draw_time.lower())}"
+
+    def record(self, ticket: Dict[str, Any], draw_date: date, draw_time: str, prize: float,
+               winning_numbers: str) -> bool:
+        """Append a ticket's outcome for a drawing. Returns False if it was already recorded."""
+        row = [ticket['id'], ticket.get('email', ''), draw_date.isoformat(), draw_time.upper(), ticket_game(ticket),
+               ticket.get('play_type', ''), ''.join(ticket.get('numbers', [])), winning_numbers, prize]
+        if not self._add_to_totals(row):
+            return False
+        if self._rows is None:
+            import gzip
+
+            os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+            self._rows = gzip.open(self.data_file, 'ab', compresslevel=6)
+        self._rows.write(codec.dumps(row) + b'\n')
+        return True
+
+    def _add_to_totals(self, row: List[Any]) -> bool:
+        ticket_id, email, draw_date, draw_time, prize = row[0], row[1], row[2], row[3], row[-1]
+        key = self.draw_key(draw_date, draw_time)
+        if key in self._drawings or (ticket_id, key) in self._recorded:
+            return False
+        self._recorded.add((ticket_id, key))
+        tickets, users = self.totals['tickets'], self.totals['users']
+        ticket = tickets.get(ticket_id)
+        if ticket is None:
+            ticket = tickets[ticket_id] = {'email': email, 'checked': 0, 'wins': 0, 'won': 0.0, 'last_win': None}
+        ticket['email'] = email
+        user = users.get(email.lower())
+        if user is None:
+            user = users[email.lower()] = {'checked': 0, 'wins': 0, 'won': 0.0, 'years': {}}
+        year = user['years'].get(draw_date[:4])
+        if year is None:
+            year = user['years'][draw_date[:4]] = {'checked': 0, 'wins': 0, 'won': 0.0}
+        for totals in (ticket, user, year):
+            totals['checked'] += 1
+            if prize > 0:
+                totals['wins'] += 1
+                totals['won'] += prize
+        if prize > 0:
+            ticket['last_win'] = f"{draw_date} {draw_time}"
+        self.totals['rows'] += 1
+        return True
+
+    def finish_drawing(self, draw_date: date, draw_time: str):
+        """Mark a drawing processed, once every ticket has been checked against it."""
+        key = self.draw_key(draw_date.isoformat(), draw_time)
+        self._drawings.add(key)
+        self._recorded = {recorded for recorded in self._recorded if recorded[1] != key}
+
+    def save(self):
+        """Finish the rows appended so far and save the totals."""
+        if self._rows is not None:
+            try:
+                self._rows.close()
+            except Exception:
+                pass
+            self._rows = None
+        partial = {}
+        for ticket_id, key in sorted(self._recorded):
+            partial.setdefault(key, []).append(ticket_id)
+        self.totals['drawings'] = sorted(self._drawings)
+        self.totals['partial'] = partial
+        try:
+            os.makedirs(os.path.dirname(self.totals_file) or '.', exist_ok=True)
+            codec.dump_file(self.totals_file, self.totals)
+        except Exception:
+            pass
+
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Read back every recorded outcome, oldest first."""
+        if not os.path.exists(self.data_file):
+            return
+        import gzip
+
+        with gzip.open(self.data_file, 'rb') as f:
+            for line in f:
+                if line.strip():
+                    yield dict(zip(ROW_FIELDS, codec.loads(line)))
+
+    def rebuild(self):
+        """
+        Recompute the totals from the rows, e.g. after the totals file was lost.
+        The rows don't say which drawings were finished, so every drawing in them counts as processed.
+        """
+        self.totals = self._empty()
+        self._drawings = set()
+        self._recorded = set()
+        for row in self.iter_rows():
+            self._add_to_totals([row[field] for field in ROW_FIELDS])
+        self._drawings.update(key for _, key in self._recorded)
+        self._recorded = set()
+        self.save()
+
+    def user_totals(self, email: str, year: int = None) -> Dict[str, Any]:
+        """checked, wins and won for an email address, overall or for one year's drawings."""
+        user = self.totals['users'].get(email.lower(), {})
+        if year is not None:
+            user = user.get('years', {}).get(str(year), {})
+        return {'checked': user.get('checked', 0), 'wins': user.get('wins', 0), 'won': user.get('won', 0.0)}
+
+    def ticket_totals(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        return self.totals['tickets'].get(ticket_id.lower())
+
+    def winning_tickets(self, email: str = None) -> List[Tuple[str, Dict[str, Any]]]:
+        """(ticket ID, totals) of every ticket that ever won, optionally only one owner's."""
+        return [
+            (ticket_id, totals) for ticket_id, totals in self.totals['tickets'].items()
+            if totals['wins'] and (email is None or totals['email'].lower() == email.lower())
+        ]
+
+def open_ledgers(data_file: str = None) -> List[OutcomeLedger]:
+    """The ledger and any per-shard ledgers kept next to it."""
+    import glob
+
+    data_file = data_file or OutcomeLedger.DATA_FILE
+    ledgers = [OutcomeLedger(data_file)]
+    pattern = glob.escape(data_file.replace('.jsonl.gz', '')) + '.shard*of*.totals.json'
+    for totals_file in sorted(glob.glob(pattern)):
+        ledgers.append(OutcomeLedger(totals_file.replace('.totals.json', '.jsonl.gz')))
+    return ledgers
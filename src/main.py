@@ -1,87 +1,317 @@
 import os
+import argparse
+import atexit
 import logging
-from datetime import datetime, date
-from typing import Dict, List
-from dotenv import load_dotenv
-load_dotenv()
+import logging.handlers
+import queue
+import threading
+from datetime import date, datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from .scraper import LotteryScraper
 from .ticket_manager import TicketManager
 from .email_notifier import EmailNotifier
+from .metrics import metrics
+from .expiration import EXPIRATION_THRESHOLDS, ExpirationNotices
+from .ledger import OutcomeLedger
+from .pipeline import QUEUE_SIZE, Pipeline, Stage, format_report
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('lottery_check.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
-def check_drawing(draw_time: str, scraper: LotteryScraper, ticket_manager: TicketManager, email_notifier: EmailNotifier):
+LOG_FILE = 'lottery_check.log'
+# SMTP sends are network-bound, so several run side by side
+SEND_WORKERS = 4
+
+def configure_logging(level: int = logging.INFO) -> logging.handlers.QueueListener:
+    """
+    Load .env settings and send logs to LOG_FILE and the console.
+
+    Log calls only put the record on a queue; a background listener thread
+    does the file and console I/O, so slow writes don't hold up ticket checks.
+    The listener is flushed and stopped at exit.
+    """
+    from dotenv import load_dotenv
+    load_dotenv()
+
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    handlers = [logging.FileHandler(LOG_FILE), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    # The listener's handlers do the real formatting; the queue only carries the message
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=level, handlers=[queue_handler])
+    return listener
+
+def scrape_drawing(draw_time: str, scraper: LotteryScraper,
+                   scrape: bool = True) -> Optional[Tuple[str, str, date]]:
+    """(draw_time, winning numbers, draw date) of a drawing's latest result, or None if there is none."""
+    winning_numbers = scraper.get_winning_numbers(cached_only=not scrape).get(draw_time.lower())
+    if not winning_numbers:
+        logger.warning(f"No winning numbers found for {draw_time} drawing")
+        return None
+    return draw_time, winning_numbers[0], datetime.strptime(winning_numbers[1], '%m/%d/%Y').date()
+
+def check_drawing(draw_time: str, scraper: LotteryScraper, ticket_manager: TicketManager, email_notifier: EmailNotifier,
+                  shard: Optional[Tuple[int, int]] = None, scrape: bool = True, workers: Optional[int] = None,
+                  ledger: Optional[OutcomeLedger] = None):
     """Check a specific drawing time."""
     try:
-        # Get winning numbers for the drawing
-        winning_numbers = scraper.get_winning_numbers().get(draw_time.lower())
-        if not winning_numbers:
-            logger.warning(f"No winning numbers found for {draw_time} drawing")
-            return
-
-        # Check tickets against winning numbers
-        results = ticket_manager.check_winning_numbers(winning_numbers[0], draw_time)
-        
-        # Process results
-        for result in results:
-            ticket = result['ticket']
-            if result['is_winner']:
-                # Send winning notification
-                email_notifier.send_notification(
-                    ticket,
-                    result['winning_numbers'],
-                    result['prize_amount']
-                )
-                logger.info(f"Winner found! Ticket {ticket['numbers']} won ${result['prize_amount']}")
-            else:
-                # Send losing notification
-                email_notifier.send_notification(
-                    ticket,
-                    result['winning_numbers'],
-                    0
-                )
-                logger.info(f"No win for ticket {ticket['numbers']}")
+        drawing = scrape_drawing(draw_time, scraper, scrape)
+        if drawing:
+            process_drawing(drawing[0], drawing[1], ticket_manager, email_notifier, shard, workers,
+                            drawing[2], ledger)
 
     except Exception as e:
         logger.error(f"Error checking {draw_time} drawing: {str(e)}")
 
-def main():
-    """Main function to check all drawings."""
+def process_drawing(draw_time: str, winning_numbers: str, ticket_manager: TicketManager, email_notifier: EmailNotifier,
+                    shard: Optional[Tuple[int, int]] = None, workers: Optional[int] = None,
+                    draw_date: Optional[date] = None, ledger: Optional[OutcomeLedger] = None,
+                    table: Optional['WinnerTable'] = None) -> Dict:
+    """
+    Check tickets against a drawing's winning numbers and notify their owners.
+    With a ledger, each ticket's outcome for the drawing on draw_date (default
+    today) is recorded in it. With a WinnerTable built before the drawing (see
+    src/precompute.py), winners are notified first. Returns the drawing's
+    summary; raises if the tickets could not be checked.
+    """
+    summary = process_drawings([(draw_time, winning_numbers, draw_date or date.today())], ticket_manager,
+                               email_notifier, shard, workers, ledger,
+                               tables={draw_time.upper(): table} if table else None)[0]
+    if summary['error']:
+        raise RuntimeError(summary['error'])
+    return summary
+
+def process_drawings(drawings: Iterable[Tuple[str, str, date]], ticket_manager: TicketManager,
+                     email_notifier: EmailNotifier, shard: Optional[Tuple[int, int]] = None,
+                     workers: Optional[int] = None, ledger: Optional[OutcomeLedger] = None,
+                     send_workers: int = SEND_WORKERS, queue_size: int = QUEUE_SIZE,
+                     tables: Optional[Dict[str, 'WinnerTable']] = None) -> List[Dict]:
+    """
+    Check tickets against each (draw_time, winning numbers, draw date) drawing
+    and notify their owners, as a pipeline of bounded queues:
+
+        drawings -> evaluate -> render -> send (send_workers threads)
+
+    Later tickets are checked and their messages rendered while earlier ones
+    are still being sent, and a full queue holds the stages before it back, so
+    at most a few queues' worth of results are in memory. drawings may be a
+    generator, e.g. one that scrapes each drawing as it is needed. Returns one
+    summary per drawing, in order.
+
+    tables maps draw times to WinnerTables built before the drawings. When a
+    drawing's table still matches the tickets, its winners are looked up and
+    sent, with any pre-rendered emails, before the rest of the book is checked.
+    """
+    summaries = []
+    lock = threading.Lock()
+
+    def evaluate(drawing: Tuple[str, str, date]) -> Iterator[Tuple[Dict, Dict, object]]:
+        draw_time, winning_numbers, draw_date = drawing
+        summary = {'draw_time': draw_time, 'winning_numbers': winning_numbers, 'checked': 0, 'winners': 0,
+                   'total_prize': 0.0, 'sent': 0, 'error': None}
+        summaries.append(summary)
+        table = (tables or {}).get(draw_time.upper())
+        # Winners already sent from the table, by ticket ID, with their prizes
+        notified = {}
+        # Outcomes recorded so far are kept even if the drawing fails part way
+        try:
+            if table is not None and table.is_current(ticket_manager, shard, draw_date):
+                winning = list(winning_numbers)
+                for ticket, prize in table.winners(winning_numbers):
+                    notified[ticket['id']] = prize
+                    result = {'ticket': ticket, 'is_winner': True, 'prize_amount': prize, 'winning_numbers': winning}
+                    yield summary, result, table.message(winning_numbers, ticket['id'])
+                metrics.incr('precomputed_winners', len(notified))
+            elif table is not None:
+                logger.info(f"Tickets changed since the {draw_time} winners were precomputed; checking them all")
+            # Checked once per drawing, so losing tickets don't each format a message nobody sees
+            debug = logger.isEnabledFor(logging.DEBUG)
+            with metrics.span(f'evaluate.{draw_time.lower()}'):
+                for result in ticket_manager.iter_winning_numbers(winning_numbers, draw_time, shard=shard,
+                                                                  workers=workers, draw_date=draw_date):
+                    summary['checked'] += 1
+                    ticket = result['ticket']
+                    if ledger is not None:
+                        ledger.record(ticket, draw_date, draw_time, result['prize_amount'], winning_numbers)
+                    if result['is_winner']:
+                        metrics.incr('winners')
+                        summary['winners'] += 1
+                        summary['total_prize'] += result['prize_amount']
+                        logger.info(f"Winner found! Ticket {ticket['numbers']} won ${result['prize_amount']}")
+                    elif debug:
+                        logger.debug(f"No win for ticket {ticket['numbers']}")
+                    if ticket['id'] in notified:
+                        if notified[ticket['id']] != (result['prize_amount'] if result['is_winner'] else 0):
+                            logger.error(f"Precomputed prize for ticket {ticket['id']} was "
+                                         f"${notified[ticket['id']]}, checked ${result['prize_amount']}")
+                        continue
+                    yield summary, result, None
+            if ledger is not None:
+                # Only a drawing checked in full is skipped next time; a failed one is checked again
+                ledger.finish_drawing(draw_date, draw_time)
+        except Exception as e:
+            summary['error'] = f"Error checking {draw_time} drawing: {str(e)}"
+            raise
+        finally:
+            if ledger is not None:
+                ledger.save()
+
+    def render(item: Tuple[Dict, Dict, object]) -> Optional[Tuple[Dict, object]]:
+        summary, result, message = item
+        if message is None:
+            message = email_notifier.render_notification(result['ticket'], result['winning_numbers'],
+                                                         result['prize_amount'] if result['is_winner'] else 0)
+        return (summary, message) if message is not None else None
+
+    def send(item: Tuple[Dict, object]):
+        summary, message = item
+        if email_notifier.deliver(message):
+            with lock:
+                summary['sent'] += 1
+
+    pipeline = Pipeline([Stage('evaluate', evaluate, expand=True), Stage('render', render),
+                         Stage('send', send, workers=send_workers)], queue_size, source_name='scrape')
+    report = pipeline.run(drawings)
+
+    # Individual tickets are only logged at DEBUG, with one summary per drawing
+    for summary in summaries:
+        logger.info(
+            f"{summary['draw_time']} drawing {summary['winning_numbers']}: {summary['checked']} tickets checked, "
+            f"{summary['winners']} winners, ${summary['total_prize']:,.2f} won, {summary['sent']} emails sent, "
+            f"{summary['checked'] - summary['sent']} failed"
+        )
+    logger.info(f"Pipeline stages:\n{format_report(report)}")
+    return summaries
+
+def main(shard: Optional[Tuple[int, int]] = None, scrape: bool = True, scrape_only: bool = False,
+         workers: Optional[int] = None):
+    """
+    Main function to check all drawings.
+
+    shard=(index, count) checks only the tickets in that shard, so several jobs
+    can split the work. With scrape=False the numbers stored by an earlier
+    scrape_only run are used and the results page is never loaded.
+    workers overrides the number of processes used to check tickets.
+    """
     try:
         # Initialize components
         scraper = LotteryScraper()
+        if scrape_only:
+            results = scraper.get_winning_numbers()
+            logger.info(f"Stored winning numbers for {len(results)} drawings in {scraper.DATA_FILE}")
+            if not results:
+                raise RuntimeError("No winning numbers found")
+            return
         ticket_manager = TicketManager()
         email_notifier = EmailNotifier()
+        ledger = OutcomeLedger(shard=shard)
+        if shard:
+            logger.info(f"Processing shard {shard[0]} of {shard[1]}")
+
+        # Move long-expired tickets out of the working set before checking. Shard jobs
+        # may share the ticket file, so only a full run rewrites it.
+        if shard is None:
+            try:
+                archived = ticket_manager.archive_expired()
+                if archived:
+                    logger.info(f"Archived {archived} expired tickets to {ticket_manager.archive_file}")
+            except Exception as e:
+                logger.error(f"Error archiving expired tickets: {str(e)}")
+
+        # Check all three drawings. Each is scraped as the pipeline asks for it, and its
+        # tickets are checked while the previous drawing's emails are still going out.
+        def drawings():
+            for draw_time in ['MIDDAY', 'EVENING', 'NIGHT']:
+                logger.info(f"Checking {draw_time} drawing...")
+                try:
+                    drawing = scrape_drawing(draw_time, scraper, scrape)
+                except Exception as e:
+                    logger.error(f"Error checking {draw_time} drawing: {str(e)}")
+                    continue
+                if drawing:
+                    yield drawing
 
-        # Check all three drawings
-        drawing_times = ['MIDDAY', 'EVENING', 'NIGHT']
-        for draw_time in drawing_times:
-            logger.info(f"Checking {draw_time} drawing...")
-            check_drawing(draw_time, scraper, ticket_manager, email_notifier)
-
-        # Check for tickets that are about to expire
-        today = date.today()
-        active_tickets = ticket_manager.get_active_tickets()
-        for ticket in active_tickets:
-            end_date = datetime.fromisoformat(ticket['end_date']).date()
-            days_remaining = (end_date - today).days
-            
-            if days_remaining <= 3:  # Notify if ticket expires in 3 days or less
-                email_notifier.send_expiration_notification(ticket, days_remaining)
-                logger.info(f"Sent expiration notification for ticket {ticket['numbers']}")
+        process_drawings(drawings(), ticket_manager, email_notifier, shard, workers, ledger)
+
+        # Notify owners of tickets that are about to expire, one email per owner,
+        # and only when a ticket crosses a new threshold
+        with metrics.span('expiration'):
+            notices = ExpirationNotices(
+                ExpirationNotices.DATA_FILE if shard is None
+                else ExpirationNotices.DATA_FILE.replace('.json', f'.shard{shard[0]}of{shard[1]}.json')
+            )
+            expiring = ticket_manager.get_expiring_tickets(max(EXPIRATION_THRESHOLDS), shard=shard)
+            due = notices.collect_due(expiring)
+            sent = 0
+            for recipient, items in due.items():
+                if email_notifier.send_expiration_digest(items[0][0]['email'], [(t, days) for t, days, _ in items]):
+                    sent += 1
+                    for ticket, _, threshold in items:
+                        notices.mark_sent(ticket, threshold)
+                    logger.debug(f"Sent expiration notice for {len(items)} tickets to {recipient}")
+            notices.prune(t['id'] for t in ticket_manager.iter_tickets())
+            notices.save()
+            logger.info(
+                f"Expiration check: {len(expiring)} tickets expiring within {max(EXPIRATION_THRESHOLDS)} days, "
+                f"{sum(len(items) for items in due.values())} due a notice, {sent} of {len(due)} emails sent"
+            )
 
     except Exception as e:
         logger.error(f"Error in main function: {str(e)}")
         raise
+    finally:
+        # Run report for the workflow artifacts, next to lottery_check.log
+        try:
+            metrics.write_reports()
+        except Exception as e:
+            logger.error(f"Error writing run report: {str(e)}")
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """Parse --shard i/N (0 <= i < N)."""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise argparse.ArgumentTypeError("shard must look like i/N, e.g. 0/4")
+    if not 0 <= index < count:
+        raise argparse.ArgumentTypeError("shard index must be between 0 and N-1")
+    return index, count
+
+def run(argv: List[str] = None):
+    """Command-line entry point for python -m src.main."""
+    from .profiling import PROFILE_MODES
+
+    parser = argparse.ArgumentParser(description="Check Georgia Cash 4 tickets against the latest drawings.")
+    parser.add_argument('--profile', nargs='?', const='cpu', choices=PROFILE_MODES,
+                        help='Profile the run and write main.pstats/main.collapsed next to the log file '
+                             '(default mode: cpu)')
+    parser.add_argument('--verbose', action='store_true', help='Also log every ticket checked and email sent')
+    parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                        help='Only process tickets in shard i of N (0-based), by a stable hash of the email address')
+    parser.add_argument('--scrape-only', action='store_true',
+                        help=f'Only scrape the winning numbers into {LotteryScraper.DATA_FILE} for later --no-scrape runs')
+    parser.add_argument('--no-scrape', action='store_true',
+                        help=f'Use the numbers already in {LotteryScraper.DATA_FILE} instead of loading the results page')
+    parser.add_argument('--workers', type=int, metavar='N',
+                        help=f'Check tickets in N processes (default: one per CPU for books of '
+                             f'{TicketManager.PARALLEL_THRESHOLD:,}+ tickets, otherwise 1)')
+    args = parser.parse_args(argv)
+
+    configure_logging(logging.DEBUG if args.verbose else logging.INFO)
+    if args.profile:
+        from .profiling import Profiler
+
+        profiler = Profiler(args.profile, 'main', os.path.dirname(os.path.abspath(LOG_FILE)))
+        with profiler:
+            main(args.shard, not args.no_scrape, args.scrape_only, args.workers)
+    else:
+        main(args.shard, not args.no_scrape, args.scrape_only, args.workers)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    run() 
\ No newline at end of file
@@ -0,0 +1,111 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict
+
+RUN_REPORT_FILE = "run_report.json"
+PROMETHEUS_FILE = "metrics.prom"
+
+class RunMetrics:
+    """
+    Timing spans and counters for one run of the pipeline.
+
+    Spans are aggregated by name (count, total and slowest duration) rather
+    than recorded individually, so instrumenting a per-ticket code path costs
+    a dictionary update instead of growing the report.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.started_at = datetime.now().isoformat(timespec='seconds')
+            self._start = time.perf_counter()
+            self.spans = defaultdict(lambda: {'count': 0, 'seconds': 0.0, 'max_seconds': 0.0})
+            self.counters = defaultdict(int)
+            self.gauges = {}
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block under `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def record(self, name: str, seconds: float):
+        with self._lock:
+            span = self.spans[name]
+            span['count'] += 1
+            span['seconds'] += seconds
+            span['max_seconds'] = max(span['max_seconds'], seconds)
+
+    def incr(self, name: str, amount: int = 1):
+        with self._lock:
+            self.counters[name] += amount
+
+    def gauge(self, name: str, value: float):
+        """Set a value that is reported as it was last set, e.g. a queue depth."""
+        with self._lock:
+            self.gauges[name] = value
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                'started_at': self.started_at,
+                'elapsed_seconds': time.perf_counter() - self._start,
+                'spans': {name: dict(span) for name, span in sorted(self.spans.items())},
+                'counters': dict(sorted(self.counters.items())),
+                'gauges': dict(sorted(self.gauges.items())),
+            }
+
+    def write_json(self, path: str = RUN_REPORT_FILE):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2)
+
+    def write_prometheus(self, path: str = PROMETHEUS_FILE):
+        """Write the metrics in the Prometheus node_exporter textfile format."""
+        report = self.report()
+        lines = [
+            '# HELP lottrack_run_seconds Wall-clock time of the run.',
+            '# TYPE lottrack_run_seconds gauge',
+            f"lottrack_run_seconds {report['elapsed_seconds']:.6f}",
+            '# HELP lottrack_span_seconds_total Time spent in each instrumented stage.',
+            '# TYPE lottrack_span_seconds_total counter',
+        ]
+        lines += [f'lottrack_span_seconds_total{{span="{name}"}} {span["seconds"]:.6f}'
+                  for name, span in report['spans'].items()]
+        lines += [
+            '# HELP lottrack_span_calls_total Times each instrumented stage ran.',
+            '# TYPE lottrack_span_calls_total counter',
+        ]
+        lines += [f'lottrack_span_calls_total{{span="{name}"}} {span["count"]}'
+                  for name, span in report['spans'].items()]
+        lines += [
+            '# HELP lottrack_events_total Tickets scanned, winners, emails sent and failed.',
+            '# TYPE lottrack_events_total counter',
+        ]
+        lines += [f'lottrack_events_total{{event="{name}"}} {value}'
+                  for name, value in report['counters'].items()]
+        if report['gauges']:
+            lines += [
+                '# HELP lottrack_gauge Pipeline queue depths, throughput and other last-set values.',
+                '# TYPE lottrack_gauge gauge',
+            ]
+            lines += [f'lottrack_gauge{{name="{name}"}} {value:.6f}'
+                      for name, value in report['gauges'].items()]
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+    def write_reports(self, json_path: str = RUN_REPORT_FILE, prometheus_path: str = PROMETHEUS_FILE):
+        self.write_json(json_path)
+        self.write_prometheus(prometheus_path)
+
+# Process-wide metrics shared by every module
+metrics = RunMetrics()
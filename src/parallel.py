@@ -0,0 +1,122 @@
+"""
+Multi-process ticket evaluation for very large ticket books.
+
+Tickets are packed once into fixed-width binary records and written to a
+temporary file that every worker maps into memory, so no ticket dicts are
+pickled between processes. Each worker filters and evaluates a contiguous
+range of records and sends back only the positions it checked and the
+prizes of the winners; the parent rebuilds the results in ticket order.
+"""
+import mmap
+import multiprocessing
+import os
+import struct
+import tempfile
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from .games import DEFAULT_GAME, ticket_game
+from .play_types import PlayType
+
+PLAY_TYPE_CODES = {'straight': 1, 'box': 2, 'straightbox': 3, 'combo': 4, 'oneoff': 5}
+PLAY_TYPE_NAMES = {code: name for name, code in PLAY_TYPE_CODES.items()}
+DRAW_TIME_CODES = {'MIDDAY': 1, 'EVENING': 2, 'NIGHT': 3}
+
+# numbers, play type, draw time, start date ordinal, end date ordinal, shard key hash
+RECORD = struct.Struct('<4sBBiiI')
+
+def encode_tickets(tickets: List[Dict[str, Any]], shard_hash) -> bytes:
+    """Pack tickets into RECORD-sized records. Raises ValueError on tickets that can't be packed."""
+    buffer = bytearray(RECORD.size * len(tickets))
+    for i, ticket in enumerate(tickets):
+        if ticket_game(ticket) != DEFAULT_GAME:
+            # Left as a zeroed record: draw time 0 never matches a drawing
+            continue
+        numbers = ''.join(ticket['numbers']).encode('ascii')
+        if len(numbers) != 4:
+            raise ValueError(f"Cannot encode numbers {ticket['numbers']}")
+        RECORD.pack_into(
+            buffer, i * RECORD.size,
+            numbers,
+            PLAY_TYPE_CODES.get(ticket.get('play_type'), 0),
+            DRAW_TIME_CODES.get(ticket.get('draw_time', '').upper(), 0),
+            datetime.fromisoformat(ticket['start_date']).date().toordinal(),
+            datetime.fromisoformat(ticket['end_date']).date().toordinal(),
+            shard_hash(ticket),
+        )
+    return bytes(buffer)
+
+_records: Optional[mmap.mmap] = None
+
+def _pool_context():
+    """
+    Start workers from a clean server process (or fresh interpreters where
+    there is none), never by forking: the pool runs from a pipeline thread in
+    src.main while the logging and sender threads are alive, and a forked
+    child can inherit a lock one of them holds and block on it forever.
+    """
+    method = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+def _attach(path: str):
+    """Worker initializer: map the encoded tickets once per process."""
+    global _records
+    with open(path, 'rb') as f:
+        _records = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def _evaluate_range(start: int, stop: int, winning_numbers: str, draw_code: int, today: int,
+                    shard: Optional[Tuple[int, int]]) -> Tuple[bytes, Dict[int, float]]:
+    """Check records [start, stop); return the checked positions and the winners' prizes."""
+    checked = array('i')
+    winners = {}
+    plays = {}
+    winning = list(winning_numbers)
+    for i in range(start, stop):
+        numbers, play_code, ticket_draw, start_day, end_day, key_hash = RECORD.unpack_from(_records, i * RECORD.size)
+        if ticket_draw != draw_code or not start_day <= today <= end_day:
+            continue
+        if shard is not None and key_hash % shard[1] != shard[0]:
+            continue
+        checked.append(i)
+        key = (play_code, numbers)
+        if key not in plays:
+            plays[key] = PlayType.create(PLAY_TYPE_NAMES.get(play_code), numbers.decode('ascii'))
+        play = plays[key]
+        if play:
+            is_winner, prize = play.calculate_prize(list(numbers.decode('ascii')), winning)
+            if is_winner:
+                winners[i] = prize
+    return checked.tobytes(), winners
+
+def evaluate_parallel(encoded: bytes, count: int, winning_numbers: str, draw_time: str, today: int,
+                      shard: Optional[Tuple[int, int]], workers: int) -> List[Tuple[int, bool, float]]:
+    """
+    Evaluate `count` encoded tickets across `workers` processes.
+    Returns (ticket position, is_winner, prize) for every checked ticket, in ticket order.
+    """
+    draw_code = DRAW_TIME_CODES[draw_time.upper()]
+    # A few chunks per worker evens out uneven ranges
+    chunk = max(-(-count // (workers * 4)), 1)
+    fd, path = tempfile.mkstemp(prefix='lottrack-tickets-', suffix='.bin')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=_pool_context(), initializer=_attach,
+                                 initargs=(path,)) as pool:
+            futures = [
+                pool.submit(_evaluate_range, start, min(start + chunk, count), winning_numbers, draw_code, today, shard)
+                for start in range(0, count, chunk)
+            ]
+            results = []
+            # Chunks are in ticket order, so collecting them in submission order keeps the order
+            for future in futures:
+                checked_bytes, winners = future.result()
+                checked = array('i')
+                checked.frombytes(checked_bytes)
+                for i in checked:
+                    prize = winners.get(i)
+                    results.append((i, prize is not None, prize or 0.0))
+            return results
+    finally:
+        os.remove(path)
@@ -0,0 +1,171 @@
+"""
+Staged pipeline with bounded queues between the stages.
+
+Each stage runs in its own thread (or threads) and passes its output to the
+next stage through a bounded queue. A slow stage, like SMTP delivery, makes
+the stages before it wait once its queue is full instead of letting work
+pile up in memory, while they keep working ahead of it until then.
+
+For each stage the pipeline reports how many items it handled, how long it
+was busy, how long it waited on a full downstream queue, its input queue's
+depth and its throughput. They are returned by run() and added to the run
+metrics as pipeline.<stage>.* counters and gauges.
+"""
+import logging
+import queue
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+QUEUE_SIZE = 1000
+_DONE = object()
+
+class Stage:
+    """
+    One step of a Pipeline. func maps an item to its output, or to None to
+    drop it; with expand=True it returns an iterable of outputs instead.
+    """
+
+    def __init__(self, name: str, func: Callable[[Any], Any], workers: int = 1, expand: bool = False):
+        self.name = name
+        self.func = func
+        self.workers = max(workers, 1)
+        self.expand = expand
+
+class Pipeline:
+    """Feeds items from a source through Stages, each in its own threads."""
+
+    def __init__(self, stages: List[Stage], queue_size: int = QUEUE_SIZE, source_name: str = 'source'):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.source_name = source_name
+
+    def run(self, source: Iterable[Any]) -> Dict[str, Dict[str, float]]:
+        """Run every item of source through the stages; returns the per-stage statistics."""
+        queues = [queue.Queue(self.queue_size) for _ in self.stages]
+        stats = {name: {'items': 0, 'outputs': 0, 'errors': 0, 'busy_seconds': 0.0, 'blocked_seconds': 0.0,
+                        'max_queue_depth': 0, 'depth_total': 0, 'started': None, 'finished': None}
+                 for name in [self.source_name] + [stage.name for stage in self.stages]}
+        lock = threading.Lock()
+        remaining = [stage.workers for stage in self.stages]
+
+        def put(index: int, item: Any, local: Dict[str, float]):
+            if index < len(queues):
+                start = time.perf_counter()
+                queues[index].put(item)
+                local['blocked_seconds'] += time.perf_counter() - start
+            local['outputs'] += 1
+
+        def merge(name: str, local: Dict[str, float], started: float):
+            with lock:
+                totals = stats[name]
+                for key in ('items', 'outputs', 'errors', 'busy_seconds', 'blocked_seconds', 'depth_total'):
+                    totals[key] += local[key]
+                totals['max_queue_depth'] = max(totals['max_queue_depth'], local['max_queue_depth'])
+                totals['started'] = min(filter(None, (totals['started'], started)))
+                totals['finished'] = max(filter(None, (totals['finished'], time.perf_counter())))
+
+        def finish(index: int):
+            """Called as each worker of stage index stops; the last one ends the next stage."""
+            with lock:
+                remaining[index] -= 1
+                last = remaining[index] == 0
+            if last and index + 1 < len(queues):
+                for _ in range(self.stages[index + 1].workers):
+                    queues[index + 1].put(_DONE)
+
+        def produce():
+            local = dict.fromkeys(('items', 'outputs', 'errors', 'busy_seconds', 'blocked_seconds',
+                                   'depth_total', 'max_queue_depth'), 0)
+            started = time.perf_counter()
+            try:
+                for item in source:
+                    local['items'] += 1
+                    put(0, item, local)
+            except Exception as e:
+                local['errors'] += 1
+                logger.error(f"Error in pipeline stage {self.source_name}: {str(e)}")
+            finally:
+                local['busy_seconds'] = time.perf_counter() - started - local['blocked_seconds']
+                merge(self.source_name, local, started)
+                for _ in range(self.stages[0].workers):
+                    queues[0].put(_DONE)
+
+        def work(index: int):
+            stage = self.stages[index]
+            inbox = queues[index]
+            local = dict.fromkeys(('items', 'outputs', 'errors', 'busy_seconds', 'blocked_seconds',
+                                   'depth_total', 'max_queue_depth'), 0)
+            started = time.perf_counter()
+            try:
+                while True:
+                    depth = inbox.qsize()
+                    item = inbox.get()
+                    if item is _DONE:
+                        break
+                    local['items'] += 1
+                    local['depth_total'] += depth
+                    local['max_queue_depth'] = max(local['max_queue_depth'], depth)
+                    start = time.perf_counter()
+                    blocked = local['blocked_seconds']
+                    try:
+                        output = stage.func(item)
+                        if stage.expand:
+                            for value in output or ():
+                                put(index + 1, value, local)
+                        elif output is not None:
+                            put(index + 1, output, local)
+                    except Exception as e:
+                        local['errors'] += 1
+                        logger.error(f"Error in pipeline stage {stage.name}: {str(e)}")
+                    local['busy_seconds'] += time.perf_counter() - start - (local['blocked_seconds'] - blocked)
+            finally:
+                merge(stage.name, local, started)
+                finish(index)
+
+        threads = [threading.Thread(target=produce, name=f'pipeline-{self.source_name}', daemon=True)]
+        for index, stage in enumerate(self.stages):
+            threads += [threading.Thread(target=work, args=(index,), name=f'pipeline-{stage.name}-{n}', daemon=True)
+                        for n in range(stage.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report = {}
+        for name, totals in stats.items():
+            seconds = (totals['finished'] or 0.0) - (totals['started'] or 0.0)
+            report[name] = {
+                'items': totals['items'],
+                'outputs': totals['outputs'],
+                'errors': totals['errors'],
+                'seconds': seconds,
+                'busy_seconds': totals['busy_seconds'],
+                'blocked_seconds': totals['blocked_seconds'],
+                'items_per_second': totals['items'] / seconds if seconds > 0 else 0.0,
+                'max_queue_depth': totals['max_queue_depth'],
+                'mean_queue_depth': totals['depth_total'] / totals['items'] if totals['items'] else 0.0,
+            }
+        record(report)
+        return report
+
+def record(report: Dict[str, Dict[str, float]]):
+    """Add a pipeline run's statistics to the run metrics."""
+    for name, stage in report.items():
+        metrics.incr(f'pipeline.{name}.items', stage['items'])
+        if stage['errors']:
+            metrics.incr(f'pipeline.{name}.errors', stage['errors'])
+        for key in ('busy_seconds', 'blocked_seconds', 'items_per_second', 'max_queue_depth', 'mean_queue_depth'):
+            metrics.gauge(f'pipeline.{name}.{key}', stage[key])
+
+def format_report(report: Dict[str, Dict[str, float]]) -> str:
+    """One line per stage, for the log."""
+    return '\n'.join(
+        f"{name:10} {stage['items']:>9,} items {stage['items_per_second']:>10,.1f}/s  "
+        f"busy {stage['busy_seconds']:7.2f}s  blocked {stage['blocked_seconds']:7.2f}s  "
+        f"queue max {stage['max_queue_depth']:>5} mean {stage['mean_queue_depth']:7.1f}"
+        for name, stage in report.items()
+    )
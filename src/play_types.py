@@ -1,81 +1,90 @@
-from typing import List, Tuple
-from abc import ABC, abstractmethod
+from typing import Dict, List, Tuple
+from .games import (BASE_WAGER, DEFAULT_GAME, GAMES, Game, distinct_permutations, get_game,
+                    permutation_count, sorted_key)
 
-class PlayType(ABC):
-    """Base class for all play types."""
-    
-    def __init__(self, numbers: str):
+STRAIGHT_PRIZE = GAMES[DEFAULT_GAME]['plays']['straight']['straight']
+
+class PlayType:
+    """
+    Base class for all play types.
+
+    What a play wins and costs comes from its game's definition (see games.py);
+    the subclasses name the plays and document them.
+    """
+    name: str = None
+
+    def __init__(self, numbers: str, game: Game = None, name: str = None):
         self.numbers = numbers
-        
-    @abstractmethod
+        self.name = name or self.name
+        self.game = game or get_game(DEFAULT_GAME)
+        # Look up the ticket's box class and prizes once so checks don't have to
+        self.value = int(numbers) if numbers.isdigit() and len(numbers) == self.game.digits else None
+        if self.value is None:
+            self.box_class, self.ways, self.prizes = None, permutation_count(numbers), (0.0, 0.0, 0.0)
+        else:
+            self.box_class = self.game.class_of[self.value]
+            self.ways = self.game.ways[self.box_class]
+            self.prizes = self.game.ticket_prizes(self.name, self.value)
+
+    @property
+    def wager(self) -> float:
+        """Cost of the ticket in dollars."""
+        return self.game.wager(self.name, self.ways)
+
     def calculate_prize(self, ticket: List[str], winning: List[str]) -> Tuple[bool, float]:
         """Calculate if ticket wins and prize amount."""
-        pass
-        
+        straight, box, one_off = self.prizes
+        draw = ''.join(winning)
+        if straight and draw == self.numbers:
+            return True, straight
+        if not (box or one_off) or len(draw) != self.game.digits or not draw.isdigit():
+            return False, 0.0
+        value = int(draw)
+        if box and self.game.class_of[value] == self.box_class:
+            return True, box
+        if one_off and self.game.one_off(self.value, value):
+            return True, one_off
+        return False, 0.0
+
+    def winning_outcomes(self) -> Dict[str, float]:
+        """Map every winning draw to the prize it pays."""
+        if self.value is None:
+            return {}
+        return self.game.winning_outcomes(self.name, self.numbers)
+
     @classmethod
-    def create(cls, play_type: str, numbers: str) -> 'PlayType':
-        """Create a play type instance."""
-        if play_type == 'straight':
-            return Straight(numbers)
-        elif play_type == 'box':
-            return Box(numbers)
-        elif play_type == 'straightbox':
-            return StraightBox(numbers)
-        elif play_type == 'combo':
-            return Combo(numbers)
-        elif play_type == 'oneoff':
-            return OneOff(numbers)
-        return None
+    def create(cls, play_type: str, numbers: str, game: str = DEFAULT_GAME) -> 'PlayType':
+        """Create a play type instance, or None if the game has no such play."""
+        game = get_game(game)
+        if game is None or play_type not in game.plays:
+            return None
+        return PLAY_TYPES.get(play_type, GamePlay)(numbers, game, play_type)
 
 class Straight(PlayType):
     """Straight play - numbers must match in exact order."""
-    
-    def calculate_prize(self, ticket: List[str], winning: List[str]) -> Tuple[bool, float]:
-        if ticket == winning:
-            return True, 5000.0
-        return False, 0.0
+    name = 'straight'
 
 class Box(PlayType):
     """Box play - numbers must match in any order."""
-    
-    def calculate_prize(self, ticket: List[str], winning: List[str]) -> Tuple[bool, float]:
-        if sorted(ticket) == sorted(winning):
-            return True, 500.0
-        return False, 0.0
+    name = 'box'
 
 class StraightBox(PlayType):
     """Straight/Box play - wins on either straight or box."""
-    
-    def calculate_prize(self, ticket: List[str], winning: List[str]) -> Tuple[bool, float]:
-        if ticket == winning:
-            return True, 5500.0  # Straight + Box prize
-        if sorted(ticket) == sorted(winning):
-            return True, 500.0
-        return False, 0.0
+    name = 'straightbox'
 
 class Combo(PlayType):
-    """Combo play - all possible straight combinations."""
-    
-    def calculate_prize(self, ticket: List[str], winning: List[str]) -> Tuple[bool, float]:
-        if ticket == winning:
-            return True, 5000.0
-        return False, 0.0
+    """Combo play - a $1 straight on every distinct permutation of the numbers.
+
+    The ticket costs one wager per permutation (4, 6, 12 or 24 ways), and
+    exactly one permutation can match, paying the straight prize.
+    """
+    name = 'combo'
 
 class OneOff(PlayType):
     """One-Off play - one digit can be off by one."""
-    
-    def calculate_prize(self, ticket: List[str], winning: List[str]) -> Tuple[bool, float]:
-        if ticket == winning:
-            return True, 5000.0
-        if len(ticket) != len(winning):
-            return False, 0.0
-            
-        # Check if exactly one digit is off by one
-        differences = 0
-        for t, w in zip(ticket, winning):
-            if abs(int(t) - int(w)) == 1:
-                differences += 1
-            elif t != w:
-                return False, 0.0
-                
-        return differences == 1, 1000.0 
\ No newline at end of file
+    name = 'oneoff'
+
+class GamePlay(PlayType):
+    """A play type defined only in a game's configuration."""
+
+PLAY_TYPES = {play.name: play for play in (Straight, Box, StraightBox, Combo, OneOff)}
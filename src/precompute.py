@@ -0,0 +1,109 @@
+"""
+Winners of an upcoming drawing, worked out before its result posts.
+
+Between drawings the ticket book barely changes, so instead of scanning every
+ticket once the result is in, WinnerTable maps each result that would make any
+ticket a winner to those tickets and their prizes, and can render their
+winner emails ahead of time. When the result posts, its winners are one dict
+lookup away and are sent before the rest of the book is checked (see
+process_drawings in src/main.py).
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from .email_notifier import validate_email
+from .games import DEFAULT_GAME, ticket_game
+from .metrics import metrics
+from .play_types import PlayType
+from .ticket_manager import TicketManager, shard_of
+
+logger = logging.getLogger(__name__)
+
+# Winner emails are only rendered ahead when a drawing has at most this many (result, ticket) pairs
+RENDER_LIMIT = 20000
+
+class WinnerTable:
+    """
+    Every winning result of one drawing mapped to (ticket, prize) pairs.
+
+    A table is built for the tickets active on one day and a given version of
+    the ticket book; is_current tells whether it still matches.
+    """
+
+    def __init__(self, draw_time: str, active_on: date, version: int, shard: Optional[Tuple[int, int]] = None):
+        self.draw_time = draw_time.upper()
+        self.active_on = active_on
+        self.version = version
+        self.shard = shard
+        self.tickets = 0
+        self._winners: Dict[str, List[Tuple[Dict[str, Any], float]]] = {}
+        self._messages: Dict[Tuple[str, str], Any] = {}
+
+    @classmethod
+    def build(cls, ticket_manager: TicketManager, draw_time: str, shard: Optional[Tuple[int, int]] = None,
+              active_on: date = None) -> 'WinnerTable':
+        """Work out the winners of every possible result for draw_time's active Cash 4 tickets."""
+        active_on = active_on or date.today()
+        table = cls(draw_time, active_on, ticket_manager.version, shard)
+        today = active_on.isoformat()
+        # Tickets with the same play and numbers win on the same results
+        outcomes = {}
+        with metrics.span('precompute.build'):
+            # Same selection as TicketManager.iter_winning_numbers
+            for ticket in ticket_manager.iter_tickets():
+                if ticket.get('draw_time', '').upper() != table.draw_time or ticket_game(ticket) != DEFAULT_GAME:
+                    continue
+                if shard is not None and shard_of(ticket, shard[1]) != shard[0]:
+                    continue
+                if not ticket['start_date'][:10] <= today <= ticket['end_date'][:10]:
+                    continue
+                table.tickets += 1
+                key = (ticket['play_type'], ''.join(ticket['numbers']))
+                if key not in outcomes:
+                    play = PlayType.create(*key)
+                    outcomes[key] = play.winning_outcomes() if play else {}
+                for winning_numbers, prize in outcomes[key].items():
+                    table._winners.setdefault(winning_numbers, []).append((ticket, prize))
+        metrics.incr('precompute.tickets', table.tickets)
+        logger.debug(f"{table.draw_time} winners precomputed: {table.tickets} tickets, "
+                     f"{len(table._winners)} winning results")
+        return table
+
+    def is_current(self, ticket_manager: TicketManager, shard: Optional[Tuple[int, int]] = None,
+                   active_on: date = None) -> bool:
+        """
+        Whether the table still matches the ticket book, shard and the tickets
+        active on active_on (default: the host's date).
+        """
+        return (self.version == ticket_manager.version and self.active_on == (active_on or date.today())
+                and self.shard == shard)
+
+    def winners(self, winning_numbers: str) -> List[Tuple[Dict[str, Any], float]]:
+        """(ticket, prize) of every ticket that wins if winning_numbers are drawn."""
+        return self._winners.get(winning_numbers, [])
+
+    @property
+    def pairs(self) -> int:
+        """How many (result, winning ticket) pairs the table holds."""
+        return sum(len(winners) for winners in self._winners.values())
+
+    def render(self, email_notifier, limit: int = RENDER_LIMIT) -> int:
+        """
+        Render the winner email of every (result, ticket) pair, unless there
+        are more than limit of them. Returns how many were rendered.
+        """
+        if self.pairs > limit or not all([email_notifier.sender_email, email_notifier.sender_password]):
+            return 0
+        with metrics.span('precompute.render'):
+            for winning_numbers, winners in self._winners.items():
+                for ticket, prize in winners:
+                    # Invalid addresses are left for the drawing's run to report
+                    if validate_email(ticket.get('email')):
+                        message = email_notifier.render_notification(ticket, list(winning_numbers), prize)
+                        if message is not None:
+                            self._messages[(winning_numbers, ticket['id'])] = message
+        return len(self._messages)
+
+    def message(self, winning_numbers: str, ticket_id: str) -> Optional[Any]:
+        """The pre-rendered winner email for a ticket, if there is one. Each can be used once."""
+        return self._messages.pop((winning_numbers, ticket_id), None)
@@ -0,0 +1,128 @@
+import cProfile
+import os
+import sys
+import threading
+import tracemalloc
+from collections import Counter
+from typing import List
+
+# cpu: cProfile stats plus sampled stacks
+# sample: sampled stacks only (lowest overhead)
+# memory: tracemalloc allocation report plus sampled stacks
+PROFILE_MODES = ('cpu', 'sample', 'memory')
+
+class _StackSampler(threading.Thread):
+    """
+    Periodically records the call stack of every other thread, for flame
+    graphs. Each stack starts with the name of its thread, so the pipeline
+    stages in src.main show up side by side.
+    """
+
+    def __init__(self, interval: float):
+        super().__init__(name='stack-sampler', daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                if stack:
+                    stack.append(names.get(thread_id, f"thread-{thread_id}"))
+                    self.stacks[';'.join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+class Profiler:
+    """
+    Profile everything between start() and stop() on the calling thread and
+    on any thread started in between, such as the pipeline stages of src.main.
+
+    Writes <name>.pstats (cpu mode), <name>.collapsed (all modes; one
+    "frame;frame;frame count" line per sampled stack, the input format of
+    flamegraph.pl and speedscope) and <name>.memory.txt (memory mode) into
+    output_dir.
+    """
+
+    def __init__(self, mode: str = 'cpu', name: str = 'profile', output_dir: str = '.', interval: float = 0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.mode = mode
+        self.name = name
+        self.output_dir = output_dir
+        self.interval = interval
+        self._profile = None
+        self._thread_profiles: List[cProfile.Profile] = []
+        self._sampler = None
+
+    def _profile_thread(self, frame, event, arg):
+        """threading.setprofile hook: give each new thread its own cProfile.Profile."""
+        profile = cProfile.Profile()
+        self._thread_profiles.append(profile)
+        # Replaces this hook for the rest of the thread
+        profile.enable()
+
+    def _path(self, suffix: str) -> str:
+        return os.path.join(self.output_dir, f"{self.name}{suffix}")
+
+    def start(self):
+        if self.mode == 'memory':
+            tracemalloc.start(25)
+        self._sampler = _StackSampler(self.interval)
+        self._sampler.start()
+        if self.mode == 'cpu':
+            # cProfile only sees the thread that enables it, so threads started from here on get their own
+            threading.setprofile(self._profile_thread)
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self) -> List[str]:
+        """Stop profiling and write the output files. Returns their paths."""
+        written = []
+        if self._profile:
+            import pstats
+
+            self._profile.disable()
+            threading.setprofile(None)
+            # Threads still running keep adding to their profile; the stats are a snapshot of it
+            pstats.Stats(self._profile, *self._thread_profiles).dump_stats(self._path('.pstats'))
+            written.append(self._path('.pstats'))
+        if self._sampler:
+            self._sampler.stop()
+            with open(self._path('.collapsed'), 'w') as f:
+                for stack, count in self._sampler.stacks.most_common():
+                    f.write(f"{stack} {count}\n")
+            written.append(self._path('.collapsed'))
+        if self.mode == 'memory' and tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            with open(self._path('.memory.txt'), 'w') as f:
+                f.write(f"Current traced memory: {current / 1024 / 1024:.1f} MiB\n")
+                f.write(f"Peak traced memory: {peak / 1024 / 1024:.1f} MiB\n\n")
+                f.write("Top allocations by line:\n")
+                for stat in snapshot.statistics('lineno')[:50]:
+                    f.write(f"{stat}\n")
+            written.append(self._path('.memory.txt'))
+        self._profile = None
+        self._thread_profiles = []
+        self._sampler = None
+        return written
+
+    def __enter__(self) -> 'Profiler':
+        self.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
@@ -1,13 +1,17 @@
-import requests
-from bs4 import BeautifulSoup
 import time
 from datetime import datetime, date
-import pytz
 from typing import Dict, Optional, Tuple, List, Any
 import json
+import logging
 import os
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
+from . import codec
+from .history import ResultsHistory
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+# Selenium and BeautifulSoup are imported where they are used, so callers that
+# only need stored numbers don't pay for loading them.
 
 class LotteryScraper:
     """Scraper for Georgia Lottery Cash 4 numbers."""
@@ -20,35 +24,87 @@ class LotteryScraper:
     }
     DATA_FILE = "data/winning_numbers.json"
     
-    def __init__(self):
+    def __init__(self, keep_browser: bool = False, config_file: str = "config/config.json"):
         # Create data directory if it doesn't exist
         os.makedirs(os.path.dirname(self.DATA_FILE), exist_ok=True)
-        
-    def _get_rendered_html(self) -> str:
-        """Use Selenium with a headless Chrome browser to fetch the rendered HTML."""
+        # Long-running processes reuse one browser instead of launching Chrome per scrape
+        self.keep_browser = keep_browser
+        self._driver = None
+
+        config = self._load_config(config_file).get('scraper', {})
+        self.url = config.get('url', self.BASE_URL)
+        self.headers = config.get('headers', {})
+        # Pages that don't need JavaScript (e.g. recorded fixtures) can skip the browser
+        self.use_browser = config.get('use_browser', True)
+
+    def _load_config(self, config_file: str) -> Dict:
+        """Load configuration from file."""
+        try:
+            with open(config_file, 'r') as f:
+                return json.load(f)
+        except Exception:
+            return {}
+
+    def _create_driver(self):
+        """Launch a headless Chrome browser."""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
         chrome_options = Options()
         chrome_options.add_argument("--headless")
         chrome_options.add_argument("--disable-gpu")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
-        driver = webdriver.Chrome(options=chrome_options)
+        with metrics.span('scrape.browser_launch'):
+            return webdriver.Chrome(options=chrome_options)
+        
+    def _get_rendered_html(self) -> str:
+        """Use Selenium with a headless Chrome browser to fetch the rendered HTML."""
+        driver = self._driver or self._create_driver()
         try:
-            driver.get(self.BASE_URL)
-            time.sleep(5)  # Wait for JavaScript to load
-            return driver.page_source
-        finally:
+            with metrics.span('scrape.page_load'):
+                driver.get(self.url)
+                time.sleep(5)  # Wait for JavaScript to load
+                html = driver.page_source
+        except Exception:
+            # Don't keep a browser that may be in a bad state
             driver.quit()
+            self._driver = None
+            raise
+        if self.keep_browser:
+            self._driver = driver
+        else:
+            driver.quit()
+        return html
+
+    def _get_html(self) -> str:
+        """Fetch the results page, rendering it in a browser unless configured not to."""
+        if self.use_browser:
+            return self._get_rendered_html()
+        import requests
+
+        with metrics.span('scrape.page_load'):
+            response = requests.get(self.url, headers=self.headers, timeout=30)
+            response.raise_for_status()
+            return response.text
+
+    def close(self):
+        """Shut down the browser kept open with keep_browser."""
+        if self._driver:
+            try:
+                self._driver.quit()
+            finally:
+                self._driver = None
             
     def _load_stored_numbers(self) -> Optional[Dict[str, Tuple[str, str]]]:
         """Load winning numbers from the data file."""
         try:
             if os.path.exists(self.DATA_FILE):
-                with open(self.DATA_FILE, 'r') as f:
-                    data = json.load(f)
-                    # Check if the data is from today
-                    # Note: Program runs after midnight, so we're checking previous day's results
-                    if data.get('date') == date.today().isoformat():
-                        return data.get('numbers', {})
+                data = codec.load_file(self.DATA_FILE)
+                # Check if the data is from today
+                # Note: Program runs after midnight, so we're checking previous day's results
+                if data.get('date') == date.today().isoformat():
+                    return data.get('numbers', {})
         except Exception:
             pass
         return None
@@ -60,12 +116,16 @@ class LotteryScraper:
                 'date': date.today().isoformat(),  # Today's date (when program runs)
                 'numbers': numbers  # Previous day's results
             }
-            with open(self.DATA_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
+            codec.dump_file(self.DATA_FILE, data)
+            # Keep every result for back-testing and statistics
+            ResultsHistory().add_results(numbers)
+        except codec.CodecError as e:
+            # An unreadable history is left as it is for someone to look at
+            logger.error(f"Results not added to the history: {str(e)}")
         except Exception:
             pass
             
-    def get_winning_numbers(self) -> Dict[str, Tuple[str, str]]:
+    def get_winning_numbers(self, refresh: bool = False, cached_only: bool = False) -> Dict[str, Tuple[str, str]]:
         """
         Fetch winning numbers for all drawings by scraping the website table using Selenium.
         Returns a dictionary with drawing type as key and tuple of (numbers, date) as value.
@@ -73,16 +133,26 @@ class LotteryScraper:
         
         Note: This program is designed to run after midnight (12 AM) to check the previous day's results.
         For example, if run on 2025-06-17, it will fetch results from 2025-06-16.
+
+        Pass refresh=True to skip today's stored numbers and scrape again, e.g. to
+        pick up a drawing posted since the last scrape, or cached_only=True to
+        never scrape (returns {} if nothing was stored today).
         """
         # Try to load stored numbers first
-        stored_numbers = self._load_stored_numbers()
+        stored_numbers = None if refresh else self._load_stored_numbers()
         if stored_numbers:
             return stored_numbers
+        if cached_only:
+            return {}
             
         # If no stored numbers or they're old, scrape new ones
         results = {}  # Will store the latest result for each drawing type
+        scrape_start = time.perf_counter()
         try:
-            html = self._get_rendered_html()
+            from bs4 import BeautifulSoup
+
+            html = self._get_html()
+            parse_start = time.perf_counter()
             soup = BeautifulSoup(html, 'html.parser')
             
             # Find the table using the correct ID
@@ -144,10 +214,14 @@ class LotteryScraper:
                 except Exception:
                     continue
                     
+            metrics.record('scrape.parse', time.perf_counter() - parse_start)
+
             # Save the results
             if results:
                 self._save_numbers(results)
                 
         except Exception:
             return {}
+        finally:
+            metrics.record('scrape', time.perf_counter() - scrape_start)
         return results 
\ No newline at end of file
@@ -0,0 +1,314 @@
+"""
+Memory-mapped binary snapshot of the ticket book.
+
+The snapshot is a read-only copy of tickets.json laid out as columns of
+fixed-width values, so count, filter and evaluate queries map the file and
+read only the columns they need instead of parsing every ticket into a dict.
+
+Layout: a header, then one column per field, each starting on an 8-byte
+boundary, in native byte order (recorded in the header):
+
+    ids        8 bytes per ticket, ASCII, NUL-padded
+    numbers    4 bytes per ticket, ASCII digits
+    play_type  uint8 code (see parallel.PLAY_TYPE_CODES, 0 = unknown)
+    draw_time  uint8 code (see parallel.DRAW_TIME_CODES, 0 = unknown)
+    start_day  int32 date ordinal
+    end_day    int32 date ordinal
+    email      uint32 index into the email table
+    by_<field> uint32 per ticket: the ticket positions ordered by that field
+               (and by position among equals), for play_type, draw_time,
+               email, numbers and end_day
+    email_offsets  uint32 per email + 1, into email_blob
+    email_blob     UTF-8 email addresses, back to back, ordered by lowercased address
+
+The by_<field> columns are persisted indexes: a filter on a field bisects
+its order instead of reading every ticket, so a lookup touches a few pages
+of the file however large the book is.
+
+Only Cash 4 tickets and the fields above can be stored. The JSON file stays the source of truth,
+and the header records its size and mtime so a stale snapshot is never used.
+"""
+import bisect
+import mmap
+import os
+import struct
+import sys
+from array import array
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from .games import DEFAULT_GAME, ticket_game
+from .parallel import DRAW_TIME_CODES, PLAY_TYPE_CODES, PLAY_TYPE_NAMES
+from .play_types import PlayType
+
+MAGIC = b'LOTSNAP1'
+VERSION = 2
+# magic, version, little-endian flag, ticket count, email count, source mtime (ns), source size
+HEADER = struct.Struct('<8sIIIIqq')
+ID_WIDTH = 8
+DRAW_TIME_NAMES = {code: name for name, code in DRAW_TIME_CODES.items()}
+# Fields with a persisted order (see the module docstring)
+INDEXED = ('play_type', 'draw_time', 'email', 'numbers', 'end_day')
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+def _layout(count: int, email_count: int) -> Dict[str, Tuple[int, int]]:
+    """Byte (offset, length) of each column."""
+    sizes = [
+        ('ids', count * ID_WIDTH), ('numbers', count * 4), ('play_type', count), ('draw_time', count),
+        ('start_day', count * 4), ('end_day', count * 4), ('email', count * 4),
+    ] + [(f'by_{name}', count * 4) for name in INDEXED] + [
+        ('email_offsets', (email_count + 1) * 4),
+    ]
+    layout = {}
+    offset = _align(HEADER.size)
+    for name, size in sizes:
+        layout[name] = (offset, size)
+        offset = _align(offset + size)
+    layout['email_blob'] = (offset, None)
+    return layout
+
+def _source_stamp(source_file: str) -> Tuple[int, int]:
+    stat = os.stat(source_file)
+    return stat.st_mtime_ns, stat.st_size
+
+def write_snapshot(path: str, tickets: List[Dict[str, Any]], source_file: str = None):
+    """Write tickets to a snapshot file; source_file is the JSON file it mirrors."""
+    count = len(tickets)
+    ids = bytearray(count * ID_WIDTH)
+    numbers = bytearray(count * 4)
+    play_types = bytearray(count)
+    draw_times = bytearray(count)
+    start_days = array('i', bytes(count * 4))
+    end_days = array('i', bytes(count * 4))
+    emails = []
+    for i, ticket in enumerate(tickets):
+        ticket_id = ticket['id'].encode('ascii')
+        ticket_numbers = ''.join(ticket['numbers']).encode('ascii')
+        if len(ticket_id) > ID_WIDTH or len(ticket_numbers) != 4 or ticket_game(ticket) != DEFAULT_GAME:
+            raise ValueError(f"Cannot store ticket {ticket['id']} in a snapshot")
+        ids[i * ID_WIDTH:i * ID_WIDTH + len(ticket_id)] = ticket_id
+        numbers[i * 4:i * 4 + 4] = ticket_numbers
+        play_types[i] = PLAY_TYPE_CODES.get(ticket.get('play_type'), 0)
+        draw_times[i] = DRAW_TIME_CODES.get(ticket.get('draw_time', '').upper(), 0)
+        start_days[i] = datetime.fromisoformat(ticket['start_date']).date().toordinal()
+        end_days[i] = datetime.fromisoformat(ticket['end_date']).date().toordinal()
+        emails.append(ticket.get('email', ''))
+
+    # The email table is ordered by lowercased address, so an address's codes are contiguous
+    email_index = {email: code for code, email in enumerate(sorted(set(emails), key=lambda e: (e.lower(), e)))}
+    email_column = array('I', (email_index[email] for email in emails))
+    keys = {
+        'play_type': play_types.__getitem__, 'draw_time': draw_times.__getitem__,
+        'email': email_column.__getitem__, 'numbers': lambda i: numbers[i * 4:i * 4 + 4],
+        'end_day': end_days.__getitem__,
+    }
+    # sorted is stable, so equal keys keep book order
+    orders = {f'by_{name}': array('I', sorted(range(count), key=keys[name])).tobytes() for name in INDEXED}
+
+    email_offsets = array('I', [0])
+    blob = bytearray()
+    for email in email_index:
+        blob += email.encode('utf-8')
+        email_offsets.append(len(blob))
+
+    mtime_ns, size = _source_stamp(source_file) if source_file else (0, 0)
+    layout = _layout(count, len(email_index))
+    columns = {
+        'ids': ids, 'numbers': numbers, 'play_type': play_types, 'draw_time': draw_times,
+        'start_day': start_days.tobytes(), 'end_day': end_days.tobytes(), 'email': email_column.tobytes(),
+        'email_offsets': email_offsets.tobytes(), 'email_blob': blob, **orders,
+    }
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, sys.byteorder == 'little', count, len(email_index), mtime_ns, size))
+        for name, (offset, _) in layout.items():
+            f.write(b'\0' * (offset - f.tell()))
+            f.write(columns[name])
+    os.replace(tmp_path, path)
+
+def snapshot_path(data_file: str) -> str:
+    """Where TicketManager keeps the snapshot of data_file."""
+    return os.path.splitext(data_file)[0] + '.snapshot'
+
+def open_snapshot(data_file: str = None) -> Optional['TicketSnapshot']:
+    """Open the fresh snapshot of the ticket file (default: from config), without loading the JSON."""
+    from .ticket_manager import default_tickets_file
+
+    data_file = data_file or default_tickets_file()
+    return TicketSnapshot.open_if_fresh(snapshot_path(data_file), data_file)
+
+class TicketSnapshot:
+    """A ticket snapshot opened with mmap. Columns are zero-copy memoryviews."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, little, self.count, self.email_count, self.source_mtime_ns, self.source_size = \
+            HEADER.unpack_from(self._mmap)
+        if magic != MAGIC or version != VERSION or bool(little) != (sys.byteorder == 'little'):
+            self._mmap.close()
+            raise ValueError(f"{path} is not a ticket snapshot this version can read")
+        view = memoryview(self._mmap)
+        self._views = [view]
+        self.columns = {}
+        formats = {'start_day': 'i', 'end_day': 'i', 'email': 'I', 'email_offsets': 'I',
+                   **{f'by_{name}': 'I' for name in INDEXED}}
+        for name, (offset, size) in _layout(self.count, self.email_count).items():
+            column = view[offset:] if size is None else view[offset:offset + size]
+            if name in formats:
+                column = column.cast(formats[name])
+            self._views.append(column)
+            self.columns[name] = column
+        self._emails: Optional[List[str]] = None
+
+    @classmethod
+    def open_if_fresh(cls, path: str, source_file: str) -> Optional['TicketSnapshot']:
+        """Open the snapshot if it exists and still matches source_file, else None."""
+        try:
+            snapshot = cls(path)
+        except (OSError, ValueError):
+            return None
+        try:
+            fresh = (snapshot.source_mtime_ns, snapshot.source_size) == _source_stamp(source_file)
+        except OSError:
+            fresh = False
+        if not fresh:
+            snapshot.close()
+            return None
+        return snapshot
+
+    def close(self):
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> 'TicketSnapshot':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def emails(self) -> List[str]:
+        """The email table, decoded on first use."""
+        if self._emails is None:
+            offsets = self.columns['email_offsets']
+            blob = bytes(self.columns['email_blob'])
+            self._emails = [blob[offsets[i]:offsets[i + 1]].decode('utf-8') for i in range(self.email_count)]
+        return self._emails
+
+    def ticket(self, index: int) -> Dict[str, Any]:
+        """Rebuild one ticket dict (with only the snapshot's fields)."""
+        columns = self.columns
+        return {
+            'id': bytes(columns['ids'][index * ID_WIDTH:(index + 1) * ID_WIDTH]).rstrip(b'\0').decode('ascii'),
+            'numbers': list(bytes(columns['numbers'][index * 4:index * 4 + 4]).decode('ascii')),
+            'play_type': PLAY_TYPE_NAMES.get(columns['play_type'][index], ''),
+            'draw_time': DRAW_TIME_NAMES.get(columns['draw_time'][index], ''),
+            'start_date': date.fromordinal(columns['start_day'][index]).isoformat(),
+            'end_date': date.fromordinal(columns['end_day'][index]).isoformat(),
+            'email': self.emails[columns['email'][index]],
+        }
+
+    def iter_tickets(self, indexes: List[int] = None) -> Iterator[Dict[str, Any]]:
+        for index in (range(self.count) if indexes is None else indexes):
+            yield self.ticket(index)
+
+    def _email(self, code: int) -> str:
+        offsets = self.columns['email_offsets']
+        return bytes(self.columns['email_blob'][offsets[code]:offsets[code + 1]]).decode('utf-8')
+
+    def _key(self, name: str):
+        """The value of field name for a ticket position, as the by_<name> order sorts it."""
+        column = self.columns[name]
+        if name == 'numbers':
+            return lambda i: bytes(column[i * 4:i * 4 + 4])
+        return column.__getitem__
+
+    def _span(self, name: str, low, high) -> Tuple[int, int]:
+        """The slice of the by_<name> order whose values are between low and high (inclusive)."""
+        order, key = self.columns[f'by_{name}'], self._key(name)
+        return bisect.bisect_left(order, low, key=key), bisect.bisect_right(order, high, key=key)
+
+    def select(self, draw_time: str = None, play_type: str = None, email: str = None, numbers: str = None,
+               active_on: date = None, expiring_within: int = None, today: date = None) -> List[int]:
+        """
+        Positions of the tickets matching all the given filters, in book order.
+        The filters mean the same as in TicketManager.query_tickets.
+        """
+        # (field, lowest value, highest value) for each filter
+        ranges = []
+        if draw_time is not None:
+            code = DRAW_TIME_CODES.get(draw_time.upper(), -1)
+            ranges.append(('draw_time', code, code))
+        if play_type is not None:
+            code = PLAY_TYPE_CODES.get(play_type.lower(), -1)
+            ranges.append(('play_type', code, code))
+        if email is not None:
+            codes = range(self.email_count)
+            lowered = email.lower()
+            first = bisect.bisect_left(codes, lowered, key=lambda c: self._email(c).lower())
+            last = bisect.bisect_right(codes, lowered, key=lambda c: self._email(c).lower()) - 1
+            ranges.append(('email', first, last))
+        if numbers is not None:
+            wanted = numbers.encode('ascii', 'replace')
+            ranges.append(('numbers', wanted, wanted))
+        low = high = None
+        if active_on is not None:
+            low = active_on.toordinal()
+        if expiring_within is not None:
+            today = today or date.today()
+            low = max(low or 0, today.toordinal())
+            high = (today + timedelta(days=expiring_within)).toordinal()
+        if low is not None:
+            ranges.append(('end_day', low, high if high is not None else date.max.toordinal()))
+
+        if ranges:
+            # Read the narrowest filter's slice of its order, and check the rest ticket by ticket
+            spans = [(self._span(name, first, last), name, first, last) for name, first, last in ranges]
+            (start, stop), name, _, _ = min(spans, key=lambda span: span[0][1] - span[0][0])
+            indexes = sorted(self.columns[f'by_{name}'][start:stop].tolist()) if start < stop else []
+            for _, other, first, last in spans:
+                if other != name:
+                    key = self._key(other)
+                    indexes = [i for i in indexes if first <= key(i) <= last]
+        else:
+            indexes = list(range(self.count))
+        if active_on is not None:
+            day = active_on.toordinal()
+            starts = self.columns['start_day']
+            indexes = [i for i in indexes if starts[i] <= day]
+        return indexes
+
+    def count_matching(self, **filters) -> int:
+        return len(self.select(**filters))
+
+    def query(self, offset: int = 0, limit: int = None, **filters) -> Tuple[int, List[Dict[str, Any]]]:
+        """The total number of matches and the requested page of them, like TicketManager.query_tickets."""
+        indexes = self.select(**filters)
+        end = None if limit is None else offset + limit
+        return len(indexes), list(self.iter_tickets(indexes[offset:end]))
+
+    def evaluate(self, winning_numbers: str, draw_time: str, today: date = None) -> List[Tuple[int, bool, float]]:
+        """(index, is_winner, prize) for each ticket active today in draw_time, in book order."""
+        numbers_column = self.columns['numbers']
+        play_column = self.columns['play_type']
+        winning = list(winning_numbers)
+        plays = {}
+        results = []
+        for index in self.select(draw_time=draw_time, active_on=today or date.today()):
+            numbers = bytes(numbers_column[index * 4:index * 4 + 4]).decode('ascii')
+            key = (play_column[index], numbers)
+            if key not in plays:
+                plays[key] = PlayType.create(PLAY_TYPE_NAMES.get(key[0]), numbers)
+            play = plays[key]
+            is_winner, prize = play.calculate_prize(list(numbers), winning) if play else (False, 0.0)
+            results.append((index, is_winner, prize))
+        return results
@@ -0,0 +1,129 @@
+import json
+import os
+from datetime import date
+from itertools import combinations
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .games import sorted_key
+
+DRAW_TIMES = ('midday', 'evening', 'night')
+
+class DrawStatistics:
+    """
+    Running aggregates over the drawing history.
+
+    Every counter is updated in place as each drawing is stored, and the whole
+    set is persisted as one small file whose size does not depend on how long
+    the history is, so queries never have to replay past drawings.
+    """
+
+    DATA_FILE = "data/draw_stats.json"
+
+    def __init__(self, data_file: str = None):
+        self.data_file = data_file or self.DATA_FILE
+        self.stats = self._load_stats()
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {
+            'draws': 0,
+            'last_draw': None,
+            # positions[i][d]: times digit d was drawn in position i
+            'positions': [[0] * 10 for _ in range(4)],
+            # pairs[a][b]: drawings in which digits a and b appeared together
+            'pairs': [[0] * 10 for _ in range(10)],
+            # classes['1124']: drawings of any permutation of 1124
+            'classes': {},
+            # last_seen[n]: date ordinal n was last drawn, 0 if never
+            'last_seen': [0] * 10000,
+            # digits[draw time][d]: times digit d was drawn in that drawing
+            'digits': {draw_time: [0] * 10 for draw_time in DRAW_TIMES},
+        }
+
+    def _load_stats(self) -> Dict[str, Any]:
+        """Load statistics from their JSON file."""
+        if os.path.exists(self.data_file):
+            try:
+                with open(self.data_file, 'r') as f:
+                    return json.load(f)
+            except Exception:
+                pass
+        return self._empty()
+
+    def save(self):
+        """Save statistics to their JSON file."""
+        try:
+            os.makedirs(os.path.dirname(self.data_file) or '.', exist_ok=True)
+            with open(self.data_file, 'w') as f:
+                json.dump(self.stats, f)
+        except Exception:
+            pass
+
+    def record(self, draw_date: date, draw_time: str, numbers: str, count: int = 1):
+        """
+        Add a drawing to the aggregates (or take it back out with count=-1, then
+        call forget_last_seen, as last_seen can't be taken back by counting).
+        """
+        stats = self.stats
+        stats['draws'] += count
+        for position, digit in enumerate(numbers):
+            stats['positions'][position][int(digit)] += count
+            stats['digits'].setdefault(draw_time.lower(), [0] * 10)[int(digit)] += count
+        for a, b in combinations(sorted(set(numbers)), 2):
+            stats['pairs'][int(a)][int(b)] += count
+            stats['pairs'][int(b)][int(a)] += count
+        for digit in set(numbers):
+            if numbers.count(digit) > 1:
+                stats['pairs'][int(digit)][int(digit)] += count
+        key = sorted_key(numbers)
+        stats['classes'][key] = stats['classes'].get(key, 0) + count
+        if count > 0:
+            ordinal = draw_date.toordinal()
+            stats['last_seen'][int(numbers)] = max(stats['last_seen'][int(numbers)], ordinal)
+            if not stats['last_draw'] or draw_date.isoformat() > stats['last_draw']:
+                stats['last_draw'] = draw_date.isoformat()
+
+    def forget_last_seen(self, draw_date: date, numbers: str, draws: Iterable[Tuple[date, str, str]]):
+        """After a drawing of numbers on draw_date was taken out, find when it was last drawn among draws."""
+        if self.stats['last_seen'][int(numbers)] == draw_date.toordinal():
+            self.stats['last_seen'][int(numbers)] = max(
+                (when.toordinal() for when, _, drawn in draws if drawn == numbers), default=0)
+
+    def rebuild(self, draws: Iterable[Tuple[date, str, str]]):
+        """Recompute the aggregates from scratch, e.g. for a history recorded before they existed."""
+        self.stats = self._empty()
+        for draw_date, draw_time, numbers in draws:
+            self.record(draw_date, draw_time, numbers)
+        self.save()
+
+    @property
+    def draw_count(self) -> int:
+        return self.stats['draws']
+
+    def position_frequencies(self) -> List[List[int]]:
+        """Digit counts for each of the four positions."""
+        return self.stats['positions']
+
+    def pair_count(self, a: int, b: int) -> int:
+        """Number of drawings containing both digits."""
+        return self.stats['pairs'][a][b]
+
+    def class_count(self, numbers: str) -> int:
+        """Number of drawings with the same digits as `numbers` in any order."""
+        return self.stats['classes'].get(sorted_key(numbers), 0)
+
+    def days_since_seen(self, numbers: str, today: Optional[date] = None) -> Optional[int]:
+        """Days since `numbers` was last drawn exactly, or None if it never was."""
+        ordinal = self.stats['last_seen'][int(numbers)]
+        if not ordinal:
+            return None
+        return (today or date.today()).toordinal() - ordinal
+
+    def hot_digits(self, draw_time: str, count: int = 3) -> List[int]:
+        """Most frequently drawn digits for a drawing time."""
+        counts = self.stats['digits'].get(draw_time.lower(), [0] * 10)
+        return sorted(range(10), key=lambda d: (-counts[d], d))[:count]
+
+    def cold_digits(self, draw_time: str, count: int = 3) -> List[int]:
+        """Least frequently drawn digits for a drawing time."""
+        counts = self.stats['digits'].get(draw_time.lower(), [0] * 10)
+        return sorted(range(10), key=lambda d: (counts[d], d))[:count]
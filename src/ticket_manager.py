@@ -1,64 +1,215 @@
+import bisect
 import json
+import logging
 import os
-from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple, Any
-import pytz
+import zlib
+from datetime import datetime, date, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from .games import DEFAULT_GAME, get_game, ticket_game
 from .play_types import PlayType
+from . import codec
+from .metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+def shard_hash(ticket: Dict[str, Any]) -> int:
+    """Stable hash of a ticket's owner, the basis of shard_of."""
+    key = ticket.get('email') or ticket.get('id') or ''.join(ticket.get('numbers', []))
+    return zlib.crc32(key.lower().encode('utf-8'))
+
+def shard_of(ticket: Dict[str, Any], shard_count: int) -> int:
+    """
+    Stable shard number of a ticket, so every run assigns it to the same shard.
+    Keyed on the email address so each person's tickets are handled together.
+    """
+    return shard_hash(ticket) % shard_count
+
+def default_tickets_file() -> str:
+    """The ticket file named in config/config.json, or data/tickets.json."""
+    # Try to load from config
+    try:
+        with open('config/config.json', 'r') as f:
+            config = json.load(f)
+            return config['data_files']['tickets']
+    except Exception:
+        return "data/tickets.json"
+
+# Ticket IDs avoid look-alike characters (0/o, 1/i/l) since people type them into the CLI
+ID_ALPHABET = '23456789abcdefghjkmnpqrstuvwxyz'
+ID_LENGTH = 6
 
 class TicketManager:
     """Manages lottery tickets and their results."""
+
+    # Books at least this large are checked in worker processes (see src/parallel.py)
+    PARALLEL_THRESHOLD = 200000
+    # Expired tickets stay in the working set this long, for claim lookups, before they are archived
+    ARCHIVE_GRACE_DAYS = 30
     
-    def __init__(self, data_file: str = None):
+    def __init__(self, data_file: str = None, archive_file: str = None, compression: str = None):
         if data_file is None:
-            # Try to load from config
-            try:
-                with open('config/config.json', 'r') as f:
-                    config = json.load(f)
-                    data_file = config['data_files']['tickets']
-            except Exception:
-                data_file = "data/tickets.json"
+            data_file = default_tickets_file()
         
         # Ensure data directory exists
         os.makedirs(os.path.dirname(data_file), exist_ok=True)
         
         self.data_file = data_file
-        self.tickets = self._load_tickets()
+        # gzip/zstd for the ticket file, from data_files.compression in the config unless given
+        self.compression = compression or codec.configured_compression()
+        # Expired tickets, as gzip-compressed JSON lines next to the ticket file
+        self.archive_file = archive_file or os.path.join(os.path.dirname(data_file), 'tickets_archive.jsonl.gz')
+        # Optional binary copy for fast read-only queries (see src/snapshot.py); kept
+        # up to date on every save once it has been created
+        self.snapshot_file = os.path.splitext(data_file)[0] + '.snapshot'
+        self._loaded_mtime = None
+        self._load_error = None
+        self._encoded = None
+        self._indexes = None
+        # Bumped whenever the tickets are replaced or saved, so derived data (see src/precompute.py) can tell it is stale
+        self.version = 0
+        # The version the ticket file (and so a fresh snapshot of it) holds; other versions have unsaved changes
+        self._file_version = None
+        # Tickets by ID, in insertion order; self.tickets is a read-only view of it
+        self._tickets: Dict[str, Dict[str, Any]] = {}
+        self._ticket_view: Optional[Tuple[Dict[str, Any], ...]] = None
+        if self._set_tickets(self._load_tickets()):
+            # Persist the IDs given to tickets saved before tickets had IDs
+            self._save_tickets()
+        else:
+            self._file_version = self.version
+
+    @property
+    def tickets(self) -> Tuple[Dict[str, Any], ...]:
+        """
+        All tickets, in the order they were added, as a tuple: tickets are added
+        and removed through the methods below or by assigning a new list here,
+        which keep the ID index in step. Assigning doesn't write the ticket
+        file; _save_tickets() does that.
+        """
+        if self._ticket_view is None:
+            self._ticket_view = tuple(self._tickets.values())
+        return self._ticket_view
+
+    @tickets.setter
+    def tickets(self, tickets: List[Dict[str, Any]]):
+        self._set_tickets(tickets)
+
+    def _set_tickets(self, tickets: List[Dict[str, Any]]) -> int:
+        """Replace the tickets and rebuild the ID index. Returns how many tickets needed a new ID."""
+        self._tickets = {}
+        self._ticket_view = None
+        self._encoded = None
+        self._indexes = None
+        self.version += 1
+        assigned = 0
+        for ticket in tickets:
+            if not ticket.get('id') or ticket['id'] in self._tickets:
+                ticket['id'] = self._new_ticket_id()
+                assigned += 1
+            self._tickets[ticket['id']] = ticket
+        return assigned
+
+    def _new_ticket_id(self) -> str:
+        while True:
+            # os.urandom rather than secrets, which is slow to import; the slight modulo bias doesn't matter for IDs
+            ticket_id = ''.join(ID_ALPHABET[b % len(ID_ALPHABET)] for b in os.urandom(ID_LENGTH))
+            if ticket_id not in self._tickets:
+                return ticket_id
+
+    def _resolve_id(self, ticket_id: Union[str, int]) -> Optional[str]:
+        """Map a ticket ID, or the list index older callers pass, to an ID in the index."""
+        if isinstance(ticket_id, int):
+            return self.tickets[ticket_id]['id'] if 0 <= ticket_id < len(self._tickets) else None
+        ticket_id = ticket_id.strip().lower()
+        return ticket_id if ticket_id in self._tickets else None
         
+    def _file_mtime(self) -> Optional[float]:
+        try:
+            return os.path.getmtime(self.data_file)
+        except OSError:
+            return None
+
     def _load_tickets(self) -> List[Dict[str, Any]]:
-        """Load tickets from JSON file."""
-        if os.path.exists(self.data_file):
-            try:
-                with open(self.data_file, 'r') as f:
-                    return json.load(f)
-            except Exception:
-                return []
-        return []
+        """
+        Load tickets from JSON file. Only a missing or empty file is an empty
+        book; one that can't be decoded raises codec.CodecError rather than
+        being replaced by the next save.
+        """
+        self._loaded_mtime = self._file_mtime()
+        self._encoded = None
+        self._indexes = None
+        if self._loaded_mtime is None or os.path.getsize(self.data_file) == 0:
+            return []
+        with metrics.span('tickets.load'):
+            tickets = codec.load_file(self.data_file)
+        if not isinstance(tickets, list):
+            raise codec.CodecError(f"Can't read {self.data_file}: expected a list of tickets")
+        return tickets
         
     def _save_tickets(self):
         """Save tickets to JSON file."""
+        if self._load_error is not None:
+            raise codec.CodecError(f"Not saving tickets over {self.data_file}, which could not be read: "
+                                   f"{self._load_error}")
+        self._encoded = None
+        self._indexes = None
+        self.version += 1
         try:
-            with open(self.data_file, 'w') as f:
-                json.dump(self.tickets, f, indent=2)
+            with metrics.span('tickets.save'):
+                codec.dump_file(self.data_file, self.tickets, self.compression)
+            self._loaded_mtime = self._file_mtime()
+            self._file_version = self.version
         except Exception:
-            pass
+            return
+        if os.path.exists(self.snapshot_file):
+            try:
+                self.write_snapshot()
+            except Exception:
+                # A stale snapshot is ignored by readers, so the JSON save still stands
+                pass
 
-    def _validate_numbers(self, numbers: List[str]) -> bool:
-        """Validate ticket numbers."""
-        if len(numbers) != 4:
+    def write_snapshot(self):
+        """Write the binary snapshot of the current tickets next to the ticket file."""
+        from .snapshot import write_snapshot
+
+        with metrics.span('tickets.snapshot'):
+            write_snapshot(self.snapshot_file, self.tickets, self.data_file)
+
+    def reload_if_changed(self) -> bool:
+        """Reload tickets if another process (e.g. the CLI) changed the file since they were loaded."""
+        if self._file_mtime() == self._loaded_mtime:
             return False
-        return all(n.isdigit() and 0 <= int(n) <= 9 for n in numbers)
+        try:
+            tickets = self._load_tickets()
+        except codec.CodecError as e:
+            # Keep checking the tickets already loaded, but never save them over the unreadable file
+            self._load_error = e
+            logger.error(str(e))
+            return False
+        self._load_error = None
+        if self._set_tickets(tickets):
+            self._save_tickets()
+        else:
+            self._file_version = self.version
+        return True
+
+    def _validate_numbers(self, numbers: List[str], game: str = DEFAULT_GAME) -> bool:
+        """Validate ticket numbers for the game (Cash 4 by default)."""
+        game = get_game(game)
+        return game is not None and game.valid_numbers(numbers)
             
     def add_ticket(self, numbers: List[str], play_type: str, draw_time: str, 
-                  start_date: date, end_date: date, email: str) -> bool:
-        """Add a new ticket."""
+                  start_date: date, end_date: date, email: str, game: str = DEFAULT_GAME) -> Optional[str]:
+        """Add a new ticket. Returns its ID, or None if a field is missing."""
         if not numbers or not play_type or not draw_time or not start_date or not end_date or not email:
-            return False
+            return None
             
         # Ensure numbers are stored as a list
         if isinstance(numbers, str):
             numbers = list(numbers)
             
         ticket = {
+            'id': self._new_ticket_id(),
             'numbers': numbers,
             'play_type': play_type,
             'draw_time': draw_time,
@@ -67,51 +218,222 @@ class TicketManager:
             'email': email,
             'created_at': date.today().isoformat()
         }
+        # Cash 4 tickets are stored without a game, as they were before other games
+        if game.lower() != DEFAULT_GAME:
+            ticket['game'] = game.lower()
         
-        self.tickets.append(ticket)
+        self._tickets[ticket['id']] = ticket
+        self._ticket_view = None
         self._save_tickets()
-        return True
+        return ticket['id']
+
+    def add_tickets(self, tickets: Iterable[Dict[str, Any]]) -> List[str]:
+        """
+        Add already-validated ticket dicts (numbers, play_type, draw_time, ISO
+        start_date/end_date, email) with a single save. Returns their new IDs.
+        """
+        today = date.today().isoformat()
+        ids = []
+        for ticket in tickets:
+            ticket = dict(ticket, id=self._new_ticket_id())
+            ticket.setdefault('created_at', today)
+            self._tickets[ticket['id']] = ticket
+            ids.append(ticket['id'])
+        if ids:
+            self._ticket_view = None
+            self._save_tickets()
+        return ids
+
+    def get_ticket(self, ticket_id: str) -> Optional[Dict[str, Any]]:
+        """Get a ticket by ID."""
+        resolved = self._resolve_id(ticket_id)
+        return self._tickets[resolved] if resolved else None
         
-    def remove_ticket(self, ticket_index: int) -> bool:
-        """Remove a ticket by index."""
-        if 0 <= ticket_index < len(self.tickets):
-            self.tickets.pop(ticket_index)
+    def remove_ticket(self, ticket_id: Union[str, int]) -> bool:
+        """Remove a ticket by ID (or list index)."""
+        resolved = self._resolve_id(ticket_id)
+        if resolved:
+            del self._tickets[resolved]
+            self._ticket_view = None
             self._save_tickets()
             return True
         return False
         
     def get_tickets(self) -> List[Dict[str, Any]]:
-        """Get all tickets."""
-        return self.tickets
+        """Get all tickets, as a new list."""
+        return list(self.tickets)
+
+    def iter_tickets(self) -> Iterator[Dict[str, Any]]:
+        """Iterate over all tickets without building a list. Don't add or remove tickets meanwhile."""
+        return iter(self._tickets.values())
         
     def list_tickets(self) -> List[Dict[str, Any]]:
         """Alias for get_tickets to maintain CLI compatibility."""
         return self.get_tickets()
         
+    # How each lookup index keys a ticket
+    INDEX_KEYS = {
+        'email': lambda t: t.get('email', '').lower(),
+        'draw_time': lambda t: t.get('draw_time', '').upper(),
+        'play_type': lambda t: t.get('play_type', ''),
+        'numbers': lambda t: ''.join(t['numbers']),
+    }
+
+    def _get_index(self, name: str):
+        """
+        A lookup index, built on first use and dropped whenever the tickets change.
+        INDEX_KEYS indexes map a key to ticket IDs; 'end_date' is (end_date, ID)
+        pairs sorted by end date and 'position' maps each ID to its place in the book.
+        They live in memory, so they pay off in long-running processes like the
+        daemon; one-shot CLI queries are served from the snapshot instead.
+        """
+        if self._indexes is None:
+            self._indexes = {}
+        if name not in self._indexes:
+            if name == 'end_date':
+                index = sorted((t['end_date'][:10], t['id']) for t in self.tickets)
+            elif name == 'position':
+                index = {ticket_id: i for i, ticket_id in enumerate(self._tickets)}
+            else:
+                index = {}
+                key = self.INDEX_KEYS[name]
+                for ticket in self.tickets:
+                    index.setdefault(key(ticket), []).append(ticket['id'])
+            self._indexes[name] = index
+        return self._indexes[name]
+
+    def query_tickets(self, email: str = None, draw_time: str = None, play_type: str = None, numbers: str = None,
+                      active_on: date = None, expiring_within: int = None, today: date = None,
+                      offset: int = 0, limit: int = None) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Find tickets matching all of the given filters, in the order they were added.
+        expiring_within=N matches tickets ending between today and N days from today.
+        Returns the total number of matches and the requested page of them.
+        """
+        candidates = None
+        for field, key in (('email', email and email.lower()), ('draw_time', draw_time and draw_time.upper()),
+                           ('play_type', play_type and play_type.lower()), ('numbers', numbers)):
+            if key is not None:
+                ids = set(self._get_index(field).get(key, ()))
+                candidates = ids if candidates is None else candidates & ids
+
+        # Tickets ending within [low, high], found by bisecting the end-date index
+        low = high = None
+        if active_on is not None:
+            low = active_on.isoformat()
+        if expiring_within is not None:
+            today = today or date.today()
+            low = max(low or '', today.isoformat())
+            high = (today + timedelta(days=expiring_within)).isoformat()
+        if low is not None:
+            end_dates = self._get_index('end_date')
+            start = bisect.bisect_left(end_dates, (low, ''))
+            stop = bisect.bisect_right(end_dates, (high, '\uffff')) if high else len(end_dates)
+            ids = {ticket_id for _, ticket_id in end_dates[start:stop]}
+            candidates = ids if candidates is None else candidates & ids
+
+        if candidates is None:
+            matches = self.tickets
+        else:
+            position = self._get_index('position')
+            matches = [self._tickets[ticket_id] for ticket_id in sorted(candidates, key=position.__getitem__)]
+        if active_on is not None:
+            matches = [t for t in matches if t['start_date'][:10] <= active_on.isoformat()]
+        end = None if limit is None else offset + limit
+        return len(matches), list(matches[offset:end])
+
     def get_tickets_for_drawing(self, drawing_date: date) -> List[Dict[str, Any]]:
         """Get tickets that are valid for a specific drawing date."""
-        return [
-            t for t in self.tickets
-            if datetime.fromisoformat(t['start_date']).date() <= drawing_date <= datetime.fromisoformat(t['end_date']).date()
-        ]
+        return list(self.iter_tickets_for_drawing(drawing_date))
+
+    def iter_tickets_for_drawing(self, drawing_date: date) -> Iterator[Dict[str, Any]]:
+        """Generator form of get_tickets_for_drawing."""
+        for t in self.iter_tickets():
+            if datetime.fromisoformat(t['start_date']).date() <= drawing_date <= datetime.fromisoformat(t['end_date']).date():
+                yield t
         
-    def get_active_tickets(self) -> List[Dict[str, Any]]:
-        """Get all active tickets."""
-        today = date.today()
-        return [
-            t for t in self.tickets
-            if datetime.fromisoformat(t['start_date']).date() <= today <= datetime.fromisoformat(t['end_date']).date()
-        ]
+    def get_active_tickets(self, shard: Optional[Tuple[int, int]] = None, today: date = None) -> List[Dict[str, Any]]:
+        """Get all tickets active today (default: the host's date), optionally only those in shard (index, count)."""
+        return list(self.iter_active_tickets(shard, today))
+
+    def iter_active_tickets(self, shard: Optional[Tuple[int, int]] = None, today: date = None) -> Iterator[Dict[str, Any]]:
+        """Generator form of get_active_tickets."""
+        today = today or date.today()
+        for t in self.iter_tickets():
+            if (datetime.fromisoformat(t['start_date']).date() <= today <= datetime.fromisoformat(t['end_date']).date()
+                    and (shard is None or shard_of(t, shard[1]) == shard[0])):
+                yield t
         
-    def update_ticket_dates(self, ticket_index: int, start_date: date, end_date: date) -> bool:
-        """Update the dates of a ticket."""
-        if 0 <= ticket_index < len(self.tickets):
-            self.tickets[ticket_index]['start_date'] = start_date.isoformat()
-            self.tickets[ticket_index]['end_date'] = end_date.isoformat()
+    def get_expiring_tickets(self, within_days: int, today: date = None,
+                             shard: Optional[Tuple[int, int]] = None) -> List[Dict[str, Any]]:
+        """Active tickets ending within within_days of today, from the end-date index."""
+        today = today or date.today()
+        _, tickets = self.query_tickets(active_on=today, expiring_within=within_days, today=today)
+        if shard is not None:
+            tickets = [t for t in tickets if shard_of(t, shard[1]) == shard[0]]
+        return tickets
+        
+    def update_ticket_dates(self, ticket_id: Union[str, int], start_date: date, end_date: date) -> bool:
+        """Update the dates of a ticket, by ID (or list index)."""
+        resolved = self._resolve_id(ticket_id)
+        if resolved:
+            self._tickets[resolved]['start_date'] = start_date.isoformat()
+            self._tickets[resolved]['end_date'] = end_date.isoformat()
             self._save_tickets()
             return True
         return False
         
+    def archive_expired(self, today: date = None, grace_days: int = None) -> int:
+        """
+        Move tickets whose end_date is more than grace_days (default ARCHIVE_GRACE_DAYS)
+        before today into the archive file. Returns the number of tickets archived.
+        """
+        today = today or date.today()
+        cutoff = today - timedelta(days=self.ARCHIVE_GRACE_DAYS if grace_days is None else grace_days)
+        expired = [
+            t for t in self.tickets
+            if datetime.fromisoformat(t['end_date']).date() < cutoff
+        ]
+        if not expired:
+            return 0
+
+        import gzip
+
+        # Append to the archive before dropping the tickets, so a failure can't lose them
+        with metrics.span('tickets.archive'):
+            with gzip.open(self.archive_file, 'at', encoding='utf-8') as f:
+                for ticket in expired:
+                    f.write(json.dumps(dict(ticket, archived_at=today.isoformat())) + '\n')
+            for ticket in expired:
+                del self._tickets[ticket['id']]
+            self._ticket_view = None
+            self._save_tickets()
+        metrics.incr('tickets_archived', len(expired))
+        return len(expired)
+
+    def iter_archived_tickets(self) -> Iterator[Dict[str, Any]]:
+        """Yield every archived ticket, oldest archive run first."""
+        import gzip
+
+        if not os.path.exists(self.archive_file):
+            return
+        with gzip.open(self.archive_file, 'rt', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def find_archived_tickets(self, ticket_id: str = None, email: str = None,
+                              numbers: str = None) -> List[Dict[str, Any]]:
+        """Archived tickets matching all of the given ID, email and numbers."""
+        ticket_id = ticket_id.lower() if ticket_id else None
+        email = email.lower() if email else None
+        return [
+            t for t in self.iter_archived_tickets()
+            if (ticket_id is None or t.get('id') == ticket_id)
+            and (email is None or t.get('email', '').lower() == email)
+            and (numbers is None or ''.join(t['numbers']) == numbers)
+        ]
+
     def check_ticket(self, ticket: Dict[str, Any], winning_numbers: str) -> Tuple[bool, float]:
         """Check if a ticket is a winner and calculate prize."""
         if not ticket or not winning_numbers:
@@ -121,7 +443,7 @@ class TicketManager:
         play_type = ticket['play_type']
         
         # Create play type instance
-        play = PlayType.create(play_type, ''.join(numbers))
+        play = PlayType.create(play_type, ''.join(numbers), ticket_game(ticket))
         if not play:
             return False, 0.0
             
@@ -129,25 +451,138 @@ class TicketManager:
         is_winner, prize = play.calculate_prize(numbers, list(winning_numbers))
         return is_winner, prize
 
-    def check_winning_numbers(self, winning_numbers: str, draw_time: str):
+    def check_winning_numbers(self, winning_numbers: str, draw_time: str, shard: Optional[Tuple[int, int]] = None,
+                              workers: Optional[int] = None, game: str = DEFAULT_GAME, draw_date: date = None):
         """
-        Check all tickets for the given draw_time against the winning numbers.
+        Check the tickets for the given game and draw_time that are active on
+        draw_date (default: the host's date) against the winning numbers.
+        With shard=(index, count), only tickets in that shard are checked.
+        workers sets the number of processes; by default books of PARALLEL_THRESHOLD
+        tickets or more use one per CPU and smaller books are checked in-process.
         Returns a list of dicts with ticket, is_winner, prize_amount, and winning_numbers.
         """
-        results = []
-        for ticket in self.tickets:
-            # Only check tickets for the specified draw time and if ticket is active
-            if ticket.get('draw_time', '').upper() == draw_time.upper():
-                # Check if ticket is active (valid for today)
-                today = date.today()
-                start = datetime.fromisoformat(ticket['start_date']).date()
-                end = datetime.fromisoformat(ticket['end_date']).date()
-                if start <= today <= end:
-                    is_winner, prize = self.check_ticket(ticket, winning_numbers)
-                    results.append({
-                        'ticket': ticket,
-                        'is_winner': is_winner,
-                        'prize_amount': prize,
-                        'winning_numbers': list(winning_numbers)
-                    })
-        return results 
\ No newline at end of file
+        return list(self.iter_winning_numbers(winning_numbers, draw_time, shard=shard, workers=workers, game=game,
+                                              draw_date=draw_date))
+
+    def iter_winning_numbers(self, winning_numbers: str, draw_time: str, shard: Optional[Tuple[int, int]] = None,
+                             workers: Optional[int] = None, game: str = DEFAULT_GAME,
+                             draw_date: date = None) -> Iterator[Dict[str, Any]]:
+        """
+        Generator form of check_winning_numbers: each result is yielded as soon as
+        its ticket is checked, so callers can act on it without holding them all.
+        Every result shares one winning_numbers list; don't modify it. Don't add
+        or remove tickets until the generator is exhausted or closed.
+        """
+        if workers is None:
+            workers = (os.cpu_count() or 1) if len(self._tickets) >= self.PARALLEL_THRESHOLD else 1
+        game = game.lower()
+        draw_date = draw_date or date.today()
+        results = None
+        # Worker processes and the snapshot only hold Cash 4 tickets
+        if workers > 1 and game == DEFAULT_GAME:
+            results = self._check_winning_numbers_parallel(winning_numbers, draw_time, draw_date, shard, workers)
+        elif game == DEFAULT_GAME:
+            results = self._check_winning_numbers_snapshot(winning_numbers, draw_time, draw_date, shard)
+        if results is None:
+            results = self._check_winning_numbers_serial(winning_numbers, draw_time, draw_date, shard, game)
+        metrics.incr('tickets_scanned', len(self._tickets))
+        checked = 0
+        try:
+            for result in results:
+                checked += 1
+                yield result
+        finally:
+            metrics.incr('tickets_checked', checked)
+
+    def _check_winning_numbers_serial(self, winning_numbers: str, draw_time: str, draw_date: date,
+                                      shard: Optional[Tuple[int, int]],
+                                      game: str = DEFAULT_GAME) -> Iterator[Dict[str, Any]]:
+        winning = list(winning_numbers)
+        draw_time = draw_time.upper()
+        today = draw_date.isoformat()
+        # Tickets with the same play and numbers share one PlayType
+        plays = {}
+        for ticket in self.iter_tickets():
+            # Only check tickets for the specified game and draw time and if ticket is active
+            if ticket.get('draw_time', '').upper() != draw_time or ticket_game(ticket) != game:
+                continue
+            if shard is not None and shard_of(ticket, shard[1]) != shard[0]:
+                continue
+            # Check if ticket is active (valid on the drawing's date)
+            if not ticket['start_date'][:10] <= today <= ticket['end_date'][:10]:
+                continue
+            numbers = ticket['numbers']
+            key = (ticket['play_type'], ''.join(numbers))
+            if key not in plays:
+                plays[key] = PlayType.create(*key, game)
+            play = plays[key]
+            is_winner, prize = play.calculate_prize(numbers, winning) if play else (False, 0.0)
+            yield {
+                'ticket': ticket,
+                'is_winner': is_winner,
+                'prize_amount': prize,
+                'winning_numbers': winning
+            }
+
+    def _check_winning_numbers_snapshot(self, winning_numbers: str, draw_time: str, draw_date: date,
+                                        shard: Optional[Tuple[int, int]]) -> Optional[Iterator[Dict[str, Any]]]:
+        """
+        Check tickets from the snapshot's columns, skipping the date parsing of
+        every ticket dict. Returns None unless the snapshot is fresh and holds
+        exactly the tickets in memory.
+        """
+        from .snapshot import TicketSnapshot
+
+        if self._file_version != self.version:
+            return None
+        snapshot = TicketSnapshot.open_if_fresh(self.snapshot_file, self.data_file)
+        if snapshot is None:
+            return None
+        with snapshot:
+            if len(snapshot) != len(self._tickets):
+                return None
+            with metrics.span('tickets.snapshot_evaluate'):
+                checked = snapshot.evaluate(winning_numbers, draw_time, draw_date)
+        tickets = self.tickets
+        winning = list(winning_numbers)
+        return (
+            {
+                'ticket': tickets[index],
+                'is_winner': is_winner,
+                'prize_amount': prize,
+                'winning_numbers': winning
+            }
+            for index, is_winner, prize in checked
+            if shard is None or shard_of(tickets[index], shard[1]) == shard[0]
+        )
+
+    def _check_winning_numbers_parallel(self, winning_numbers: str, draw_time: str, draw_date: date,
+                                        shard: Optional[Tuple[int, int]], workers: int):
+        """Check tickets in worker processes. Returns None if the book can't be encoded for them."""
+        from .parallel import DRAW_TIME_CODES, encode_tickets, evaluate_parallel
+
+        if draw_time.upper() not in DRAW_TIME_CODES:
+            return None
+        # The encoding is reused for every drawing until the tickets change
+        if self._encoded is None or self._encoded[0] != len(self.tickets):
+            try:
+                with metrics.span('tickets.encode'):
+                    self._encoded = (len(self.tickets), encode_tickets(self.tickets, shard_hash))
+            except (KeyError, TypeError, ValueError):
+                self._encoded = (len(self.tickets), None)
+        if self._encoded[1] is None:
+            return None
+
+        checked = evaluate_parallel(self._encoded[1], len(self.tickets), winning_numbers, draw_time,
+                                    draw_date.toordinal(), shard, workers)
+        tickets = self.tickets
+        winning = list(winning_numbers)
+        return (
+            {
+                'ticket': tickets[index],
+                'is_winner': is_winner,
+                'prize_amount': prize,
+                'winning_numbers': winning
+            }
+            for index, is_winner, prize in checked
+        )
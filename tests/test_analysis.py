@@ -0,0 +1,50 @@
+import unittest
+from src.analysis import analyze_draw, analyze_portfolio
+from src.play_types import PlayType
+
+def ticket(numbers, play_type, draw_time='MIDDAY'):
+    return {'numbers': list(numbers), 'play_type': play_type, 'draw_time': draw_time}
+
+class TestAnalysis(unittest.TestCase):
+    def brute_force(self, tickets):
+        """Reference: evaluate every ticket against every outcome."""
+        payouts = []
+        for n in range(10000):
+            winning = list(f"{n:04d}")
+            total = 0.0
+            for t in tickets:
+                is_winner, prize = PlayType.create(t['play_type'], ''.join(t['numbers'])).calculate_prize(t['numbers'], winning)
+                if is_winner:
+                    total += prize
+            payouts.append(total)
+        return payouts
+
+    def test_straight(self):
+        result = analyze_draw([ticket('1234', 'straight')])
+        self.assertAlmostEqual(result['expected_value'], 0.5)
+        self.assertAlmostEqual(result['hit_probability'], 0.0001)
+        self.assertAlmostEqual(result['variance'], 5000.0 ** 2 / 10000 - 0.25)
+        self.assertEqual(result['wagered'], 1.0)
+
+    def test_matches_brute_force(self):
+        tickets = [
+            ticket('1234', 'straight'), ticket('1234', 'box'), ticket('1123', 'straightbox'),
+            ticket('1122', 'combo'), ticket('0919', 'oneoff'), ticket('1234', 'box'),
+        ]
+        payouts = self.brute_force(tickets)
+        expected = sum(payouts) / 10000
+        result = analyze_draw(tickets)
+        self.assertAlmostEqual(result['expected_value'], expected)
+        self.assertAlmostEqual(result['variance'], sum(p * p for p in payouts) / 10000 - expected ** 2)
+        self.assertAlmostEqual(result['hit_probability'], sum(1 for p in payouts if p) / 10000)
+        self.assertAlmostEqual(result['hit_probability_by_play_type']['combo'], 6 / 10000)
+        self.assertEqual(result['wagered'], 1 + 1 + 1 + 6 + 1 + 1)
+
+    def test_portfolio_combines_draws(self):
+        report = analyze_portfolio([ticket('1234', 'straight', 'MIDDAY'), ticket('1234', 'straight', 'NIGHT')])
+        self.assertEqual(set(report['draws']), {'MIDDAY', 'NIGHT'})
+        self.assertAlmostEqual(report['expected_value'], 1.0)
+        self.assertAlmostEqual(report['hit_probability'], 1 - 0.9999 ** 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.ticket_manager import TicketManager
+
+class TestArchive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'tickets.json')
+        self.ticket_manager = TicketManager(self.data_file)
+        self.today = date(2025, 6, 30)
+        self.ids = {}
+        # Ended 60, 31, 30 and 0 days ago, and still running
+        for label, days_ago in (('old', 60), ('past_grace', 31), ('in_grace', 30), ('today', 0), ('active', -5)):
+            end = self.today - timedelta(days=days_ago)
+            self.ids[label] = self.ticket_manager.add_ticket(list('1234'), 'straight', 'MIDDAY', end - timedelta(days=7),
+                                                             end, f"{label}@gmail.com")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_archives_tickets_past_grace_period(self):
+        self.assertEqual(self.ticket_manager.archive_expired(self.today), 2)
+        remaining = {t['id'] for t in TicketManager(self.data_file).get_tickets()}
+        self.assertEqual(remaining, {self.ids['in_grace'], self.ids['today'], self.ids['active']})
+        self.assertEqual(self.ticket_manager.archive_expired(self.today), 0)
+
+        archived = self.ticket_manager.find_archived_tickets(email='OLD@gmail.com')
+        self.assertEqual([t['id'] for t in archived], [self.ids['old']])
+        self.assertEqual(archived[0]['archived_at'], '2025-06-30')
+
+    def test_later_runs_append_to_archive(self):
+        self.ticket_manager.archive_expired(self.today)
+        self.ticket_manager.archive_expired(self.today, grace_days=0)
+        archived = {t['id'] for t in self.ticket_manager.iter_archived_tickets()}
+        self.assertEqual(archived, {self.ids['old'], self.ids['past_grace'], self.ids['in_grace']})
+        self.assertEqual(len(self.ticket_manager.find_archived_tickets(ticket_id=self.ids['in_grace'], numbers='1234')), 1)
+        self.assertEqual(self.ticket_manager.find_archived_tickets(numbers='4321'), [])
+
+if __name__ == '__main__':
+    unittest.main()
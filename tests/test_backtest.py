@@ -0,0 +1,72 @@
+import os
+import random
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.backtest import backtest
+from src.history import ResultsHistory
+from src.play_types import PlayType
+
+class TestBacktest(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        start = date(2024, 1, 1)
+        self.draws = [
+            (start + timedelta(days=d), draw_time, f"{rng.randrange(10000):04d}")
+            for d in range(60) for draw_time in ('midday', 'evening', 'night')
+        ]
+        # Make sure some tickets hit
+        self.draws[4] = (self.draws[4][0], self.draws[4][1], '4321')
+        self.draws[10] = (self.draws[10][0], self.draws[10][1], '1234')
+        self.tickets = [
+            {'numbers': list('1234'), 'play_type': play_type, 'draw_time': draw_time,
+             'start_date': '2024-01-02', 'end_date': '2024-02-10'}
+            for play_type in ('straight', 'box', 'straightbox', 'combo', 'oneoff')
+            for draw_time in ('MIDDAY', 'EVENING', 'NIGHT')
+        ]
+
+    def test_matches_ticket_by_ticket_replay(self):
+        report = backtest(self.tickets, self.draws)
+        wagered = won = 0.0
+        for ticket in self.tickets:
+            play = PlayType.create(ticket['play_type'], ''.join(ticket['numbers']))
+            for draw_date, draw_time, numbers in self.draws:
+                if draw_time != ticket['draw_time'].lower():
+                    continue
+                if not date(2024, 1, 2) <= draw_date <= date(2024, 2, 10):
+                    continue
+                wagered += play.wager
+                is_winner, prize = play.calculate_prize(ticket['numbers'], list(numbers))
+                if is_winner:
+                    won += prize
+        self.assertAlmostEqual(report['wagered'], wagered)
+        self.assertAlmostEqual(report['won'], won)
+        self.assertGreater(report['won'], 0)
+        self.assertEqual(report['play_types']['box']['hits'], 2)
+        self.assertEqual(report['play_types']['straight']['hits'], 1)
+
+    def test_streaks(self):
+        tickets = [{'numbers': list('1234'), 'play_type': 'box', 'draw_time': 'MIDDAY'}]
+        draws = [(date(2024, 1, d), 'midday', n) for d, n in
+                 enumerate(['0000', '1234', '4321', '0000', '0000', '0000', '2143'], start=1)]
+        summary = backtest(tickets, draws, respect_dates=False)['play_types']['box']
+        self.assertEqual(summary['draws_played'], 7)
+        self.assertEqual(summary['draws_hit'], 3)
+        self.assertEqual(summary['longest_hit_streak'], 2)
+        self.assertEqual(summary['longest_drought'], 3)
+        self.assertEqual(summary['current_drought'], 0)
+
+    def test_history_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            history = ResultsHistory(os.path.join(tmp, 'history.json'))
+            added = history.add_results({'night': ('4177', '06/16/2025'), 'midday': ('1234', '06/16/2025')})
+            self.assertEqual(added, 2)
+            self.assertEqual(history.add_results({'night': ('4177', '06/16/2025')}), 0)
+            reloaded = ResultsHistory(os.path.join(tmp, 'history.json'))
+            self.assertEqual(reloaded.get_draws(), [
+                (date(2025, 6, 16), 'midday', '1234'),
+                (date(2025, 6, 16), 'night', '4177'),
+            ])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+from unittest import mock
+from src import codec
+from src.ticket_manager import TicketManager
+
+class TestCodec(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'tickets.json')
+        self.tickets = [
+            {'id': f'abc{i:03d}', 'numbers': list(f"{i:04d}"), 'play_type': 'box', 'draw_time': 'NIGHT',
+             'start_date': '2025-06-01', 'end_date': '2025-06-30', 'email': 'josé@gmail.com', 'created_at': '2025-06-01'}
+            for i in range(20)
+        ]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_reads_indented_files_and_writes_compact(self):
+        with open(self.data_file, 'w') as f:
+            json.dump(self.tickets, f, indent=2)
+        ticket_manager = TicketManager(self.data_file)
+        self.assertEqual(ticket_manager.get_tickets(), self.tickets)
+
+        ticket_manager.add_ticket(list('1234'), 'straight', 'MIDDAY', date(2025, 6, 1), date(2025, 6, 2), 'a@gmail.com')
+        with open(self.data_file, 'rb') as f:
+            data = f.read()
+        self.assertNotIn(b'\n', data)
+        self.assertEqual(json.loads(data), ticket_manager.get_tickets())
+
+    def test_compressed_round_trip(self):
+        for compression, magic in (('gzip', codec.GZIP_MAGIC), (None, b'[')):
+            TicketManager(self.data_file, compression=compression).add_tickets(self.tickets)
+            with open(self.data_file, 'rb') as f:
+                self.assertEqual(f.read(len(magic)), magic)
+            self.assertEqual(len(TicketManager(self.data_file).get_tickets()), 20)
+            os.remove(self.data_file)
+
+    def test_unreadable_file_is_not_an_empty_book(self):
+        # zstd data is unreadable whether zstandard is missing or the frame is corrupt
+        for data in (codec.ZSTD_MAGIC + b'garbage', codec.GZIP_MAGIC + b'garbage', b'[{"id": '):
+            with open(self.data_file, 'wb') as f:
+                f.write(data)
+            with self.assertRaises(codec.CodecError):
+                TicketManager(self.data_file)
+        os.remove(self.data_file)
+        self.assertEqual(TicketManager(self.data_file).get_tickets(), [])
+
+    def test_no_save_over_file_that_fails_to_reload(self):
+        ticket_manager = TicketManager(self.data_file)
+        ticket_manager.add_tickets(self.tickets)
+        with open(self.data_file, 'wb') as f:
+            f.write(codec.GZIP_MAGIC + b'garbage')
+        os.utime(self.data_file, (0, 0))
+        with self.assertLogs('src.ticket_manager', 'ERROR'):
+            self.assertFalse(ticket_manager.reload_if_changed())
+        self.assertEqual(len(ticket_manager.get_tickets()), 20)
+        with self.assertRaises(codec.CodecError):
+            ticket_manager.add_ticket(list('1234'), 'straight', 'MIDDAY', date(2025, 6, 1), date(2025, 6, 2),
+                                      'a@gmail.com')
+        with open(self.data_file, 'rb') as f:
+            self.assertEqual(f.read(), codec.GZIP_MAGIC + b'garbage')
+
+    def test_stdlib_fallback_matches(self):
+        fast = codec.dumps(self.tickets, sort_keys=True)
+        with mock.patch.object(codec, '_backend', 'json'), mock.patch.object(codec, '_library', json):
+            self.assertEqual(codec.loads(fast), self.tickets)
+            self.assertEqual(json.loads(codec.dumps(self.tickets, sort_keys=True)), json.loads(fast))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from itertools import permutations
+from src.play_types import PlayType, Combo, permutation_count, sorted_key
+
+class TestCombo(unittest.TestCase):
+    def test_permutation_classes(self):
+        self.assertEqual(permutation_count('1111'), 1)
+        self.assertEqual(permutation_count('1112'), 4)
+        self.assertEqual(permutation_count('1122'), 6)
+        self.assertEqual(permutation_count('1123'), 12)
+        self.assertEqual(permutation_count('1234'), 24)
+        self.assertEqual(sorted_key('4121'), '1124')
+
+    def test_wager_scales_with_ways(self):
+        self.assertEqual(Combo('1234').wager, 24.0)
+        self.assertEqual(Combo('1122').wager, 6.0)
+        self.assertEqual(PlayType.create('straight', '1234').wager, 1.0)
+
+    def test_every_permutation_wins(self):
+        combo = Combo('1123')
+        ticket = list('1123')
+        winners = {''.join(p) for p in permutations(ticket)}
+        self.assertEqual(len(winners), 12)
+        for n in range(10000):
+            winning = list(f"{n:04d}")
+            is_winner, prize = combo.calculate_prize(ticket, winning)
+            self.assertEqual(is_winner, ''.join(winning) in winners)
+            self.assertEqual(prize, 5000.0 if is_winner else 0.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import unittest
+from datetime import date
+import schedule
+from src.daemon import DrawWatcher, schedule_drawings
+
+class FakeScraper:
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get_winning_numbers(self, refresh=False):
+        self.calls += 1
+        return self.responses.pop(0) if self.responses else {}
+
+class FakeTicketManager:
+    def __init__(self):
+        self.checked = []
+        self.draw_dates = []
+
+    def reload_if_changed(self):
+        return False
+
+    def iter_winning_numbers(self, winning_numbers, draw_time, shard=None, workers=None, draw_date=None):
+        self.checked.append((winning_numbers, draw_time))
+        self.draw_dates.append(draw_date)
+        return iter([])
+
+class TestDrawWatcher(unittest.TestCase):
+    def make_watcher(self, responses, **kwargs):
+        self.sleeps = []
+        self.scraper = FakeScraper(responses)
+        self.ticket_manager = FakeTicketManager()
+        watcher = DrawWatcher(self.scraper, self.ticket_manager, None, initial_delay=30,
+                              max_delay=100, sleep=self.sleeps.append, **kwargs)
+        watcher.today = lambda: '06/17/2025'
+        return watcher
+
+    def test_polls_with_backoff_until_posted(self):
+        stale = {'midday': ('1111', '06/16/2025')}
+        posted = {'midday': ('1234', '06/17/2025')}
+        watcher = self.make_watcher([stale, stale, stale, stale, posted])
+        self.assertTrue(watcher.check('MIDDAY'))
+        self.assertEqual(self.sleeps, [30, 60, 100, 100])
+        self.assertEqual(self.ticket_manager.checked, [('1234', 'MIDDAY')])
+        # Tickets are matched against the drawing's Eastern date, not the host's
+        self.assertEqual(self.ticket_manager.draw_dates, [date(2025, 6, 17)])
+
+        # The same drawing is not processed twice
+        self.assertFalse(watcher.check('MIDDAY'))
+        self.assertEqual(len(self.ticket_manager.checked), 1)
+
+    def test_gives_up_after_max_wait(self):
+        watcher = self.make_watcher([], max_wait=90)
+        self.assertFalse(watcher.check('NIGHT'))
+        self.assertEqual(self.sleeps, [30, 60])
+        self.assertEqual(self.ticket_manager.checked, [])
+
+    def test_schedules_each_drawing(self):
+        scheduler = schedule_drawings(self.make_watcher([]), offset_minutes=3, scheduler=schedule.Scheduler())
+        times = sorted(str(job.at_time) for job in scheduler.get_jobs() if job.job_func.func.__name__ == 'check')
+        self.assertEqual(times, ['12:32:00', '19:02:00', '23:37:00'])
+        times = sorted(str(job.at_time) for job in scheduler.get_jobs() if job.job_func.func.__name__ == 'prepare')
+        self.assertEqual(times, ['12:14:00', '18:44:00', '23:19:00'])
+
+if __name__ == '__main__':
+    unittest.main()
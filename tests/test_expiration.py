@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.email_notifier import EmailNotifier
+from src.expiration import ExpirationNotices
+from src.ticket_manager import TicketManager
+
+class TestExpirationNotices(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        self.notices_file = os.path.join(self.tmp.name, 'notices.json')
+        self.start = date(2025, 6, 1)
+        self.end = date(2025, 6, 20)
+        for numbers, email in (('1111', 'a@gmail.com'), ('2222', 'A@gmail.com'), ('3333', 'b@gmail.com')):
+            self.ticket_manager.add_ticket(list(numbers), 'straight', 'MIDDAY', self.start, self.end, email)
+        self.ticket_manager.add_ticket(list('4444'), 'straight', 'MIDDAY', self.start, self.end + timedelta(days=9), 'b@gmail.com')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_night(self, today):
+        """One nightly sweep; returns {email: [numbers]} of the notices sent."""
+        notices = ExpirationNotices(self.notices_file)
+        due = notices.collect_due(self.ticket_manager.get_expiring_tickets(3, today), today)
+        for items in due.values():
+            for ticket, _, threshold in items:
+                notices.mark_sent(ticket, threshold)
+        notices.save()
+        return {email: sorted(''.join(t['numbers']) for t, _, _ in items) for email, items in due.items()}
+
+    def test_each_threshold_fires_once_per_ticket(self):
+        sent = [self.run_night(self.end - timedelta(days=days)) for days in (5, 4, 3, 2, 1, 0)]
+        self.assertEqual(sent, [
+            {}, {},
+            {'a@gmail.com': ['1111', '2222'], 'b@gmail.com': ['3333']},
+            {},
+            {'a@gmail.com': ['1111', '2222'], 'b@gmail.com': ['3333']},
+            {},
+        ])
+        self.assertEqual(self.run_night(self.end + timedelta(days=1)), {})
+
+    def test_new_end_date_restarts_notices(self):
+        self.run_night(self.end - timedelta(days=1))
+        ticket = self.ticket_manager.get_tickets()[2]
+        self.ticket_manager.update_ticket_dates(ticket['id'], self.start, self.end + timedelta(days=2))
+        self.assertEqual(self.run_night(self.end - timedelta(days=1)), {'b@gmail.com': ['3333']})
+
+    def test_digest_lists_every_ticket(self):
+        tickets = self.ticket_manager.get_tickets()
+        body = EmailNotifier().format_expiration_digest([(tickets[0], 3), (tickets[1], 1)])
+        self.assertIn('2 of your Georgia Cash 4 tickets', body)
+        self.assertLess(body.index(tickets[1]['id']), body.index(tickets[0]['id']))
+
+if __name__ == '__main__':
+    unittest.main()
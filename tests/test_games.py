@@ -0,0 +1,84 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+from src import games
+from src.games import Game, get_game
+from src.play_types import PlayType
+from src.ticket_manager import TicketManager
+
+class TestGames(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cash4_prizes(self):
+        self.assertEqual(PlayType.create('straight', '1234').calculate_prize(list('1234'), list('1234')), (True, 5000.0))
+        self.assertEqual(PlayType.create('box', '1123').calculate_prize(list('1123'), list('3211')), (True, 500.0))
+        self.assertEqual(PlayType.create('straightbox', '1123').calculate_prize(list('1123'), list('1123')), (True, 5500.0))
+        self.assertEqual(PlayType.create('oneoff', '1234').calculate_prize(list('1234'), list('1244')), (True, 1000.0))
+        self.assertEqual(PlayType.create('oneoff', '1234').calculate_prize(list('1234'), list('1245')), (False, 0.0))
+        self.assertEqual(PlayType.create('combo', '1123').wager, 12.0)
+
+    def test_other_games(self):
+        cash3, georgia5 = get_game('cash3'), get_game('georgia5')
+        # Names are case-insensitive and share one cached game
+        self.assertIs(get_game('Cash3'), cash3)
+        self.assertIs(get_game(None), get_game())
+        self.assertEqual((cash3.digits, len(cash3.ways)), (3, 220))
+        self.assertEqual((georgia5.digits, len(georgia5.ways)), (5, 2002))
+        self.assertEqual(cash3.prize('box', 112, 211), 160.0)
+        self.assertEqual(cash3.prize('box', 123, 321), 80.0)
+        self.assertEqual(cash3.prize('straightbox', 123, 123), 580.0)
+        self.assertEqual(georgia5.prize('box', 11234, 43211), 166.0)
+        # Box classes missing from the schedule don't win
+        self.assertEqual(georgia5.prize('box', 11111, 11111), 0.0)
+        self.assertIsNone(PlayType.create('oneoff', '123', 'cash3'))
+        self.assertEqual(len(PlayType.create('box', '12345', 'georgia5').winning_outcomes()), 120)
+
+    def test_tables_cached_on_disk(self):
+        definition = {'digits': 2, 'plays': {'straight': {'straight': 50.0}, 'box': {'box': {'2': 25.0}}}}
+        first = Game('pick2', definition, table_dir=self.tmp.name)
+        self.assertTrue(os.path.exists(first.table_file))
+        with mock.patch.object(Game, '_build_tables', side_effect=AssertionError('rebuilt')):
+            second = Game('pick2', definition, table_dir=self.tmp.name)
+        self.assertEqual((second.class_of, second.ways, second.prizes), (first.class_of, first.ways, first.prizes))
+
+        # A changed definition doesn't reuse the old tables
+        changed = dict(definition, plays={'straight': {'straight': 60.0}})
+        self.assertEqual(Game('pick2', changed, table_dir=self.tmp.name).prize('straight', 42, 42), 60.0)
+
+    def test_game_from_config(self):
+        config_file = os.path.join(self.tmp.name, 'config.json')
+        with open(config_file, 'w') as f:
+            json.dump({'games': {'pick2': {'name': 'Pick 2', 'digits': 2, 'plays': {'straight': {'straight': 50.0}}},
+                                 'broken': {'digits': 9, 'plays': {}}}}, f)
+        with mock.patch.object(games, '_definitions', None):
+            definitions = games.game_definitions(config_file)
+        self.assertIn('pick2', definitions)
+        self.assertIn('cash4', definitions)
+        self.assertNotIn('broken', definitions)
+
+    def test_ticket_manager_games(self):
+        ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        self.assertTrue(ticket_manager._validate_numbers(list('123'), 'cash3'))
+        self.assertFalse(ticket_manager._validate_numbers(list('123')))
+        self.assertFalse(ticket_manager._validate_numbers(list('1234'), 'nope'))
+
+        start, end = date.today() - timedelta(days=1), date.today() + timedelta(days=1)
+        cash3_id = ticket_manager.add_ticket(list('123'), 'box', 'MIDDAY', start, end, 'a@gmail.com', 'cash3')
+        cash4_id = ticket_manager.add_ticket(list('1234'), 'box', 'MIDDAY', start, end, 'a@gmail.com')
+        self.assertEqual(ticket_manager.get_ticket(cash3_id)['game'], 'cash3')
+        self.assertNotIn('game', ticket_manager.get_ticket(cash4_id))
+
+        results = ticket_manager.check_winning_numbers('321', 'MIDDAY', game='cash3')
+        self.assertEqual([(r['ticket']['id'], r['prize_amount']) for r in results], [(cash3_id, 80.0)])
+        results = ticket_manager.check_winning_numbers('4321', 'MIDDAY')
+        self.assertEqual([(r['ticket']['id'], r['prize_amount']) for r in results], [(cash4_id, 500.0)])
+
+if __name__ == '__main__':
+    unittest.main()
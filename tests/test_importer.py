@@ -0,0 +1,73 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from src.importer import import_tickets
+from src.ticket_manager import TicketManager
+
+CSV = """numbers,play_type,draw_time,start_date,end_date,email
+1234,straight,midday,2025-06-01,2025-06-30,one@gmail.com
+0042,Box,EVENING,2025-06-01,2025-06-30,two@yahoo.com
+123,straight,MIDDAY,2025-06-01,2025-06-30,three@gmail.com
+5678,lucky,MIDDAY,2025-06-01,2025-06-30,four@gmail.com
+5678,combo,NIGHT,2025-06-30,2025-06-01,five@gmail.com
+5678,combo,NIGHT,2025-06-01,2025-06-30,not-an-email
+"""
+
+class TestImporter(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'tickets.json')
+        self.ticket_manager = TicketManager(self.data_file)
+        self.rejects = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_import(self, text, fmt, **kwargs):
+        return import_tickets(self.ticket_manager, io.StringIO(text), fmt,
+                              lambda line, reason: self.rejects.append(line), **kwargs)
+
+    def test_csv_import_reports_rejects(self):
+        self.assertEqual(self.run_import(CSV, 'csv', batch_size=2), 2)
+        self.assertEqual(self.rejects, [4, 5, 6, 7])
+        tickets = TicketManager(self.data_file).get_tickets()
+        self.assertEqual([t['numbers'] for t in tickets], [list('1234'), list('0042')])
+        self.assertEqual((tickets[1]['play_type'], tickets[1]['draw_time']), ('box', 'EVENING'))
+        self.assertTrue(all(t['id'] for t in tickets))
+
+    def test_ndjson_import(self):
+        rows = [
+            {'numbers': ['9', '8', '7', '6'], 'play_type': 'oneoff', 'draw_time': 'NIGHT',
+             'start_date': '2025-06-01', 'end_date': '2025-06-02', 'email': 'a@gmail.com'},
+            {'numbers': '98765', 'play_type': 'oneoff', 'draw_time': 'NIGHT',
+             'start_date': '2025-06-01', 'end_date': '2025-06-02', 'email': 'a@gmail.com'},
+        ]
+        text = '\n'.join(json.dumps(row) for row in rows) + '\n{not json\n'
+        self.assertEqual(self.run_import(text, 'ndjson'), 1)
+        self.assertEqual(self.rejects, [2, 3])
+
+    def test_ndjson_fields_that_are_not_strings_are_rejected(self):
+        good = {'numbers': '1234', 'play_type': 'box', 'draw_time': 'MIDDAY',
+                'start_date': '2025-06-01', 'end_date': '2025-06-02', 'email': 'a@gmail.com'}
+        rows = [good, good, good, dict(good, play_type=5), dict(good, start_date=20250601),
+                dict(good, email=['a@gmail.com']), dict(good, game=4), good]
+        text = '\n'.join(json.dumps(row) for row in rows)
+        self.assertEqual(self.run_import(text, 'ndjson'), 4)
+        self.assertEqual(self.rejects, [4, 5, 6, 7])
+
+    def test_games_whose_results_are_not_checked_are_rejected(self):
+        row = {'numbers': '123', 'play_type': 'box', 'draw_time': 'MIDDAY',
+               'start_date': '2025-06-01', 'end_date': '2025-06-02', 'email': 'a@gmail.com'}
+        text = '\n'.join(json.dumps(dict(row, game=game)) for game in ('cash3', 'Cash3'))
+        text += '\n' + json.dumps(dict(row, numbers='1234', game='CASH4'))
+        self.assertEqual(self.run_import(text, 'ndjson'), 1)
+        self.assertEqual(self.rejects, [1, 2])
+
+    def test_dry_run_writes_nothing(self):
+        self.assertEqual(self.run_import(CSV, 'csv', dry_run=True), 2)
+        self.assertEqual(TicketManager(self.data_file).get_tickets(), [])
+
+if __name__ == '__main__':
+    unittest.main()
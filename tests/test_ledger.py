@@ -0,0 +1,102 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+from src.ledger import OutcomeLedger, open_ledgers
+from src.main import process_drawing
+from src.ticket_manager import TicketManager
+
+class FakeNotifier:
+    def render_notification(self, ticket, winning_numbers, prize):
+        return ticket['id']
+
+    def deliver(self, message):
+        return True
+
+class TestOutcomeLedger(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ledger_file = os.path.join(self.tmp.name, 'outcomes.jsonl.gz')
+        self.ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        # Active on the fixed drawing dates below as well as today
+        start, end = date(2025, 12, 1), date.today() + timedelta(days=5)
+        for numbers, play_type, email in (('1234', 'straight', 'a@gmail.com'), ('4321', 'box', 'A@gmail.com'),
+                                          ('5555', 'straight', 'b@gmail.com')):
+            self.ticket_manager.add_ticket(list(numbers), play_type, 'MIDDAY', start, end, email)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_totals_follow_drawings(self):
+        ledger = OutcomeLedger(self.ledger_file)
+        process_drawing('MIDDAY', '1234', self.ticket_manager, FakeNotifier(), draw_date=date(2025, 12, 31), ledger=ledger)
+        process_drawing('MIDDAY', '0000', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 1), ledger=ledger)
+        # Processing a drawing again records nothing new
+        process_drawing('MIDDAY', '1234', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 1), ledger=ledger)
+
+        ledger = OutcomeLedger(self.ledger_file)
+        self.assertEqual(ledger.user_totals('A@GMAIL.COM'), {'checked': 4, 'wins': 2, 'won': 5500.0})
+        self.assertEqual(ledger.user_totals('a@gmail.com', 2026), {'checked': 2, 'wins': 0, 'won': 0.0})
+        self.assertEqual(ledger.user_totals('nobody@gmail.com'), {'checked': 0, 'wins': 0, 'won': 0.0})
+        winners = dict(ledger.winning_tickets('a@gmail.com'))
+        self.assertEqual(len(winners), 2)
+        self.assertEqual({t['last_win'] for t in winners.values()}, {'2025-12-31 MIDDAY'})
+        self.assertEqual(ledger.winning_tickets('b@gmail.com'), [])
+
+        rows = list(ledger.iter_rows())
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[0]['winning_numbers'], '1234')
+
+        totals = ledger.totals
+        os.remove(ledger.totals_file)
+        rebuilt = OutcomeLedger(self.ledger_file)
+        rebuilt.rebuild()
+        self.assertEqual(rebuilt.totals, totals)
+
+    def test_drawings_processed_out_of_order_are_recorded(self):
+        ledger = OutcomeLedger(self.ledger_file)
+        process_drawing('EVENING', '0000', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 2), ledger=ledger)
+        process_drawing('MIDDAY', '1234', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 2), ledger=ledger)
+        process_drawing('MIDDAY', '5555', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 1), ledger=ledger)
+        process_drawing('MIDDAY', '5555', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 2), ledger=ledger)
+
+        ledger = OutcomeLedger(self.ledger_file)
+        self.assertEqual(ledger.totals['rows'], 6)
+        self.assertEqual(ledger.user_totals('a@gmail.com'), {'checked': 4, 'wins': 2, 'won': 5500.0})
+        self.assertEqual(ledger.user_totals('b@gmail.com'), {'checked': 2, 'wins': 1, 'won': 5000.0})
+        self.assertEqual(ledger.totals['drawings'], ['2026-01-01:0', '2026-01-02:0', '2026-01-02:1'])
+
+    def test_drawing_that_fails_part_way_is_checked_again(self):
+        check = self.ticket_manager.iter_winning_numbers
+
+        def fail_after_first(*args, **kwargs):
+            results = check(*args, **kwargs)
+            yield next(results)
+            raise RuntimeError('scan failed')
+
+        ledger = OutcomeLedger(self.ledger_file)
+        with mock.patch.object(self.ticket_manager, 'iter_winning_numbers', fail_after_first):
+            with self.assertRaises(RuntimeError):
+                process_drawing('MIDDAY', '5555', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 1),
+                                ledger=ledger)
+        ledger = OutcomeLedger(self.ledger_file)
+        self.assertEqual((ledger.totals['rows'], ledger.totals['drawings']), (1, []))
+
+        process_drawing('MIDDAY', '5555', self.ticket_manager, FakeNotifier(), draw_date=date(2026, 1, 1), ledger=ledger)
+        ledger = OutcomeLedger(self.ledger_file)
+        self.assertEqual((ledger.totals['rows'], ledger.totals['drawings'], ledger.totals['partial']),
+                         (3, ['2026-01-01:0'], {}))
+        self.assertEqual(len(list(ledger.iter_rows())), 3)
+
+    def test_shard_ledgers_are_found(self):
+        for shard in ((0, 2), (1, 2)):
+            ledger = OutcomeLedger(self.ledger_file, shard=shard)
+            process_drawing('MIDDAY', '5555', self.ticket_manager, FakeNotifier(), shard=shard, ledger=ledger)
+        ledgers = open_ledgers(self.ledger_file)
+        self.assertEqual(len(ledgers), 3)
+        self.assertEqual(sum(ledger.totals['rows'] for ledger in ledgers), 3)
+        self.assertEqual(sum(ledger.user_totals('b@gmail.com')['won'] for ledger in ledgers), 5000.0)
+
+if __name__ == '__main__':
+    unittest.main()
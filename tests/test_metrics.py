@@ -0,0 +1,45 @@
+import json
+import os
+import tempfile
+import unittest
+from src.metrics import RunMetrics
+
+class TestRunMetrics(unittest.TestCase):
+    def test_spans_and_counters(self):
+        metrics = RunMetrics()
+        for _ in range(3):
+            with metrics.span('evaluate.midday'):
+                pass
+        metrics.incr('winners', 2)
+        metrics.incr('emails_sent')
+
+        report = metrics.report()
+        self.assertEqual(report['spans']['evaluate.midday']['count'], 3)
+        self.assertGreaterEqual(report['spans']['evaluate.midday']['seconds'], 0.0)
+        self.assertEqual(report['counters'], {'emails_sent': 1, 'winners': 2})
+
+    def test_span_records_on_error(self):
+        metrics = RunMetrics()
+        with self.assertRaises(ValueError):
+            with metrics.span('smtp.send'):
+                raise ValueError()
+        self.assertEqual(metrics.report()['spans']['smtp.send']['count'], 1)
+
+    def test_write_reports(self):
+        metrics = RunMetrics()
+        with metrics.span('scrape'):
+            pass
+        metrics.incr('tickets_scanned', 10)
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, 'run_report.json')
+            prom_path = os.path.join(tmp, 'metrics.prom')
+            metrics.write_reports(json_path, prom_path)
+            with open(json_path) as f:
+                self.assertEqual(json.load(f)['counters']['tickets_scanned'], 10)
+            with open(prom_path) as f:
+                prom = f.read()
+            self.assertIn('lottrack_span_calls_total{span="scrape"} 1', prom)
+            self.assertIn('lottrack_events_total{event="tickets_scanned"} 10', prom)
+
+if __name__ == '__main__':
+    unittest.main()
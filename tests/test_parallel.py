@@ -0,0 +1,85 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+from src import parallel
+from src.main import process_drawing
+from src.ticket_manager import TicketManager
+
+class SlowNotifier:
+    """Keeps the pipeline's sender threads busy while tickets are checked."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.sent = []
+
+    def render_notification(self, ticket, winning_numbers, prize):
+        return ticket['id'], prize
+
+    def deliver(self, message):
+        with self.lock:
+            time.sleep(0.001)
+            self.sent.append(message)
+        return True
+
+class TestParallelCheck(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        today = date.today()
+        play_types = ['straight', 'box', 'straightbox', 'combo', 'oneoff']
+        tickets = []
+        for i in range(300):
+            # Every seventh ticket has already expired
+            end = today - timedelta(days=1) if i % 7 == 0 else today + timedelta(days=5)
+            tickets.append({
+                'numbers': list(f"{(i * 37) % 10000:04d}" if i % 3 else '1234'),
+                'play_type': play_types[i % 5],
+                'draw_time': ['MIDDAY', 'EVENING'][i % 2],
+                'start_date': (today - timedelta(days=10)).isoformat(),
+                'end_date': end.isoformat(),
+                'email': f"player{i % 11}@gmail.com",
+            })
+        self.ticket_manager.tickets = tickets
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_matches_serial_results_in_order(self):
+        for shard in (None, (1, 3)):
+            serial = self.ticket_manager.check_winning_numbers('4321', 'MIDDAY', shard=shard, workers=1)
+            parallel = self.ticket_manager.check_winning_numbers('4321', 'MIDDAY', shard=shard, workers=2)
+            self.assertEqual(parallel, serial)
+            self.assertTrue(any(r['is_winner'] for r in serial))
+
+    def test_encoding_refreshed_when_tickets_change(self):
+        self.ticket_manager.check_winning_numbers('4321', 'MIDDAY', workers=2)
+        self.ticket_manager.add_ticket(list('4321'), 'straight', 'MIDDAY', date.today(), date.today(), 'new@gmail.com')
+        results = self.ticket_manager.check_winning_numbers('4321', 'MIDDAY', workers=2)
+        self.assertIs(results[-1]['ticket'], self.ticket_manager.tickets[-1])
+        self.assertEqual(results[-1]['prize_amount'], 5000.0)
+
+    def test_falls_back_when_tickets_cannot_be_encoded(self):
+        bad = dict(self.ticket_manager.tickets[1], id=None, numbers=list('12345'))
+        self.ticket_manager.tickets = [*self.ticket_manager.tickets, bad]
+        serial = self.ticket_manager.check_winning_numbers('4321', 'MIDDAY', workers=1)
+        self.assertEqual(self.ticket_manager.check_winning_numbers('4321', 'MIDDAY', workers=2), serial)
+
+    def test_workers_are_not_forked_from_the_running_pipeline(self):
+        self.assertNotEqual(parallel._pool_context().get_start_method(), 'fork')
+        expected = sorted((r['ticket']['id'], r['prize_amount'] if r['is_winner'] else 0)
+                          for r in self.ticket_manager.check_winning_numbers('4321', 'MIDDAY', workers=1))
+        notifier = SlowNotifier()
+        summaries = []
+        thread = threading.Thread(target=lambda: summaries.append(
+            process_drawing('MIDDAY', '4321', self.ticket_manager, notifier, workers=2)), daemon=True)
+        thread.start()
+        thread.join(timeout=60)
+        self.assertFalse(thread.is_alive(), 'parallel check hung')
+        self.assertEqual(summaries[0]['checked'], len(expected))
+        self.assertEqual(sorted(notifier.sent), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import threading
+import time
+import unittest
+from src.metrics import metrics
+from src.pipeline import Pipeline, Stage
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+
+    def test_items_flow_through_every_stage(self):
+        sent = []
+        pipeline = Pipeline([
+            Stage('expand', lambda n: range(n), expand=True),
+            Stage('square', lambda n: n * n if n % 2 else None),
+            Stage('collect', sent.append, workers=3),
+        ], queue_size=4)
+        report = pipeline.run([3, 5, 4])
+
+        self.assertEqual(sorted(sent), sorted(n * n for n in list(range(3)) + list(range(5)) + list(range(4))
+                                              if n % 2))
+        self.assertEqual(report['source']['items'], 3)
+        self.assertEqual(report['expand']['outputs'], 12)
+        self.assertEqual(report['square']['items'], 12)
+        self.assertEqual(report['collect']['items'], 5)
+        self.assertEqual(metrics.report()['counters']['pipeline.collect.items'], 5)
+        self.assertIn('pipeline.square.max_queue_depth', metrics.report()['gauges'])
+
+    def test_slow_stage_bounds_the_queues(self):
+        release = threading.Event()
+        produced = []
+
+        def source():
+            for n in range(50):
+                produced.append(n)
+                yield n
+
+        def slow(n):
+            release.wait()
+
+        pipeline = Pipeline([Stage('fast', lambda n: n), Stage('slow', slow)], queue_size=3)
+        thread = threading.Thread(target=pipeline.run, args=(source(),))
+        thread.start()
+        time.sleep(0.2)
+        # Blocked on the slow stage: each queue is full and the source waits on the first one
+        self.assertLessEqual(len(produced), 3 + 1 + 3 + 1 + 1)
+        release.set()
+        thread.join(5)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(len(produced), 50)
+
+    def test_errors_skip_the_item(self):
+        def fail_on_two(n):
+            if n == 2:
+                raise ValueError('bad item')
+            return n
+
+        done = []
+        with self.assertLogs('src.pipeline', 'ERROR'):
+            report = Pipeline([Stage('check', fail_on_two), Stage('done', done.append)]).run(range(5))
+        self.assertEqual(sorted(done), [0, 1, 3, 4])
+        self.assertEqual(report['check']['errors'], 1)
+        self.assertEqual(metrics.report()['counters']['pipeline.check.errors'], 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+from collections import Counter
+from datetime import date, timedelta
+from src.main import process_drawing
+from src.metrics import metrics
+from src.precompute import WinnerTable
+from src.ticket_manager import TicketManager
+
+class FakeNotifier:
+    sender_email = 'sender@gmail.com'
+    sender_password = 'secret'
+
+    def __init__(self):
+        self.rendered = []
+        self.sent = []
+
+    def render_notification(self, ticket, winning_numbers, prize):
+        self.rendered.append(ticket['id'])
+        return ticket['id'], ''.join(winning_numbers), prize
+
+    def deliver(self, message):
+        self.sent.append(message)
+        return True
+
+class TestWinnerTable(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        today = date.today()
+        play_types = ['straight', 'box', 'straightbox', 'combo', 'oneoff']
+        self.ticket_manager.add_tickets(
+            {'numbers': list(f"{(i * 37) % 10000:04d}"), 'play_type': play_types[i % 5],
+             'draw_time': ['MIDDAY', 'EVENING'][i % 2], 'start_date': (today - timedelta(days=i % 3)).isoformat(),
+             'end_date': (today + timedelta(days=i % 4 - 2)).isoformat(), 'email': f"p{i % 7}@gmail.com"}
+            for i in range(120)
+        )
+        self.winning = ''.join(next(t for t in self.ticket_manager.get_active_tickets()
+                                    if t['draw_time'] == 'MIDDAY' and t['play_type'] == 'box')['numbers'])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def winners(self, winning_numbers):
+        return sorted((r['ticket']['id'], r['prize_amount'])
+                      for r in self.ticket_manager.check_winning_numbers(winning_numbers, 'MIDDAY', workers=1)
+                      if r['is_winner'])
+
+    def test_lookup_matches_checking_every_ticket(self):
+        table = WinnerTable.build(self.ticket_manager, 'midday')
+        self.assertEqual(table.tickets, len(self.ticket_manager.check_winning_numbers('0000', 'MIDDAY', workers=1)))
+        results = set(table._winners) | {f"{n:04d}" for n in range(0, 10000, 97)}
+        for winning_numbers in results:
+            self.assertEqual(sorted((t['id'], prize) for t, prize in table.winners(winning_numbers)),
+                             self.winners(winning_numbers), winning_numbers)
+
+    def test_winners_are_sent_from_rendered_table(self):
+        notifier = FakeNotifier()
+        table = WinnerTable.build(self.ticket_manager, 'MIDDAY')
+        self.assertEqual(table.render(notifier), table.pairs)
+        notifier.rendered.clear()
+        metrics.reset()
+
+        summary = process_drawing('MIDDAY', self.winning, self.ticket_manager, notifier, table=table)
+        expected = self.ticket_manager.check_winning_numbers(self.winning, 'MIDDAY', workers=1)
+        winners = {r['ticket']['id'] for r in expected if r['is_winner']}
+        self.assertTrue(winners)
+        # Every ticket is notified once, and only the losing emails were rendered after the drawing
+        self.assertEqual(Counter(message[0] for message in notifier.sent), Counter(r['ticket']['id'] for r in expected))
+        self.assertEqual(set(notifier.rendered), {r['ticket']['id'] for r in expected} - winners)
+        self.assertEqual(metrics.report()['counters']['precomputed_winners'], len(winners))
+        self.assertEqual((summary['checked'], summary['winners'], summary['sent']),
+                         (len(expected), len(winners), len(expected)))
+
+    def test_stale_table_is_not_used(self):
+        table = WinnerTable.build(self.ticket_manager, 'MIDDAY')
+        today = date.today()
+        self.ticket_manager.add_ticket(list(self.winning), 'straight', 'MIDDAY', today, today, 'late@gmail.com')
+        self.assertFalse(table.is_current(self.ticket_manager))
+
+        notifier = FakeNotifier()
+        metrics.reset()
+        process_drawing('MIDDAY', self.winning, self.ticket_manager, notifier, table=table)
+        expected = self.ticket_manager.check_winning_numbers(self.winning, 'MIDDAY', workers=1)
+        self.assertEqual(Counter(message[0] for message in notifier.sent), Counter(r['ticket']['id'] for r in expected))
+        self.assertNotIn('precomputed_winners', metrics.report()['counters'])
+
+    def test_table_for_the_draw_date(self):
+        # Built for tomorrow's drawing, as the daemon does when the Eastern date is ahead of the host's
+        tomorrow = date.today() + timedelta(days=1)
+        table = WinnerTable.build(self.ticket_manager, 'MIDDAY', active_on=tomorrow)
+        self.assertFalse(table.is_current(self.ticket_manager))
+        self.assertTrue(table.is_current(self.ticket_manager, active_on=tomorrow))
+
+        notifier = FakeNotifier()
+        metrics.reset()
+        summary = process_drawing('MIDDAY', self.winning, self.ticket_manager, notifier, draw_date=tomorrow,
+                                  table=table)
+        expected = self.ticket_manager.check_winning_numbers(self.winning, 'MIDDAY', workers=1, draw_date=tomorrow)
+        self.assertNotEqual(len(expected), len(self.ticket_manager.check_winning_numbers(self.winning, 'MIDDAY',
+                                                                                          workers=1)))
+        self.assertEqual(Counter(message[0] for message in notifier.sent), Counter(r['ticket']['id'] for r in expected))
+        self.assertIn('precomputed_winners', metrics.report()['counters'])
+        self.assertEqual(summary['checked'], len(expected))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import pstats
+import tempfile
+import threading
+import time
+import unittest
+from src.profiling import Profiler
+
+def busy(seconds=0.05):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        sum(range(100))
+
+class TestProfiler(unittest.TestCase):
+    def test_cpu_mode_writes_pstats_and_collapsed_stacks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with Profiler('cpu', 'run', tmp, interval=0.001):
+                busy()
+            stats = pstats.Stats(os.path.join(tmp, 'run.pstats'))
+            self.assertTrue(any(func[2] == 'busy' for func in stats.stats))
+            with open(os.path.join(tmp, 'run.collapsed')) as f:
+                lines = f.read().splitlines()
+            self.assertTrue(lines)
+            self.assertTrue(any('busy (test_profiling.py' in line for line in lines))
+            self.assertTrue(all(line.rsplit(' ', 1)[1].isdigit() for line in lines))
+
+    def test_threads_started_while_profiling_are_covered(self):
+        def threaded_busy():
+            busy()
+
+        with tempfile.TemporaryDirectory() as tmp:
+            with Profiler('cpu', 'run', tmp, interval=0.001):
+                thread = threading.Thread(target=threaded_busy, name='worker')
+                thread.start()
+                thread.join()
+            stats = pstats.Stats(os.path.join(tmp, 'run.pstats'))
+            self.assertTrue(any(func[2] == 'threaded_busy' for func in stats.stats))
+            with open(os.path.join(tmp, 'run.collapsed')) as f:
+                lines = f.read().splitlines()
+            self.assertTrue(any(line.startswith('worker;') and 'threaded_busy' in line for line in lines))
+
+    def test_memory_mode(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with Profiler('memory', 'run', tmp):
+                data = [str(i) for i in range(10000)]
+            self.assertTrue(data)
+            self.assertFalse(os.path.exists(os.path.join(tmp, 'run.pstats')))
+            with open(os.path.join(tmp, 'run.memory.txt')) as f:
+                self.assertIn('Peak traced memory', f.read())
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            Profiler('wall')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.ticket_manager import TicketManager
+
+class TestQueryTickets(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        self.today = date(2025, 6, 15)
+        play_types = ['straight', 'box', 'combo']
+        draw_times = ['MIDDAY', 'EVENING', 'NIGHT']
+        for i in range(30):
+            start = self.today - timedelta(days=10) + timedelta(days=i % 15)
+            self.ticket_manager.add_ticket(list(f"{i % 10:04d}"), play_types[i % 3], draw_times[(i // 3) % 3],
+                                           start, start + timedelta(days=i % 7), f"Player{i % 4}@gmail.com")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def brute_force(self, predicate):
+        return [t for t in self.ticket_manager.get_tickets() if predicate(t)]
+
+    def test_matches_scan_for_each_filter(self):
+        iso = self.today.isoformat()
+        soon = (self.today + timedelta(days=3)).isoformat()
+        cases = [
+            ({'email': 'player1@GMAIL.com'}, lambda t: t['email'] == 'Player1@gmail.com'),
+            ({'draw_time': 'night', 'play_type': 'Box'}, lambda t: t['draw_time'] == 'NIGHT' and t['play_type'] == 'box'),
+            ({'numbers': '0003'}, lambda t: t['numbers'] == list('0003')),
+            ({'active_on': self.today}, lambda t: t['start_date'] <= iso <= t['end_date']),
+            ({'expiring_within': 3, 'today': self.today}, lambda t: iso <= t['end_date'] <= soon),
+            ({'active_on': self.today, 'email': 'player2@gmail.com', 'expiring_within': 3, 'today': self.today},
+             lambda t: t['start_date'] <= iso <= t['end_date'] <= soon and t['email'] == 'Player2@gmail.com'),
+        ]
+        for filters, predicate in cases:
+            expected = self.brute_force(predicate)
+            self.assertTrue(expected, filters)
+            self.assertEqual(self.ticket_manager.query_tickets(**filters), (len(expected), expected), filters)
+
+    def test_paging_and_index_refresh(self):
+        total, page = self.ticket_manager.query_tickets(email='player0@gmail.com', offset=2, limit=3)
+        everything = self.brute_force(lambda t: t['email'] == 'Player0@gmail.com')
+        self.assertEqual((total, page), (len(everything), everything[2:5]))
+
+        self.ticket_manager.remove_ticket(everything[0]['id'])
+        self.assertEqual(self.ticket_manager.query_tickets(email='player0@gmail.com')[0], total - 1)
+        self.assertEqual(self.ticket_manager.query_tickets(numbers='9999'), (0, []))
+
+if __name__ == '__main__':
+    unittest.main()
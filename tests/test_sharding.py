@@ -0,0 +1,39 @@
+import argparse
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.main import parse_shard
+from src.ticket_manager import TicketManager, shard_of
+
+class TestSharding(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        start, end = date.today() - timedelta(days=1), date.today() + timedelta(days=1)
+        for i in range(40):
+            self.ticket_manager.add_ticket(list(f"{i:04d}"), 'straight', 'MIDDAY', start, end, f"player{i % 13}@gmail.com")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_shards_partition_tickets(self):
+        shards = [self.ticket_manager.check_winning_numbers('0001', 'MIDDAY', (i, 4)) for i in range(4)]
+        checked = [r['ticket']['numbers'] for results in shards for r in results]
+        self.assertEqual(sorted(checked), sorted(t['numbers'] for t in self.ticket_manager.get_tickets()))
+        self.assertEqual(sum(len(self.ticket_manager.get_active_tickets((i, 4))) for i in range(4)), 40)
+
+    def test_same_email_same_shard(self):
+        tickets = self.ticket_manager.get_tickets()
+        for ticket in tickets:
+            same_player = [t for t in tickets if t['email'] == ticket['email']]
+            self.assertEqual({shard_of(t, 4) for t in same_player}, {shard_of(ticket, 4)})
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard('2/4'), (2, 4))
+        for value in ('4/4', '-1/4', 'a/b', '3'):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_shard(value)
+
+if __name__ == '__main__':
+    unittest.main()
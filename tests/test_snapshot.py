@@ -0,0 +1,76 @@
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.metrics import metrics
+from src.snapshot import TicketSnapshot, open_snapshot
+from src.ticket_manager import TicketManager
+
+class TestTicketSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'tickets.json')
+        self.ticket_manager = TicketManager(self.data_file)
+        today = date.today()
+        play_types = ['straight', 'box', 'straightbox', 'combo', 'oneoff']
+        for i in range(60):
+            start = today - timedelta(days=i % 4)
+            self.ticket_manager.add_ticket(list(f"{(i * 7) % 10000:04d}"), play_types[i % 5],
+                                           ['MIDDAY', 'EVENING', 'NIGHT'][i % 3], start,
+                                           start + timedelta(days=i % 3), f"p{i % 6}@gmail.com")
+        self.ticket_manager.write_snapshot()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_round_trip_and_queries(self):
+        with open_snapshot(self.data_file) as snapshot:
+            fields = ('id', 'numbers', 'play_type', 'draw_time', 'start_date', 'end_date', 'email')
+            expected = [{field: t[field] for field in fields} for t in self.ticket_manager.get_tickets()]
+            self.assertEqual(list(snapshot.iter_tickets()), expected)
+
+            filters = {'draw_time': 'evening', 'email': 'P2@gmail.com', 'active_on': date.today()}
+            total, _ = self.ticket_manager.query_tickets(**filters)
+            self.assertEqual(snapshot.count_matching(**filters), total)
+
+            filters = {'play_type': 'box', 'numbers': '0035', 'expiring_within': 1, 'active_on': date.today()}
+            queries = (filters, {'numbers': '0035'}, {'expiring_within': 0}, {'draw_time': 'NIGHT'},
+                       {'email': 'P3@GMAIL.com', 'play_type': 'combo'}, {'email': 'nobody@gmail.com'},
+                       {'active_on': date.today() - timedelta(days=2), 'draw_time': 'MIDDAY'}, {})
+            for query in queries:
+                total, page = self.ticket_manager.query_tickets(offset=1, limit=3, **query)
+                self.assertEqual(snapshot.query(offset=1, limit=3, **query),
+                                 (total, [{field: t[field] for field in fields} for t in page]), query)
+
+    def test_drawings_are_checked_from_a_fresh_snapshot(self):
+        with open_snapshot(self.data_file) as snapshot:
+            evaluated = snapshot.evaluate('4100', 'NIGHT')
+        metrics.reset()
+        checked = self.ticket_manager.check_winning_numbers('4100', 'NIGHT', workers=1)
+        self.assertIn('tickets.snapshot_evaluate', metrics.report()['spans'])
+        self.assertEqual([(r['ticket']['id'], r['is_winner'], r['prize_amount']) for r in checked],
+                         [(self.ticket_manager.tickets[i]['id'], won, prize) for i, won, prize in evaluated])
+        self.assertTrue(any(r['is_winner'] for r in checked))
+
+        os.remove(self.ticket_manager.snapshot_file)
+        for shard in (None, (1, 2)):
+            serial = self.ticket_manager.check_winning_numbers('4100', 'NIGHT', shard=shard, workers=1)
+            self.ticket_manager.write_snapshot()
+            self.assertEqual(self.ticket_manager.check_winning_numbers('4100', 'NIGHT', shard=shard, workers=1),
+                             serial)
+            os.remove(self.ticket_manager.snapshot_file)
+
+    def test_saves_keep_snapshot_fresh(self):
+        ticket_id = self.ticket_manager.get_tickets()[0]['id']
+        self.ticket_manager.remove_ticket(ticket_id)
+        with open_snapshot(self.data_file) as snapshot:
+            self.assertEqual(len(snapshot), 59)
+
+        # A JSON file changed behind the snapshot's back makes it stale
+        with open(self.data_file, 'a') as f:
+            f.write('\n')
+        self.assertIsNone(open_snapshot(self.data_file))
+        self.assertIsNone(TicketSnapshot.open_if_fresh(os.path.join(self.tmp.name, 'missing.snapshot'), self.data_file))
+
+if __name__ == '__main__':
+    unittest.main()
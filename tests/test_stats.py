@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+from datetime import date
+from src.codec import CodecError
+from src.history import ResultsHistory
+from src.stats import DrawStatistics
+
+class TestDrawStatistics(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.history_file = os.path.join(self.tmp.name, 'results_history.json')
+        self.stats_file = os.path.join(self.tmp.name, 'draw_stats.json')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_incremental_updates_are_persisted(self):
+        history = ResultsHistory(self.history_file)
+        history.add_result(date(2025, 6, 15), 'midday', '1123')
+        history.add_result(date(2025, 6, 16), 'night', '3211')
+
+        stats = DrawStatistics(self.stats_file)
+        self.assertEqual(stats.draw_count, 2)
+        self.assertEqual(stats.position_frequencies()[0][1], 1)
+        self.assertEqual(stats.position_frequencies()[0][3], 1)
+        self.assertEqual(stats.class_count('1312'), 2)
+        self.assertEqual(stats.pair_count(1, 2), 2)
+        self.assertEqual(stats.pair_count(1, 1), 2)
+        self.assertEqual(stats.pair_count(2, 2), 0)
+        self.assertEqual(stats.days_since_seen('3211', today=date(2025, 6, 20)), 4)
+        self.assertIsNone(stats.days_since_seen('2113'))
+        self.assertEqual(stats.hot_digits('midday', 1), [1])
+        self.assertEqual(stats.cold_digits('night', 1), [0])
+
+    def test_correction_replaces_counts(self):
+        history = ResultsHistory(self.history_file)
+        history.add_result(date(2025, 6, 15), 'midday', '1111')
+        history.add_result(date(2025, 6, 15), 'midday', '2222')
+        stats = DrawStatistics(self.stats_file)
+        self.assertEqual(stats.draw_count, 1)
+        self.assertEqual(stats.class_count('1111'), 0)
+        self.assertEqual(stats.class_count('2222'), 1)
+        self.assertIsNone(stats.days_since_seen('1111'))
+
+        history.add_result(date(2025, 6, 10), 'night', '3333')
+        history.add_result(date(2025, 6, 16), 'night', '3333')
+        history.add_result(date(2025, 6, 16), 'night', '4444')
+        stats = DrawStatistics(self.stats_file)
+        self.assertEqual(stats.days_since_seen('3333', today=date(2025, 6, 20)), 10)
+
+    def test_rebuilds_missing_statistics(self):
+        ResultsHistory(self.history_file).add_result(date(2025, 6, 15), 'evening', '0909')
+        os.remove(self.stats_file)
+        history = ResultsHistory(self.history_file)
+        self.assertEqual(history.statistics.draw_count, 1)
+        self.assertEqual(DrawStatistics(self.stats_file).class_count('9900'), 1)
+
+    def test_unreadable_history_is_not_overwritten(self):
+        with open(self.history_file, 'w') as f:
+            f.write('{"2025-06-15": {"midday": ')
+        with self.assertRaises(CodecError):
+            ResultsHistory(self.history_file)
+        with open(self.history_file) as f:
+            self.assertEqual(f.read(), '{"2025-06-15": {"midday": ')
+
+        os.remove(self.history_file)
+        self.assertEqual(ResultsHistory(self.history_file).get_draws(), [])
+
+if __name__ == '__main__':
+    unittest.main()
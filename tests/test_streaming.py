@@ -0,0 +1,68 @@
+import os
+import tempfile
+import types
+import unittest
+from datetime import date, timedelta
+from src.metrics import metrics
+from src.main import process_drawing
+from src.ticket_manager import TicketManager
+
+class FakeNotifier:
+    def __init__(self, ticket_manager):
+        self.ticket_manager = ticket_manager
+        self.sent = []
+
+    def render_notification(self, ticket, winning_numbers, prize):
+        return ticket['id'], prize
+
+    def deliver(self, message):
+        self.sent.append(message)
+        return True
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.ticket_manager = TicketManager(os.path.join(self.tmp.name, 'tickets.json'))
+        today = date.today()
+        play_types = ['straight', 'box', 'straightbox', 'combo', 'oneoff']
+        self.ticket_manager.add_tickets(
+            {'numbers': list(f"{(i * 37) % 10000:04d}"), 'play_type': play_types[i % 5],
+             'draw_time': ['MIDDAY', 'EVENING'][i % 2], 'start_date': (today - timedelta(days=i % 3)).isoformat(),
+             'end_date': (today + timedelta(days=i % 4 - 2)).isoformat(), 'email': f"p{i % 7}@gmail.com"}
+            for i in range(90)
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_iterators_match_lists(self):
+        self.assertIsInstance(self.ticket_manager.iter_active_tickets(), types.GeneratorType)
+        self.assertEqual(list(self.ticket_manager.iter_tickets()), self.ticket_manager.get_tickets())
+        self.assertEqual(list(self.ticket_manager.iter_active_tickets((1, 3))),
+                         self.ticket_manager.get_active_tickets((1, 3)))
+        self.assertEqual(list(self.ticket_manager.iter_tickets_for_drawing(date.today())),
+                         self.ticket_manager.get_active_tickets())
+
+    def test_streamed_results_match_and_share_winning_numbers(self):
+        winning = ''.join(next(t for t in self.ticket_manager.get_active_tickets()
+                               if t['draw_time'] == 'EVENING')['numbers'])
+        results = self.ticket_manager.check_winning_numbers(winning, 'EVENING', workers=1)
+        streamed = list(self.ticket_manager.iter_winning_numbers(winning, 'EVENING', workers=1))
+        self.assertEqual(streamed, results)
+        self.assertTrue(any(r['is_winner'] for r in results))
+        self.assertEqual(len({id(r['winning_numbers']) for r in streamed}), 1)
+        for result in results:
+            self.assertEqual(self.ticket_manager.check_ticket(result['ticket'], winning),
+                             (result['is_winner'], result['prize_amount']))
+
+    def test_process_drawing_sends_as_results_stream(self):
+        expected = self.ticket_manager.check_winning_numbers('0000', 'MIDDAY', workers=1)
+        metrics.reset()
+        notifier = FakeNotifier(self.ticket_manager)
+        process_drawing('MIDDAY', '0000', self.ticket_manager, notifier)
+        # Emails go out from several threads, so only the set of messages is fixed
+        self.assertEqual(sorted(notifier.sent), sorted((r['ticket']['id'], r['prize_amount']) for r in expected))
+        self.assertEqual(metrics.report()['counters']['tickets_checked'], len(expected))
+
+if __name__ == '__main__':
+    unittest.main()
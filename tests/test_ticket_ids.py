@@ -0,0 +1,54 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+from src.email_notifier import EmailNotifier
+from src.ticket_manager import TicketManager
+
+class TestTicketIds(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data_file = os.path.join(self.tmp.name, 'tickets.json')
+        self.ticket_manager = TicketManager(self.data_file)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def add(self, numbers):
+        return self.ticket_manager.add_ticket(list(numbers), 'straight', 'MIDDAY', date.today(),
+                                              date.today() + timedelta(days=2), 'player@gmail.com')
+
+    def test_ids_are_stable_across_removals(self):
+        ids = [self.add(f"{i:04d}") for i in range(5)]
+        self.assertEqual(len(set(ids)), 5)
+        self.assertTrue(self.ticket_manager.remove_ticket(ids[1]))
+        self.assertFalse(self.ticket_manager.remove_ticket(ids[1]))
+        self.assertEqual([t['id'] for t in self.ticket_manager.get_tickets()], ids[:1] + ids[2:])
+        self.assertEqual(self.ticket_manager.get_ticket(ids[3])['numbers'], list('0003'))
+        # The tickets view can't be changed behind the ID index's back
+        with self.assertRaises(AttributeError):
+            self.ticket_manager.tickets.append({'numbers': list('9999')})
+        self.ticket_manager.get_tickets().clear()
+        self.assertEqual(len(self.ticket_manager.tickets), 4)
+
+        reloaded = TicketManager(self.data_file)
+        self.assertEqual(reloaded.get_ticket(ids[4])['numbers'], list('0004'))
+        self.assertTrue(reloaded.update_ticket_dates(ids[4].upper(), date(2025, 1, 1), date(2025, 1, 31)))
+        self.assertEqual(reloaded.get_ticket(ids[4])['end_date'], '2025-01-31')
+
+    def test_legacy_tickets_get_persisted_ids(self):
+        with open(self.data_file, 'w') as f:
+            json.dump([{'numbers': list('1234'), 'play_type': 'box', 'draw_time': 'NIGHT',
+                        'start_date': '2025-01-01', 'end_date': '2025-01-31', 'email': 'old@gmail.com'}], f)
+        first = TicketManager(self.data_file).get_tickets()[0]['id']
+        self.assertEqual(TicketManager(self.data_file).get_tickets()[0]['id'], first)
+
+    def test_expiration_message_names_ticket(self):
+        ticket_id = self.add('1234')
+        message = EmailNotifier().format_expiration_message(self.ticket_manager.get_ticket(ticket_id), 2)
+        self.assertIn(f"Ticket ID: {ticket_id}", message)
+        self.assertIn(f"update-dates {ticket_id}", message)
+
+if __name__ == '__main__':
+    unittest.main()